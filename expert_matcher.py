@@ -19,26 +19,35 @@
 """
 
 import tkinter as tk
-from tkinter import filedialog, messagebox, ttk
+from tkinter import filedialog, messagebox
 import pandas as pd
 import numpy as np
 from pathlib import Path
 import time
+import math
+import multiprocessing
 from typing import Dict, List, Tuple, Callable
 import re
 
 # Импорт из модульной структуры
 from src.constants import AppConstants, NormalizationConstants
 from src.help_content import HelpContent
-from src.models import MatchingMethod, MatchResult, MethodStatistics
+from src.models import MatchingMethod, MatchResult, MethodStatistics, RunSettings, SourcePart
 from src.matching_engine import MatchingEngine, NormalizationOptions
-from src.excel_exporter import ExcelExporter
+from src.blocking_index import NgramIndex
+from src.batch_scorer import MultiScorer
+from src.method_selector import SuccessiveHalving, length_strata, stratified_order
+from src.time_estimator import ThroughputStore, TimeEstimate, TimeEstimator, blocking_ratio
+from src.background_task import BackgroundTask, TaskCancelled
+from src.match_index import MatchIndexStore, PYARROW_AVAILABLE as MATCH_INDEX_AVAILABLE
+from src.parallel_matcher import ParallelMatcher
+from src.excel_exporter import ExcelExporter, ResultStreamWriter
 from src.data_manager import DataManager
 from src.ui_manager import UIManager
 from src.ui_components import (
     ScrollableFrame, TreeviewWithScrollbar, MethodSelectorListbox,
     FileSelectorWidget, create_label_frame, create_info_label_frame,
-    create_styled_button, create_title_header
+    create_styled_button, create_title_header, ProgressDialog
 )
 
 # Импорт библиотек для сопоставления
@@ -111,6 +120,8 @@ class ExpertMatcher:
         # LEGACY: Алиасы для совместимости (теперь используем data_manager)
         self.askupo_file = None
         self.eatool_file = None
+        self.askupo_parts = []  # Части источника 1 (несколько файлов/листов); пусто = askupo_file
+        self.eatool_parts = []  # Части источника 2
         self.askupo_columns = []
         self.eatool_columns = []
         self.selected_askupo_cols = []
@@ -127,6 +138,31 @@ class ExpertMatcher:
         self.norm_transliterate_var = tk.BooleanVar(value=False)       # Транслитерация кириллицы → латиница
         self.norm_remove_punctuation_var = tk.BooleanVar(value=True)   # Удалять пунктуацию (по умолчанию включено)
 
+        # Блокировка кандидатов по n-граммам (ключ из AppConstants.BLOCKING_LEVELS)
+        self.blocking_level_var = tk.StringVar(value="off")
+        self._blocking_index = None  # Кэш n-граммного индекса источника 2
+
+        # Постоянный индекс подготовленного источника 2 - между запусками (нужен pyarrow)
+        self.match_index = None
+        if AppConstants.MATCH_INDEX_ENABLED and MATCH_INDEX_AVAILABLE:
+            self.match_index = MatchIndexStore()
+
+        # Оценка времени по скорости методов, измеренной на этом компьютере
+        self.time_estimator = TimeEstimator(ThroughputStore())
+
+        # Параллельная обработка методов textdistance/jellyfish на всех ядрах
+        self.parallel_var = tk.BooleanVar(value=True)
+        self.parallel_matcher = ParallelMatcher()
+
+        # Потоковая обработка источника 1 частями с записью результата сразу в файл
+        self.streaming_var = tk.BooleanVar(value=False)
+
+        # Инкрементальный режим: повторно сопоставляются только новые и изменённые строки источника 1
+        self.incremental_var = tk.BooleanVar(value=False)
+
+        # Лимит времени выбора метода в автоматическом режиме, секунд (0 = без лимита)
+        self.selection_budget_var = tk.IntVar(value=AppConstants.SELECTION_TIME_BUDGET)
+
         # Создаём движок сопоставления
         self.engine = self._create_matching_engine()
 
@@ -139,23 +175,146 @@ class ExpertMatcher:
         self.ui_manager = UIManager(self)
         self.ui_manager.create_widgets()
 
-    def _create_matching_engine(self) -> MatchingEngine:
-        """Создание движка сопоставления с текущими настройками нормализации"""
-        options = NormalizationOptions(
+    def _create_normalization_options(self) -> NormalizationOptions:
+        """Настройки нормализации из текущего состояния галок"""
+        return NormalizationOptions(
             remove_legal=self.norm_remove_legal_var.get(),
             remove_versions=self.norm_remove_versions_var.get(),
             remove_stopwords=self.norm_remove_stopwords_var.get(),
             transliterate=self.norm_transliterate_var.get(),
             remove_punctuation=self.norm_remove_punctuation_var.get()
         )
-        return MatchingEngine(options)
+
+    def _create_matching_engine(self) -> MatchingEngine:
+        """Создание движка сопоставления с текущими настройками нормализации"""
+        return MatchingEngine(self._create_normalization_options())
 
     def _update_matching_engine(self):
-        """Обновление движка при изменении настроек нормализации"""
-        self.engine = self._create_matching_engine()
+        """Обновление движка при изменении настроек нормализации
+
+        Движок сохраняется (вместе с кэшем нормализации), кэш сбрасывается
+        только если настройки действительно изменились.
+        """
+        self.engine.set_options(self._create_normalization_options())
         # Обновляем движок в экспортере
         self.exporter.engine = self.engine
-        
+
+    def _read_run_settings(self) -> RunSettings:
+        """Снимок настроек обработки из переменных Tk (только в главном потоке, перед запуском)"""
+        try:
+            selection_budget = self.selection_budget_var.get()
+        except tk.TclError:
+            selection_budget = 0  # Поле лимита пустое или не число
+        return RunSettings(
+            inherit_askupo_cols=self.inherit_askupo_cols_var.get(),
+            inherit_eatool_cols=self.inherit_eatool_cols_var.get(),
+            blocking_min_share=AppConstants.BLOCKING_LEVELS.get(self.blocking_level_var.get(), 0.0),
+            parallel=self.parallel_var.get(),
+            selection_budget=selection_budget
+        )
+
+    def _get_blocking_index(self, eatool_normalized: List[str], settings: RunSettings,
+                            index_key: str = None):
+        """Получить n-граммный индекс источника 2 для текущего уровня блокировки
+
+        Индекс строится один раз на набор данных источника 2 и переиспользуется,
+        пока нормализованные строки не изменятся. Если источник 2 есть в
+        постоянном индексе (index_key), n-граммы загружаются оттуда.
+
+        Args:
+            eatool_normalized: Нормализованные строки источника 2
+            settings: Настройки обработки (уровень блокировки)
+            index_key: Отпечаток источника 2 в постоянном индексе (None = не сохраняется)
+
+        Returns:
+            NgramIndex или None, если блокировка выключена
+        """
+        min_share = settings.blocking_min_share
+        if not min_share:
+            return None
+
+        cached = self._blocking_index
+        if cached is None or cached.choices != eatool_normalized:
+            cached = None
+            if index_key is not None:
+                cached = self.match_index.load_ngrams(index_key, eatool_normalized)
+            if cached is None:
+                cached = NgramIndex(eatool_normalized)
+                if index_key is not None:
+                    self.match_index.store_ngrams(index_key, cached)
+            self._blocking_index = cached
+
+        cached.min_share = min_share
+        return cached
+
+    def _find_best_matches(self, method: MatchingMethod, queries: List[str], choices: List[str],
+                           choice_dict: Dict[str, str], settings: RunSettings, progress_callback=None,
+                           index_key: str = None) -> List[Tuple[str, float]]:
+        """Пакетный поиск совпадений с учётом блокировки и параллельной обработки
+
+        Args:
+            method: Метод сопоставления
+            queries: Нормализованные строки источника 1
+            choices: Нормализованные строки источника 2
+            choice_dict: Словарь {нормализованная_строка: оригинальная_строка}
+            settings: Настройки обработки (блокировка, параллельная обработка)
+            progress_callback: Функция (обработано, всего) для обновления прогресса
+            index_key: Отпечаток источника 2 в постоянном индексе (None = не сохраняется)
+
+        Returns:
+            Список (оригинальная строка совпадения, процент) для каждого запроса
+        """
+        blocking_index = self._get_blocking_index(choices, settings, index_key)
+
+        if settings.parallel and self.parallel_matcher.is_suitable(method, len(queries)):
+            return self.parallel_matcher.find_best_matches(method, queries, choices, choice_dict,
+                                                           progress_callback=progress_callback,
+                                                           blocking_index=blocking_index)
+
+        return method.find_best_matches(queries, choices, choice_dict,
+                                        progress_callback=progress_callback,
+                                        blocking_index=blocking_index)
+
+    def _find_best_matches_multi(self, methods: List[MatchingMethod], queries: List[str],
+                                 choices: List[str], choice_dict: Dict[str, str],
+                                 settings: RunSettings, progress_callback=None,
+                                 index_key: str = None) -> Dict[str, List[Tuple[str, float]]]:
+        """Общий проход для нескольких RapidFuzz методов (режимы сравнения)
+
+        Все матричные (cdist) методы оцениваются за один проход по блокам
+        источника 1 (MultiScorer): общие матрицы, сортировка токенов и штраф
+        за длину считаются один раз. Результат каждого метода идентичен
+        отдельному _find_best_matches.
+
+        Args:
+            methods: Сравниваемые методы (неподходящие пропускаются)
+            queries: Нормализованные строки источника 1
+            choices: Нормализованные строки источника 2
+            choice_dict: Словарь {нормализованная_строка: оригинальная_строка}
+            settings: Настройки обработки (уровень блокировки)
+            progress_callback: Функция (обработано, всего) для обновления прогресса
+            index_key: Отпечаток источника 2 в постоянном индексе (None = не сохраняется)
+
+        Returns:
+            Словарь {название метода: совпадения}; пустой, если общий проход
+            не выгоднее отдельных (меньше 2 методов)
+        """
+        batch_methods = [m for m in methods if m.batch_scorable]
+        if len(batch_methods) < 2:
+            return {}
+
+        # Штраф за длину считается по оригинальной строке, как в find_best_match
+        choice_lengths = [len(choice_dict.get(choice, "")) for choice in choices]
+        scored = MultiScorer([m.scorer for m in batch_methods]).best_matches(
+            queries, choices, choice_lengths, progress_callback,
+            blocking_index=self._get_blocking_index(choices, settings, index_key))
+
+        return {
+            method.name: [(choice_dict.get(choices[idx], ""), float(score)) if idx >= 0 else ("", 0.0)
+                          for idx, score in zip(best_idx, best_scores)]
+            for method, (best_idx, best_scores) in zip(batch_methods, scored)
+        }
+
     def register_all_methods(self) -> List[MatchingMethod]:
         """Регистрация всех доступных методов сопоставления"""
         methods = []
@@ -272,77 +431,106 @@ class ExpertMatcher:
         self.selected_eatool_cols = cols2
         return cols1, cols2
 
-    def _create_result_row_dict(self, askupo_combined: str, best_match: str,
-                                best_score: float, method_name: str,
-                                askupo_row: pd.Series, askupo_df: pd.DataFrame,
-                                eatool_row_dict: dict, eatool_df: pd.DataFrame) -> dict:
-        """Создать словарь строки результата (устраняет дублирование кода)
+    def _match_positions(self, matches: List[Tuple[str, float]],
+                         eatool_row_dict: dict) -> Tuple[np.ndarray, np.ndarray]:
+        """Перевести найденные совпадения в позиции строк источника 2
+
+        Args:
+            matches: список (совпадение из источника 2, процент) по строкам источника 1
+            eatool_row_dict: словарь {объединённая строка: позиция строки источника 2}
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: (позиция строки источника 2 или -1, процент)
+        """
+        positions = np.fromiter(
+            (eatool_row_dict.get(best_match, -1) if best_match else -1 for best_match, _ in matches),
+            dtype=np.int64, count=len(matches))
+        scores = np.fromiter((best_score for _, best_score in matches),
+                             dtype=np.float64, count=len(matches))
+        return positions, scores
+
+    def _build_results_frame(self, method_name: str,
+                             askupo_df: pd.DataFrame, eatool_df: pd.DataFrame,
+                             askupo_normalized: List[str], eatool_normalized: List[str],
+                             positions: np.ndarray, scores: np.ndarray,
+                             settings: RunSettings) -> pd.DataFrame:
+        """Собрать DataFrame результата по столбцам (вместо словаря на каждую строку)
+
+        Столбцы источника 1 берутся целиком, столбцы источника 2 - одним позиционным
+        take по позициям лучших совпадений; строки без совпадения заполняются "".
 
         Args:
-            askupo_combined: объединенное значение из источника 1
-            best_match: найденное совпадение из источника 2
-            best_score: процент совпадения
             method_name: название метода
-            askupo_row: строка из DataFrame источника 1
             askupo_df: весь DataFrame источника 1
-            eatool_row_dict: словарь для поиска строк источника 2
             eatool_df: весь DataFrame источника 2
+            askupo_normalized: нормализованные строки источника 1 (по строкам askupo_df)
+            eatool_normalized: нормализованные строки источника 2 (по строкам eatool_df)
+            positions: позиция лучшей строки источника 2 или -1 (по строкам askupo_df)
+            scores: процент совпадения (по строкам askupo_df)
+            settings: настройки обработки (наследование столбцов источников)
 
         Returns:
-            Словарь с полями результата
+            DataFrame результата (порядок и имена столбцов - как в таблице результатов)
         """
         askupo_cols, eatool_cols = self._get_selected_columns()
 
-        # Базовые поля - начинаем с процента и метода
-        result_row = {}
+        positions = np.asarray(positions, dtype=np.int64)
+        matched = positions >= 0
+        all_matched = bool(matched.all())
+        safe_positions = np.where(matched, positions, 0)
+
+        def source1_column(col):
+            return askupo_df[col].array
+
+        def source2_column(col):
+            if not matched.any():
+                return np.full(len(positions), "", dtype=object)
+            if all_matched:
+                return eatool_df[col].take(positions).array
+            if isinstance(eatool_df[col].dtype, pd.StringDtype):
+                # Строковый столбец (string[pyarrow]) остаётся строковым
+                return eatool_df[col].take(safe_positions).where(matched, "").array
+            values = eatool_df[col].take(safe_positions).to_numpy(dtype=object)
+            values[~matched] = ""
+            return values
+
+        columns = {}
 
         # Добавляем КАЖДЫЙ выбранный столбец источника 1 ОТДЕЛЬНО
         for col in askupo_cols:
-            result_row[f'{AppConstants.COL_SOURCE1_PREFIX} {col}'] = askupo_row[col]
-
-        # Добавляем КАЖДЫЙ выбранный столбец источника 2 ОТДЕЛЬНО
-        if best_match:
-            matched_row = eatool_row_dict.get(best_match)
-            if matched_row is not None:
-                for col in eatool_cols:
-                    result_row[f'{AppConstants.COL_SOURCE2_PREFIX} {col}'] = matched_row[col]
-            else:
-                # Если совпадение не найдено, заполняем пустыми значениями
-                for col in eatool_cols:
-                    result_row[f'{AppConstants.COL_SOURCE2_PREFIX} {col}'] = ""
-        else:
-            # Нет совпадения - пустые значения
-            for col in eatool_cols:
-                result_row[f'{AppConstants.COL_SOURCE2_PREFIX} {col}'] = ""
+            columns[f'{AppConstants.COL_SOURCE1_PREFIX} {col}'] = source1_column(col)
 
-        # НОВОЕ: Добавляем НОРМАЛИЗОВАННЫЕ значения для отладки (справочные столбцы)
+        # Добавляем КАЖДЫЙ выбранный столбец источника 2 ОТДЕЛЬНО (нет совпадения - "")
+        for col in eatool_cols:
+            columns[f'{AppConstants.COL_SOURCE2_PREFIX} {col}'] = source2_column(col)
+
+        # НОРМАЛИЗОВАННЫЕ значения для отладки (справочные столбцы)
         # Показывают что РЕАЛЬНО сравнивается после всех преобразований
-        result_row['[DEBUG] Нормализованный Источник 1'] = self.engine.normalize_string(askupo_combined)
-        result_row['[DEBUG] Нормализованный Источник 2'] = self.engine.normalize_string(best_match) if best_match else ""
+        columns['[DEBUG] Нормализованный Источник 1'] = np.asarray(askupo_normalized, dtype=object)
+        eatool_normalized = np.asarray(eatool_normalized, dtype=object)
+        debug_source2 = np.full(len(positions), "", dtype=object)
+        debug_source2[matched] = eatool_normalized.take(positions[matched])
+        columns['[DEBUG] Нормализованный Источник 2'] = debug_source2
 
-        # Добавляем процент и метод в конец
-        result_row[AppConstants.COL_PERCENT] = round(best_score, 1)
-        result_row[AppConstants.COL_METHOD] = method_name
+        # Процент и метод
+        columns[AppConstants.COL_PERCENT] = np.array([round(score, 1) for score in scores.tolist()],
+                                                     dtype=np.float64)
+        columns[AppConstants.COL_METHOD] = np.full(len(positions), method_name, dtype=object)
 
         # Наследование столбцов из источника 1
-        if self.inherit_askupo_cols_var.get():
+        if settings.inherit_askupo_cols:
             for col in askupo_df.columns:
                 if col not in askupo_cols:
-                    result_row[f"{AppConstants.COL_SOURCE1_PREFIX} {col}"] = askupo_row[col]
+                    columns[f"{AppConstants.COL_SOURCE1_PREFIX} {col}"] = source1_column(col)
 
         # Наследование столбцов из источника 2
-        if best_match and self.inherit_eatool_cols_var.get():
-            matched_row = eatool_row_dict.get(best_match)
-            if matched_row is not None:
-                for col in eatool_df.columns:
-                    if col not in eatool_cols:
-                        result_row[f"{AppConstants.COL_SOURCE2_PREFIX} {col}"] = matched_row[col]
-        elif self.inherit_eatool_cols_var.get():
+        if settings.inherit_eatool_cols:
             for col in eatool_df.columns:
                 if col not in eatool_cols:
-                    result_row[f"{AppConstants.COL_SOURCE2_PREFIX} {col}"] = ""
+                    columns[f"{AppConstants.COL_SOURCE2_PREFIX} {col}"] = source2_column(col)
 
-        return result_row
+        # Типы столбцов выводятся по значениям (как при построении из списка словарей)
+        return pd.DataFrame(columns, index=pd.RangeIndex(len(positions))).infer_objects()
 
     # ========================================================================
     # СТАТИСТИКА (теперь в src.matching_engine.MatchingEngine)
@@ -360,22 +548,69 @@ class ExpertMatcher:
     # enable_all_normalization и др.) остаются в ExpertMatcher, так как
     # вызываются из UIManager через self.parent.*
 
-    def read_data_file(self, filename: str, nrows=None) -> pd.DataFrame:
+    def read_data_file(self, filename: str, nrows=None, usecols=None) -> pd.DataFrame:
         """Универсальное чтение Excel или CSV файла (делегация к DataManager)"""
-        return self.data_manager.read_data_file(filename, nrows)
+        return self.data_manager.read_data_file(filename, nrows, usecols=usecols)
+
+    def _askupo_source(self) -> List[SourcePart]:
+        """Части источника 1 (один файл askupo_file, если части не выбраны)"""
+        return self.askupo_parts or [SourcePart(self.askupo_file)]
+
+    def _eatool_source(self) -> List[SourcePart]:
+        """Части источника 2 (один файл eatool_file, если части не выбраны)"""
+        return self.eatool_parts or [SourcePart(self.eatool_file)]
+
+    def _load_sources(self, settings: RunSettings,
+                      askupo_nrows: int = None) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """Загрузить оба источника для сопоставления
+
+        Если наследование столбцов источника выключено, читаются только
+        выбранные для сравнения столбцы (проекция usecols).
+
+        Args:
+            settings: Настройки обработки (наследование столбцов источников)
+            askupo_nrows: Прочитать только первые строки источника 1 (None = весь файл)
+
+        Returns:
+            Tuple[pd.DataFrame, pd.DataFrame]: (источник 1, источник 2)
+
+        Raises:
+            ValueError: Если в источнике нет строк с данными
+        """
+        askupo_usecols = None
+        if self.selected_askupo_cols and not settings.inherit_askupo_cols:
+            askupo_usecols = self.selected_askupo_cols
+
+        eatool_usecols = None
+        if self.selected_eatool_cols and not settings.inherit_eatool_cols:
+            eatool_usecols = self.selected_eatool_cols
+
+        askupo_df = self.data_manager.read_source(self._askupo_source(), nrows=askupo_nrows,
+                                                  usecols=askupo_usecols)
+        eatool_df = self.data_manager.read_source(self._eatool_source(), usecols=eatool_usecols)
+
+        # При выборе файла проверяется только заголовок - наличие данных проверяем здесь
+        if askupo_df.empty:
+            raise ValueError("Источник данных 1 не содержит строк с данными")
+        if eatool_df.empty:
+            raise ValueError("Источник данных 2 не содержит строк с данными")
+
+        return askupo_df, eatool_df
 
     def validate_excel_file(self, filename: str) -> Tuple[bool, str]:
         """Валидация Excel или CSV файла (делегация к DataManager)"""
         return self.data_manager.validate_file(filename)
 
     def select_askupo(self):
-        filename = filedialog.askopenfilename(
-            title="Выберите Источник данных 1 (целевой)",
+        filenames = filedialog.askopenfilenames(
+            title="Выберите Источник данных 1 (целевой) - один или несколько файлов",
             filetypes=[("Data files", "*.xlsx *.xls *.csv"), ("Excel files", "*.xlsx *.xls"), ("CSV files", "*.csv"), ("All files", "*.*")]
         )
-        if filename:
-            # Используем DataManager для установки файла
-            is_valid, message = self.data_manager.set_source1_file(filename)
+        if filenames:
+            parts = self._choose_source_parts(filenames)
+
+            # Используем DataManager для установки источника
+            is_valid, message = self.data_manager.set_source1_parts(parts)
 
             if not is_valid:
                 messagebox.showerror("❌ Ошибка валидации Источника данных 1",
@@ -388,11 +623,12 @@ class ExpertMatcher:
 
             # Обновляем legacy переменные
             self.askupo_file = self.data_manager.source1_file
+            self.askupo_parts = self.data_manager.source1_parts
             self.askupo_columns = self.data_manager.source1_columns
             self.selected_askupo_cols = self.data_manager.selected_source1_cols
 
             # Обновляем GUI
-            display_name = self.data_manager.get_short_filename(filename)
+            display_name = self.data_manager.get_source_display_name(parts)
             self.askupo_label.config(text=f"✅ {display_name}", fg="green", font=("Arial", 9, "bold"))
 
             # Загрузка столбцов в GUI
@@ -400,13 +636,15 @@ class ExpertMatcher:
             self.check_ready()
     
     def select_eatool(self):
-        filename = filedialog.askopenfilename(
-            title="Выберите Источник данных 2",
+        filenames = filedialog.askopenfilenames(
+            title="Выберите Источник данных 2 - один или несколько файлов",
             filetypes=[("Data files", "*.xlsx *.xls *.csv"), ("Excel files", "*.xlsx *.xls"), ("CSV files", "*.csv"), ("All files", "*.*")]
         )
-        if filename:
-            # Используем DataManager для установки файла
-            is_valid, message = self.data_manager.set_source2_file(filename)
+        if filenames:
+            parts = self._choose_source_parts(filenames)
+
+            # Используем DataManager для установки источника
+            is_valid, message = self.data_manager.set_source2_parts(parts)
 
             if not is_valid:
                 messagebox.showerror("❌ Ошибка валидации Источника данных 2",
@@ -419,17 +657,53 @@ class ExpertMatcher:
 
             # Обновляем legacy переменные
             self.eatool_file = self.data_manager.source2_file
+            self.eatool_parts = self.data_manager.source2_parts
             self.eatool_columns = self.data_manager.source2_columns
             self.selected_eatool_cols = self.data_manager.selected_source2_cols
 
             # Обновляем GUI
-            display_name = self.data_manager.get_short_filename(filename)
+            display_name = self.data_manager.get_source_display_name(parts)
             self.eatool_label.config(text=f"✅ {display_name}", fg="green", font=("Arial", 9, "bold"))
 
             # Загрузка столбцов в GUI
             self.load_eatool_columns()
             self.check_ready()
 
+    def _choose_source_parts(self, filenames) -> List[SourcePart]:
+        """Части источника из выбранных файлов
+
+        Если в книгах Excel несколько листов, пользователь выбирает, объединять
+        ли все листы или брать только первый лист каждой книги.
+
+        Args:
+            filenames: Выбранные файлы
+
+        Returns:
+            Список частей источника
+        """
+        sheets = {}
+        for filename in filenames:
+            try:
+                sheets[filename] = self.data_manager.list_sheets(filename)
+            except Exception:
+                # Ошибку чтения файла сообщит валидация
+                sheets[filename] = []
+
+        all_sheets = False
+        if any(len(names) > 1 for names in sheets.values()):
+            all_sheets = messagebox.askyesno("Несколько листов",
+                                             "Выбранные книги Excel содержат несколько листов.\n\n"
+                                             "Объединить все листы в один источник?\n"
+                                             "(Нет - только первый лист каждой книги)")
+
+        parts = []
+        for filename in filenames:
+            if all_sheets and len(sheets[filename]) > 1:
+                parts.extend(SourcePart(filename, sheet) for sheet in sheets[filename])
+            else:
+                parts.append(SourcePart(filename))
+        return parts
+
     def check_ready(self):
         """Проверка готовности к обработке (делегация к DataManager)"""
         if self.data_manager.is_ready():
@@ -438,8 +712,8 @@ class ExpertMatcher:
     def load_askupo_columns(self):
         """Загрузка списка столбцов из источника 1"""
         try:
-            df = self.read_data_file(self.askupo_file, nrows=0)  # Читаем только заголовки
-            self.askupo_columns = list(df.columns)
+            # Только заголовок (без чтения данных; результат проверки файла кэшируется)
+            self.askupo_columns = self.data_manager.probe_source(self._askupo_source())[0]
 
             # Обновляем GUI для выбора столбцов
             if hasattr(self, 'askupo_col_listbox'):
@@ -456,8 +730,8 @@ class ExpertMatcher:
     def load_eatool_columns(self):
         """Загрузка списка столбцов из источника 2"""
         try:
-            df = self.read_data_file(self.eatool_file, nrows=0)  # Читаем только заголовки
-            self.eatool_columns = list(df.columns)
+            # Только заголовок (без чтения данных; результат проверки файла кэшируется)
+            self.eatool_columns = self.data_manager.probe_source(self._eatool_source())[0]
 
             # Обновляем GUI для выбора столбцов
             if hasattr(self, 'eatool_col_listbox'):
@@ -549,6 +823,11 @@ class ExpertMatcher:
                                   f"Источник 2: {len(self.selected_eatool_cols)} столбцов\n\n"
                                   "Для сравнения будет использован только первый столбец из каждого источника.")
 
+        # Инкрементальный режим: метод берётся из предыдущего результата
+        if self.incremental_var.get():
+            self.run_incremental_mode()
+            return
+
         # Валидация выбранных методов для ВСЕХ режимов
         mode = self.mode_var.get()
         selected_methods = self.get_selected_methods()
@@ -570,6 +849,82 @@ class ExpertMatcher:
         elif mode == "full_compare":
             self.run_full_comparison_mode(selected_methods)
     
+    def _run_task(self, title: str, header: str, work: Callable, on_done: Callable,
+                  on_error: Callable = None, indeterminate: bool = False) -> BackgroundTask:
+        """Запуск обработки в рабочем потоке с окном прогресса и кнопкой отмены
+
+        Окно не блокирует главный поток: прогресс приходит событиями
+        (task.report) и обрабатывается по таймеру root.after.
+
+        Args:
+            title: Заголовок окна прогресса
+            header: Текст заголовка в окне прогресса
+            work: Функция обработки (task) -> результат; не должна обращаться к виджетам
+            on_done: Обработчик результата (главный поток, окно прогресса уже закрыто)
+            on_error: Обработчик исключения, в т.ч. TaskCancelled (None = _show_task_error)
+            indeterminate: Индикатор без шкалы (общий объём работы неизвестен)
+
+        Returns:
+            Запущенная задача
+        """
+        dialog = ProgressDialog(self.root, title, header,
+                                on_cancel=lambda: task.cancel(), indeterminate=indeterminate)
+
+        def finish(handler):
+            def handle(payload):
+                dialog.destroy()
+                # Обработка окончена - процессы с копией источника 2 больше не нужны
+                self.parallel_matcher.close()
+                try:
+                    handler(payload)
+                except Exception as e:
+                    self._show_task_error(e)
+            return handle
+
+        task = BackgroundTask(self.root, work,
+                              on_progress=lambda fields: dialog.update_progress(**fields),
+                              on_done=finish(on_done),
+                              on_error=finish(on_error or self._show_task_error))
+        task.start()
+        return task
+
+    def _show_task_error(self, error: BaseException, hint: str = ""):
+        """Сообщение о прерванной обработке: отмена пользователем или ошибка"""
+        if isinstance(error, TaskCancelled):
+            messagebox.showinfo("⛔ Отменено", "Обработка отменена до получения результатов.\n"
+                                              "Предыдущие результаты не изменены.")
+        else:
+            messagebox.showerror("❌ Ошибка", f"Ошибка обработки:\n{str(error)}{hint}")
+
+    def _load_and_calibrate(self, task: BackgroundTask, methods: List[MatchingMethod],
+                            settings: RunSettings, askupo_nrows: int = None
+                            ) -> Tuple[pd.DataFrame, pd.DataFrame, float]:
+        """Первые шаги обработки (рабочий поток): загрузка источников и калибровка методов
+
+        Оба шага сообщают прогресс и прерываются отменой (TaskCancelled).
+
+        Args:
+            task: Фоновая задача
+            methods: Методы для калибровки скорости
+            settings: Настройки обработки (_read_run_settings)
+            askupo_nrows: Прочитать только первые строки источника 1 (None = весь файл)
+
+        Returns:
+            Tuple: (источник 1, источник 2, доля кандидатов при блокировке)
+        """
+        task.report(status="Загрузка источников данных...", maximum=len(methods) + 1, value=0)
+        askupo_df, eatool_df = self._load_sources(settings, askupo_nrows=askupo_nrows)
+
+        def on_calibrate(done: int, count: int):
+            task.report(status="Калибровка скорости методов...", value=1 + done,
+                        detail=f"{done}/{count} методов")
+
+        candidate_ratio = self._calibrate_methods(methods, askupo_df, self.selected_askupo_cols,
+                                                  eatool_df, self.selected_eatool_cols, settings,
+                                                  progress_callback=on_calibrate)
+        task.report(value=len(methods) + 1, detail=f"{len(methods)}/{len(methods)} методов")
+        return askupo_df, eatool_df, candidate_ratio
+
     def run_auto_mode(self, selected_methods):
         """Автоматический режим - выбор лучшего метода из ВЫБРАННЫХ
 
@@ -578,92 +933,141 @@ class ExpertMatcher:
         - Приоритет 2: Максимум 90-99% совпадений
         - Приоритет 3: Максимальный средний процент
         """
-        try:
-            askupo_df = self.read_data_file(self.askupo_file)
-            eatool_df = self.read_data_file(self.eatool_file)
+        error_hint = ("\n\nПроверьте:\n"
+                      "• Файлы Excel корректны\n"
+                      "• Первый столбец содержит названия ПО\n"
+                      "• Установлены все библиотеки")
+        settings = self._read_run_settings()
+        # Потоковый режим: для выбора метода читается только начало источника 1
+        # (выборка берётся из него), сам источник 1 затем обрабатывается частями
+        streaming = self.streaming_var.get()
 
-            # Используем выбранные столбцы вместо жестко заданных columns[0]
-            askupo_cols = self.selected_askupo_cols
-            eatool_cols = self.selected_eatool_cols
+        # Используем выбранные столбцы вместо жестко заданных columns[0]
+        askupo_cols = self.selected_askupo_cols
+        eatool_cols = self.selected_eatool_cols
 
-            # Динамически рассчитываем примерное время
-            sample_size = min(200, len(askupo_df))
-            # RapidFuzz быстрые (~2 сек на метод), остальные медленнее (~15-20 сек на метод)
+        def load(task: BackgroundTask):
+            askupo_df, eatool_df, candidate_ratio = self._load_and_calibrate(
+                task, selected_methods, settings,
+                askupo_nrows=AppConstants.SELECTION_MAX_SAMPLE if streaming else None)
+            n_queries = len(askupo_df)
+            if streaming:
+                # Загружено только начало источника 1 - число записей по быстрой проверке файла
+                _, row_estimate = self.data_manager.probe_source(self._askupo_source())
+                n_queries = row_estimate or n_queries
+            return askupo_df, eatool_df, n_queries, candidate_ratio
+
+        def on_loaded(loaded):
+            askupo_df, eatool_df, n_queries, candidate_ratio = loaded
+
+            # Оценка времени по скорости методов, измеренной на пробе данных
             rapidfuzz_count = sum(1 for m in selected_methods if m.use_process)
             other_count = len(selected_methods) - rapidfuzz_count
-            estimated_time = (rapidfuzz_count * 2 + other_count * 20) / 60
+            estimate = self._estimate_auto_time(selected_methods, n_queries, len(eatool_df),
+                                                settings, candidate_ratio)
 
+            askupo_info = (f"потоковая обработка частями по {AppConstants.STREAM_CHUNK_ROWS} записей"
+                           if streaming else f"{len(askupo_df)} записей")
             info_msg = (f"📂 Загружено:\n"
-                       f"   АСКУПО: {len(askupo_df)} записей\n"
+                       f"   АСКУПО: {askupo_info}\n"
                        f"   EA Tool: {len(eatool_df)} записей\n\n"
                        f"🔍 Будет протестировано {len(selected_methods)} выбранных методов\n"
                        f"   • RapidFuzz методов: {rapidfuzz_count} (быстрые)\n"
                        f"   • Других методов: {other_count} (медленнее)\n"
-                       f"⏱️ Примерное время: {estimated_time:.0f}-{estimated_time*1.5:.0f} минут")
+                       f"⏱️ Оценка времени (выбор метода + применение): {estimate}")
 
             if not messagebox.askokcancel("Начать обработку?", info_msg):
                 return
 
-            sample_askupo = askupo_df.head(sample_size)
-
-            best_method = None
-            best_score = (-1, -1, -1)  # Кортеж для лексикографического сравнения
-
-            progress_win = tk.Toplevel(self.root)
-            progress_win.title("Тестирование выбранных методов...")
-            progress_win.geometry("500x200")
-            progress_win.transient(self.root)
-            progress_win.grab_set()
-
-            tk.Label(progress_win, text="🔬 Тестирование выбранных методов на sample данных",
-                    font=("Arial", 12, "bold")).pack(pady=10)
-
-            progress_label = tk.Label(progress_win, text="", font=("Arial", 10))
-            progress_label.pack(pady=5)
-
-            progress_bar = ttk.Progressbar(progress_win, length=400, mode='determinate')
-            progress_bar.pack(pady=10)
-            progress_bar['maximum'] = len(selected_methods)
-
-            time_label = tk.Label(progress_win, text="", font=("Arial", 9), fg="gray")
-            time_label.pack(pady=5)
-
             start_time = time.time()
 
-            for i, method in enumerate(selected_methods):
-                elapsed = time.time() - start_time
-                progress_label.config(text=f"Метод {i+1}/{len(selected_methods)}: {method.name}")
-                time_label.config(text=f"⏱️ Прошло: {int(elapsed)}с")
-                progress_bar['value'] = i
-                self.root.update()
+            def work(task: BackgroundTask):
+                # Подготовка источника 2 не зависит от метода - один раз для всех методов
+                task.report(status="Подготовка данных...",
+                            maximum=min(AppConstants.SELECTION_MAX_SAMPLE, len(askupo_df)))
+                prepared = self._prepare_source2(eatool_df, eatool_cols)
+
+                def on_round(round_no: int, n_methods: int, sample_size: int):
+                    task.report(status=f"Раунд {round_no}: методов {n_methods}, "
+                                       f"выборка {sample_size} записей",
+                                value=sample_size,
+                                time_text=f"⏱️ Прошло: {int(time.time() - start_time)}с")
+
+                # Последовательный отсев: худшие методы отбрасываются на малой выборке,
+                # выборка растёт только для лучших
+                best_method, best_score, rounds = self.select_best_method(
+                    selected_methods, askupo_df, askupo_cols, prepared, settings,
+                    progress_callback=on_round)
+                return best_method, best_score, rounds, prepared
+
+            def on_done(outcome):
+                best_method, best_score, rounds, prepared = outcome
+                apply_estimate = self._estimate_method_time(best_method, n_queries, len(eatool_df),
+                                                            settings, candidate_ratio)
+                messagebox.showinfo("✅ Лучший метод найден!",
+                                  f"🏆 Выбран метод: {best_method.name}\n\n"
+                                  f"📊 Статистика на выборке {rounds[-1].sample_size} записей "
+                                  f"(раундов отбора: {len(rounds)}, {rounds[-1].elapsed:.0f}с):\n"
+                                  f"   • 100% совпадений: {best_score[0]}\n"
+                                  f"   • 90-99% совпадений: {best_score[1]}\n"
+                                  f"   • Средний процент: {best_score[2]:.1f}%\n\n"
+                                  f"⏱️ Применение ко всем данным: {apply_estimate}")
+
+                if streaming:
+                    self.apply_method_streaming(best_method, eatool_df, askupo_cols, eatool_cols, settings)
+                else:
+                    self.apply_method_optimized(best_method, askupo_df, eatool_df,
+                                               askupo_cols, eatool_cols, settings, prepared=prepared)
+
+            self._run_task("Тестирование выбранных методов...",
+                           "🔬 Отбор лучшего метода на растущей выборке", work, on_done,
+                           on_error=lambda error: self._show_task_error(error, error_hint))
+
+        self._run_task("Загрузка данных...", "📂 Загрузка источников и калибровка методов",
+                       load, on_loaded, on_error=lambda error: self._show_task_error(error, error_hint))
+
+    def run_incremental_mode(self):
+        """Инкрементальный режим - обновление предыдущего результата
+
+        Предыдущий результат должен быть получен на том же источнике 2. Метод
+        берётся из столбца "Метод" предыдущего результата; повторно
+        сопоставляются только новые и изменённые строки источника 1.
+        """
+        previous_path = filedialog.askopenfilename(
+            title="Предыдущий результат сопоставления",
+            filetypes=[("Data files", "*.xlsx *.csv"), ("Excel files", "*.xlsx"), ("CSV files", "*.csv")]
+        )
+        if not previous_path:
+            return
 
-                score = self.evaluate_method_fast(method, sample_askupo, eatool_df,
-                                                  askupo_cols, eatool_cols)
+        settings = self._read_run_settings()
 
-                if score > best_score:
-                    best_score = score
-                    best_method = method
+        def load(task: BackgroundTask):
+            task.report(status="Чтение предыдущего результата...", maximum=2, value=0)
+            previous = self.data_manager.read_data_file(previous_path)
+            if AppConstants.COL_METHOD not in previous.columns or previous.empty:
+                raise ValueError("Файл не похож на результат сопоставления (нет столбца "
+                                 f"\"{AppConstants.COL_METHOD}\" или записей)")
 
-            progress_win.destroy()
+            method_name = previous[AppConstants.COL_METHOD].mode().iloc[0]
+            method = next((m for m in self.methods if m.name == method_name), None)
+            if method is None:
+                raise ValueError(f"Метод предыдущего результата недоступен: {method_name}")
 
-            messagebox.showinfo("✅ Лучший метод найден!",
-                              f"🏆 Выбран метод: {best_method.name}\n\n"
-                              f"📊 Статистика на sample данных:\n"
-                              f"   • 100% совпадений: {best_score[0]}\n"
-                              f"   • 90-99% совпадений: {best_score[1]}\n"
-                              f"   • Средний процент: {best_score[2]:.1f}%\n\n"
-                              f"⏱️ Применение ко всем данным займет ~2-3 минуты")
+            task.report(status="Загрузка источников данных...", value=1)
+            askupo_df, eatool_df = self._load_sources(settings)
+            task.report(value=2)
+            return method, previous, askupo_df, eatool_df
 
-            self.apply_method_optimized(best_method, askupo_df, eatool_df,
-                                       askupo_cols, eatool_cols)
+        def on_loaded(loaded):
+            method, previous, askupo_df, eatool_df = loaded
+            self.apply_method_optimized(method, askupo_df, eatool_df,
+                                        self.selected_askupo_cols, self.selected_eatool_cols,
+                                        settings, previous=previous)
+
+        self._run_task("Загрузка данных...", "📂 Загрузка предыдущего результата и источников",
+                       load, on_loaded)
 
-        except Exception as e:
-            messagebox.showerror("❌ Ошибка", f"Ошибка обработки:\n{str(e)}\n\n"
-                               f"Проверьте:\n"
-                               f"• Файлы Excel корректны\n"
-                               f"• Первый столбец содержит названия ПО\n"
-                               f"• Установлены все библиотеки")
-    
     def run_compare_mode(self, selected_methods):
         """Режим сравнения ВЫБРАННЫХ методов
 
@@ -672,218 +1076,276 @@ class ExpertMatcher:
         - Приоритет 2: Максимум 90-99% совпадений
         - Приоритет 3: Максимальный средний процент
         """
-        try:
-            askupo_df = self.read_data_file(self.askupo_file)
-            eatool_df = self.read_data_file(self.eatool_file)
+        settings = self._read_run_settings()
 
-            # Используем выбранные столбцы вместо жестко заданных columns[0]
-            askupo_cols = self.selected_askupo_cols
-            eatool_cols = self.selected_eatool_cols
+        # Используем выбранные столбцы вместо жестко заданных columns[0]
+        askupo_cols = self.selected_askupo_cols
+        eatool_cols = self.selected_eatool_cols
+
+        def load(task: BackgroundTask):
+            return self._load_and_calibrate(task, selected_methods, settings)
+
+        def on_loaded(loaded):
+            askupo_df, eatool_df, candidate_ratio = loaded
 
             sample_size = min(200, len(askupo_df))
             sample_askupo = askupo_df.head(sample_size)
 
-            # Динамически рассчитываем примерное время
+            # Оценка времени по скорости методов, измеренной на пробе данных
             rapidfuzz_count = sum(1 for m in selected_methods if m.use_process)
             other_count = len(selected_methods) - rapidfuzz_count
-            estimated_time = (rapidfuzz_count * 3 + other_count * 30) / 60
+            estimate = sum((self._estimate_method_time(m, sample_size, len(eatool_df), settings, candidate_ratio)
+                            for m in selected_methods), TimeEstimate())
 
             info_msg = (f"📊 Будет протестировано {len(selected_methods)} выбранных методов\n"
                        f"   • RapidFuzz методов: {rapidfuzz_count} (быстрые)\n"
                        f"   • Других методов: {other_count} (медленнее)\n"
                        f"📦 Sample: {sample_size} записей\n"
-                       f"⏱️ Примерное время: {estimated_time:.0f}-{estimated_time*1.5:.0f} минут")
+                       f"⏱️ Оценка времени: {estimate}")
 
             if not messagebox.askokcancel("Начать сравнение?", info_msg):
                 return
 
-            progress_win = tk.Toplevel(self.root)
-            progress_win.title("Сравнение выбранных методов...")
-            progress_win.geometry("500x200")
-            progress_win.transient(self.root)
-            progress_win.grab_set()
-
-            tk.Label(progress_win, text="📊 Сравнение выбранных методов",
-                    font=("Arial", 12, "bold")).pack(pady=10)
-
-            progress_label = tk.Label(progress_win, text="", font=("Arial", 10))
-            progress_label.pack(pady=5)
-
-            progress_bar = ttk.Progressbar(progress_win, length=400, mode='determinate')
-            progress_bar.pack(pady=10)
-            progress_bar['maximum'] = len(selected_methods)
-
-            comparison_results = []
-
-            for i, method in enumerate(selected_methods):
-                progress_label.config(text=f"Тестирование {i+1}/{len(selected_methods)}: {method.name}")
-                progress_bar['value'] = i
-                self.root.update()
-
-                start_time = time.time()
-                # test_method_optimized использует self.selected_*_cols
-                results = self.test_method_optimized(method, sample_askupo, eatool_df,
-                                                     None, None)
-                elapsed = time.time() - start_time
-
-                # Используем ИСПРАВЛЕННУЮ функцию подсчета статистики
-                stats_dict = self.engine.calculate_statistics(results)
-
-                stats = {
-                    'method': method.name,
-                    'library': method.library,
-                    'avg_score': results['Процент совпадения'].mean(),
-                    'perfect': stats_dict['perfect'],      # Только 100%
-                    'high': stats_dict['high'],            # Только 90-99%
-                    'medium': stats_dict['medium'],        # Только 70-89%
-                    'time': elapsed
-                }
-
-                comparison_results.append(stats)
-
-            progress_win.destroy()
-
-            # Лексикографическая сортировка (идентична автоматическому режиму)
-            # Приоритет: 100% совпадений > 90-99% совпадений > средний процент
-            comparison_results.sort(key=lambda x: (x['perfect'], x['high'], x['avg_score']),
-                                   reverse=True)
-
-            self.display_comparison(comparison_results)
-            self.notebook.select(1)
-
-            messagebox.showinfo("✅ Сравнение завершено!",
-                              f"Протестировано {len(selected_methods)} выбранных методов\n\n"
-                              f"🏆 Лучший: {comparison_results[0]['method']}\n"
-                              f"📊 100% совпадений: {comparison_results[0]['perfect']}")
-
-        except Exception as e:
-            messagebox.showerror("❌ Ошибка", f"Ошибка обработки:\n{str(e)}")
-
-    def _run_comparison_on_full_data(self, methods: List, window_title: str,
-                                     header_text: str, export_filename: str) -> None:
+            def work(task: BackgroundTask) -> List[Dict]:
+                # Подготовка источников не зависит от метода - один раз для всех методов
+                task.report(status="Подготовка данных...", maximum=len(selected_methods))
+                prepared = self._prepare_source2(eatool_df, eatool_cols)
+                sample_normalized = self._prepare_source1(sample_askupo, askupo_cols)
+
+                # RapidFuzz методы - одним общим проходом, его время делится между ними поровну
+                shared_start = time.time()
+                shared_matches = self._find_best_matches_multi(selected_methods, sample_normalized,
+                                                               prepared[0], prepared[1], settings,
+                                                               index_key=prepared[3])
+                shared_time = (time.time() - shared_start) / max(1, len(shared_matches))
+
+                comparison_results = []
+                for i, method in enumerate(selected_methods):
+                    # Отмена между методами: уже протестированные методы остаются в сравнении
+                    try:
+                        task.report(status=f"Тестирование {i+1}/{len(selected_methods)}: {method.name}",
+                                    value=i)
+                    except TaskCancelled:
+                        break
+
+                    start_time = time.time()
+                    # test_method_optimized использует self.selected_*_cols
+                    results = self.test_method_optimized(method, sample_askupo, eatool_df,
+                                                         None, None, prepared=prepared,
+                                                         askupo_normalized=sample_normalized,
+                                                         matches=shared_matches.get(method.name),
+                                                         settings=settings)
+                    elapsed = time.time() - start_time
+                    if method.name in shared_matches:
+                        elapsed += shared_time
+
+                    # Используем ИСПРАВЛЕННУЮ функцию подсчета статистики
+                    stats_dict = self.engine.calculate_statistics(results)
+
+                    stats = {
+                        'method': method.name,
+                        'library': method.library,
+                        'avg_score': results['Процент совпадения'].mean(),
+                        'perfect': stats_dict['perfect'],      # Только 100%
+                        'high': stats_dict['high'],            # Только 90-99%
+                        'medium': stats_dict['medium'],        # Только 70-89%
+                        'time': elapsed
+                    }
+
+                    comparison_results.append(stats)
+                return comparison_results
+
+            def on_done(comparison_results: List[Dict]):
+                if not comparison_results:
+                    self._show_task_error(TaskCancelled())
+                    return
+
+                # Лексикографическая сортировка (идентична автоматическому режиму)
+                # Приоритет: 100% совпадений > 90-99% совпадений > средний процент
+                comparison_results.sort(key=lambda x: (x['perfect'], x['high'], x['avg_score']),
+                                       reverse=True)
+
+                self.display_comparison(comparison_results)
+                self.notebook.select(1)
+
+                if len(comparison_results) < len(selected_methods):
+                    messagebox.showinfo("⛔ Сравнение остановлено",
+                                      f"Протестировано {len(comparison_results)} из "
+                                      f"{len(selected_methods)} выбранных методов\n\n"
+                                      f"🏆 Лучший из протестированных: {comparison_results[0]['method']}\n"
+                                      f"📊 100% совпадений: {comparison_results[0]['perfect']}")
+                    return
+
+                messagebox.showinfo("✅ Сравнение завершено!",
+                                  f"Протестировано {len(selected_methods)} выбранных методов\n\n"
+                                  f"🏆 Лучший: {comparison_results[0]['method']}\n"
+                                  f"📊 100% совпадений: {comparison_results[0]['perfect']}")
+
+            self._run_task("Сравнение выбранных методов...", "📊 Сравнение выбранных методов",
+                           work, on_done)
+
+        self._run_task("Загрузка данных...", "📂 Загрузка источников и калибровка методов",
+                       load, on_loaded)
+
+    def _run_comparison_on_full_data(self, methods: List, askupo_df: pd.DataFrame,
+                                     eatool_df: pd.DataFrame, settings: RunSettings,
+                                     window_title: str, header_text: str,
+                                     export_filename: str) -> None:
         """Общий метод для полного сравнения методов на ВСЕХ данных
 
         Args:
             methods: Список методов для тестирования
+            askupo_df: DataFrame источника 1 (загружен _load_sources)
+            eatool_df: DataFrame источника 2
+            settings: Настройки обработки (_read_run_settings)
             window_title: Заголовок окна прогресса
             header_text: Текст заголовка в окне прогресса
             export_filename: Имя файла по умолчанию для экспорта
         """
-        askupo_df = self.read_data_file(self.askupo_file)
-        eatool_df = self.read_data_file(self.eatool_file)
-
         # Используем выбранные столбцы вместо жестко заданных columns[0]
         askupo_cols = self.selected_askupo_cols
         eatool_cols = self.selected_eatool_cols
 
-        # Создание окна прогресса
-        progress_win = tk.Toplevel(self.root)
-        progress_win.title(window_title)
-        progress_win.geometry("600x250")
-        progress_win.transient(self.root)
-        progress_win.grab_set()
-
-        tk.Label(progress_win, text=header_text,
-                font=("Arial", 12, "bold")).pack(pady=10)
-
-        method_label = tk.Label(progress_win, text="", font=("Arial", 10))
-        method_label.pack(pady=5)
-
-        progress_label = tk.Label(progress_win, text="", font=("Arial", 9))
-        progress_label.pack(pady=5)
-
-        progress_bar = ttk.Progressbar(progress_win, length=500, mode='determinate')
-        progress_bar.pack(pady=10)
-        progress_bar['maximum'] = len(methods) * len(askupo_df)
+        start_time = time.time()
+        total_rows = len(methods) * len(askupo_df)
+
+        def work(task: BackgroundTask) -> Tuple[Dict[str, pd.DataFrame], List[Dict]]:
+            all_methods_results = {}  # Словарь: имя метода -> DataFrame с результатами
+            comparison_stats = []
+
+            total_processed = 0
+
+            # Подготовка обоих источников (объединение, нормализация, словари строк)
+            # не зависит от метода - выполняется один раз и общая для всех методов
+            task.report(status="Подготовка данных...", maximum=total_rows)
+            prepared = self._prepare_source2(eatool_df, eatool_cols)
+            askupo_normalized = self._prepare_source1(askupo_df, askupo_cols)
+
+            def on_shared_progress(done: int, count: int):
+                task.report(detail=f"Общий проход RapidFuzz: {done}/{count} записей")
+
+            # RapidFuzz методы - одним общим проходом по блокам источника 1,
+            # его время делится между ними поровну
+            task.report(status="RapidFuzz методы (общий проход)...")
+            shared_start = time.time()
+            shared_matches = self._find_best_matches_multi(methods, askupo_normalized,
+                                                           prepared[0], prepared[1], settings,
+                                                           progress_callback=on_shared_progress,
+                                                           index_key=prepared[3])
+            shared_time = (time.time() - shared_start) / max(1, len(shared_matches))
+
+            # Обработка каждого метода
+            for method_idx, method in enumerate(methods):
+                method_start_time = time.time()
+
+                def on_progress(done: int, count: int, offset: int = total_processed):
+                    task.report(value=offset + done, detail=f"{done}/{count} записей")
+
+                # Отмена прерывает текущий метод: в результатах остаются завершённые методы
+                try:
+                    task.report(status=f"Метод {method_idx+1}/{len(methods)}: {method.name}")
+
+                    # Применяем метод ко ВСЕМ данным
+                    # test_method_optimized использует self.selected_*_cols
+                    results_df = self.test_method_optimized(method, askupo_df, eatool_df,
+                                                           None, None, prepared=prepared,
+                                                           askupo_normalized=askupo_normalized,
+                                                           matches=shared_matches.get(method.name),
+                                                           progress_callback=on_progress,
+                                                           settings=settings)
+                except TaskCancelled:
+                    break
+
+                # Сохраняем результаты
+                all_methods_results[method.name] = results_df
+
+                # Подсчитываем статистику
+                stats_dict = self.engine.calculate_statistics(results_df)
+
+                comparison_stats.append({
+                    'method': method.name,
+                    'library': method.library,
+                    'total': stats_dict['total'],
+                    'perfect': stats_dict['perfect'],
+                    'high': stats_dict['high'],
+                    'medium': stats_dict['medium'],
+                    'low': stats_dict['low'],
+                    'very_low': stats_dict['very_low'],
+                    'none': stats_dict['none'],
+                    'avg_score': results_df['Процент совпадения'].mean(),
+                    'time': time.time() - method_start_time + (shared_time if method.name in shared_matches else 0)
+                })
+
+                # Обновляем прогресс
+                total_processed += len(askupo_df)
+                elapsed = time.time() - start_time
+                remaining = (elapsed / total_processed) * (total_rows - total_processed)
+
+                try:
+                    task.report(value=total_processed,
+                                detail=f"Обработано методов: {method_idx+1}/{len(methods)}",
+                                time_text=f"⏱️ Прошло: {int(elapsed)}с ({elapsed/60:.1f} мин) | "
+                                          f"Осталось: ~{int(remaining)}с ({remaining/60:.1f} мин)")
+                except TaskCancelled:
+                    break
+
+            return all_methods_results, comparison_stats
+
+        def on_done(outcome: Tuple[Dict[str, pd.DataFrame], List[Dict]]):
+            all_methods_results, comparison_stats = outcome
+            if not comparison_stats:
+                self._show_task_error(TaskCancelled())
+                return
 
-        time_label = tk.Label(progress_win, text="", font=("Arial", 9), fg="gray")
-        time_label.pack(pady=5)
+            # Сортируем методы по качеству
+            comparison_stats.sort(key=lambda x: (x['perfect'], x['high'], x['avg_score']), reverse=True)
 
-        start_time = time.time()
-        all_methods_results = {}  # Словарь: имя метода -> DataFrame с результатами
-        comparison_stats = []
-
-        total_processed = 0
-
-        # Обработка каждого метода
-        for method_idx, method in enumerate(methods):
-            method_start_time = time.time()
-            method_label.config(text=f"Метод {method_idx+1}/{len(methods)}: {method.name}")
-            self.root.update()
-
-            # Применяем метод ко ВСЕМ данным
-            # test_method_optimized использует self.selected_*_cols
-            results_df = self.test_method_optimized(method, askupo_df, eatool_df,
-                                                   None, None)
-
-            # Сохраняем результаты
-            all_methods_results[method.name] = results_df
-
-            # Подсчитываем статистику
-            stats_dict = self.engine.calculate_statistics(results_df)
-
-            comparison_stats.append({
-                'method': method.name,
-                'library': method.library,
-                'total': stats_dict['total'],
-                'perfect': stats_dict['perfect'],
-                'high': stats_dict['high'],
-                'medium': stats_dict['medium'],
-                'low': stats_dict['low'],
-                'very_low': stats_dict['very_low'],
-                'none': stats_dict['none'],
-                'avg_score': results_df['Процент совпадения'].mean(),
-                'time': time.time() - method_start_time
-            })
-
-            # Обновляем прогресс
-            total_processed += len(askupo_df)
-            progress_bar['value'] = total_processed
-            elapsed = time.time() - start_time
-            remaining = (elapsed / total_processed) * (len(methods) * len(askupo_df) - total_processed)
-
-            progress_label.config(text=f"Обработано методов: {method_idx+1}/{len(methods)}")
-            time_label.config(text=f"⏱️ Прошло: {int(elapsed)}с ({elapsed/60:.1f} мин) | Осталось: ~{int(remaining)}с ({remaining/60:.1f} мин)")
-            self.root.update()
-
-        progress_win.destroy()
-
-        # Сортируем методы по качеству
-        comparison_stats.sort(key=lambda x: (x['perfect'], x['high'], x['avg_score']), reverse=True)
-
-        # Сохраняем для экспорта
-        self.full_comparison_results = {
-            'methods_data': all_methods_results,
-            'comparison_stats': comparison_stats
-        }
+            # Сохраняем для экспорта
+            self.full_comparison_results = {
+                'methods_data': all_methods_results,
+                'comparison_stats': comparison_stats
+            }
 
-        elapsed_total = time.time() - start_time
+            elapsed_total = time.time() - start_time
 
-        # Автоматически экспортируем результаты
-        self.export_full_comparison_to_excel(default_filename=export_filename)
+            # Автоматически экспортируем результаты
+            self.export_full_comparison_to_excel(default_filename=export_filename)
 
-        # Показываем финальное сообщение
-        messagebox.showinfo("✅ Полное сравнение завершено!",
-                          f"⏱️ Время выполнения: {int(elapsed_total)}с ({elapsed_total/60:.1f} мин)\n\n"
-                          f"📊 Протестировано {len(methods)} методов\n"
-                          f"📦 Обработано {len(askupo_df)} записей в каждом методе\n\n"
-                          f"🏆 Лучший метод: {comparison_stats[0]['method']}\n"
-                          f"   • 100% совпадений: {comparison_stats[0]['perfect']}\n"
-                          f"   • 90-99%: {comparison_stats[0]['high']}\n"
-                          f"   • Средний балл: {comparison_stats[0]['avg_score']:.1f}%\n\n"
-                          f"💾 Результаты сохранены в Excel")
+            if len(comparison_stats) < len(methods):
+                title = "⛔ Полное сравнение остановлено"
+                tested = f"📊 Протестировано {len(comparison_stats)} из {len(methods)} методов (отмена)\n"
+            else:
+                title = "✅ Полное сравнение завершено!"
+                tested = f"📊 Протестировано {len(methods)} методов\n"
+
+            # Показываем финальное сообщение
+            messagebox.showinfo(title,
+                              f"⏱️ Время выполнения: {int(elapsed_total)}с ({elapsed_total/60:.1f} мин)\n\n"
+                              f"{tested}"
+                              f"📦 Обработано {len(askupo_df)} записей в каждом методе\n\n"
+                              f"🏆 Лучший метод: {comparison_stats[0]['method']}\n"
+                              f"   • 100% совпадений: {comparison_stats[0]['perfect']}\n"
+                              f"   • 90-99%: {comparison_stats[0]['high']}\n"
+                              f"   • Средний балл: {comparison_stats[0]['avg_score']:.1f}%\n\n"
+                              f"💾 Результаты сохранены в Excel")
+
+        self._run_task(window_title, header_text, work, on_done)
 
     def run_full_comparison_mode(self, selected_methods):
         """Полное сравнение - применяет ВЫБРАННЫЕ методы ко ВСЕМ данным"""
-        try:
-            # Читаем данные для расчета времени
-            askupo_df = self.read_data_file(self.askupo_file)
-            eatool_df = self.read_data_file(self.eatool_file)
+        settings = self._read_run_settings()
 
-            # Динамически рассчитываем примерное время для ВСЕХ данных
-            rapidfuzz_count = sum(1 for m in selected_methods if m.use_process)
-            other_count = len(selected_methods) - rapidfuzz_count
-            estimated_time = (rapidfuzz_count * 3 + other_count * 4) / 60
+        def load(task: BackgroundTask):
+            # Данные и скорость методов - для расчета времени
+            return self._load_and_calibrate(task, selected_methods, settings)
+
+        def on_loaded(loaded):
+            askupo_df, eatool_df, candidate_ratio = loaded
+
+            # Оценка времени для ВСЕХ данных по скорости методов, измеренной на пробе данных
+            estimate = sum((self._estimate_method_time(m, len(askupo_df), len(eatool_df), settings,
+                                                       candidate_ratio)
+                            for m in selected_methods), TimeEstimate())
 
             # Показываем предупреждение
             info_msg = (f"⚠️ ВНИМАНИЕ: Это может быть долгая операция!\n\n"
@@ -892,7 +1354,7 @@ class ExpertMatcher:
                        f"   EA Tool: {len(eatool_df)} записей\n"
                        f"   Методов: {len(selected_methods)} выбранных\n\n"
                        f"🔬 Каждый метод будет применен ко ВСЕМ записям\n"
-                       f"⏱️ Примерное время: {estimated_time:.0f}-{estimated_time*1.5:.0f} минут\n\n"
+                       f"⏱️ Оценка времени: {estimate}\n\n"
                        f"📊 Результат: Excel файл с листом для каждого метода + сводка")
 
             if not messagebox.askokcancel("⚠️ Начать полное сравнение?", info_msg):
@@ -901,19 +1363,159 @@ class ExpertMatcher:
             # Вызываем общий метод для обработки
             self._run_comparison_on_full_data(
                 methods=selected_methods,
+                askupo_df=askupo_df,
+                eatool_df=eatool_df,
+                settings=settings,
                 window_title="Полное сравнение выбранных методов...",
                 header_text="🔬 Полное сравнение выбранных методов на ВСЕХ данных",
                 export_filename="Полное_сравнение_выбранных_методов.xlsx"
             )
 
-        except Exception as e:
-            messagebox.showerror("❌ Ошибка", f"Ошибка обработки:\n{str(e)}")
+        self._run_task("Загрузка данных...", "📂 Загрузка источников и калибровка методов",
+                       load, on_loaded)
 
     # Методы run_manual_mode и run_multi_manual_mode УДАЛЕНЫ
     # Вся функциональность теперь в run_full_comparison_mode
 
+    def _calibrate_methods(self, methods: List[MatchingMethod], askupo_df: pd.DataFrame,
+                           askupo_cols: List[str], eatool_df: pd.DataFrame,
+                           eatool_cols: List[str], settings: RunSettings,
+                           progress_callback=None) -> float:
+        """Калибровка скорости методов на малой пробе реальных данных
+
+        Измеряются только методы без актуальных измерений на этом компьютере,
+        поэтому повторные оценки мгновенны.
+
+        Args:
+            methods: Методы сопоставления
+            askupo_df: DataFrame источника 1
+            askupo_cols: Столбцы источника 1 для сравнения
+            eatool_df: DataFrame источника 2
+            eatool_cols: Столбцы источника 2 для сравнения
+            settings: Настройки обработки (уровень блокировки)
+            progress_callback: Функция (проверено методов, всего) перед каждым методом
+
+        Returns:
+            Доля кандидатов при уровне блокировки settings (1.0 = без блокировки)
+        """
+        probe_askupo = askupo_df.sample(min(AppConstants.ESTIMATE_PROBE_QUERIES, len(askupo_df)),
+                                        random_state=AppConstants.SELECTION_SEED)
+        probe_eatool = eatool_df.sample(min(AppConstants.ESTIMATE_PROBE_CHOICES, len(eatool_df)),
+                                        random_state=AppConstants.SELECTION_SEED)
+
+        queries = self._prepare_source1(probe_askupo, askupo_cols)
+        combined = self.engine.combine_columns_frame(probe_eatool, eatool_cols)
+        choices = self.engine.normalize_series(combined).tolist()
+        choice_dict = dict(zip(choices, combined.tolist()))
+
+        self.time_estimator.calibrate(methods, queries, choices, choice_dict,
+                                      progress_callback=progress_callback)
+
+        return blocking_ratio(queries, choices, settings.blocking_min_share)
+
+    def _estimate_method_time(self, method: MatchingMethod, n_queries: int, n_choices: int,
+                              settings: RunSettings, candidate_ratio: float = 1.0) -> TimeEstimate:
+        """Оценка времени метода с учётом параллельной обработки (см. _find_best_matches)"""
+        workers = 1
+        if settings.parallel and self.parallel_matcher.is_suitable(method, n_queries):
+            workers = self.parallel_matcher.max_workers
+        return self.time_estimator.estimate(method, n_queries, n_choices, candidate_ratio, workers)
+
+    def _estimate_auto_time(self, methods: List[MatchingMethod], n_queries: int, n_choices: int,
+                            settings: RunSettings, candidate_ratio: float = 1.0) -> TimeEstimate:
+        """Оценка времени автоматического режима: отбор метода (select_best_method) + применение
+
+        Какие методы пройдут отбор и какой будет выбран, заранее неизвестно:
+        нижняя граница - отсеиваются и применяются самые быстрые методы,
+        верхняя - все методы доходят до полной выборки и применяется самый медленный.
+        """
+        per_row = sorted((self._estimate_method_time(m, 1, n_choices, settings, candidate_ratio)
+                          for m in methods), key=lambda e: e.expected)
+        full = [self._estimate_method_time(m, n_queries, n_choices, settings, candidate_ratio)
+                for m in methods]
+        pool = min(AppConstants.SELECTION_MAX_SAMPLE, n_queries)
+
+        # Расписание отбора: (методов в раунде, новых строк выборки)
+        schedule = []
+        alive, evaluated, sample_size = len(methods), 0, min(AppConstants.SELECTION_INITIAL_SAMPLE, pool)
+        while True:
+            schedule.append((alive, sample_size - evaluated))
+            evaluated = sample_size
+            alive = math.ceil(alive / AppConstants.SELECTION_GROWTH)
+            if alive <= 1 or sample_size >= pool:
+                break
+            sample_size = min(sample_size * AppConstants.SELECTION_GROWTH, pool)
+
+        mean_row = sum(e.expected for e in per_row) / max(1, len(per_row))
+        selection = TimeEstimate(
+            low=sum(sum(e.low for e in per_row[:k]) * rows for k, rows in schedule),
+            expected=sum(e.expected for e in per_row) * schedule[0][1]
+                     + sum(k * mean_row * rows for k, rows in schedule[1:]),
+            high=sum(e.high for e in per_row) * pool)
+
+        full_expected = sorted(e.expected for e in full)
+        apply = TimeEstimate(low=min((e.low for e in full), default=0.0),
+                             expected=full_expected[len(full_expected) // 2] if full_expected else 0.0,
+                             high=max((e.high for e in full), default=0.0))
+        return selection + apply
+
+    def select_best_method(self, methods: List[MatchingMethod], askupo_df: pd.DataFrame,
+                           askupo_cols: List[str], prepared: Tuple, settings: RunSettings,
+                           progress_callback=None) -> Tuple[MatchingMethod, tuple, list]:
+        """Выбор лучшего метода последовательным отсевом (SuccessiveHalving)
+
+        Из источника 1 берётся случайная выборка (до SELECTION_MAX_SAMPLE строк),
+        упорядоченная со стратификацией по длине строки. Все методы оцениваются
+        на её начале, худшие отсеиваются, а выборка для оставшихся растёт.
+        Оценка метода - как в evaluate_method_fast: (100%, 90-99%, средний процент).
+
+        Args:
+            methods: Методы-кандидаты
+            askupo_df: DataFrame источника 1
+            askupo_cols: Столбцы источника 1 для сравнения
+            prepared: Общая для всех методов подготовка источника 2 (_prepare_source2)
+            settings: Настройки обработки (в т.ч. лимит времени выбора)
+            progress_callback: Функция (раунд, осталось методов, размер выборки)
+
+        Returns:
+            Tuple: (лучший метод, его оценка, раунды отбора - SelectionRound)
+        """
+        eatool_normalized, choice_dict, eatool_row_dict, index_key = prepared
+
+        rng = np.random.default_rng(AppConstants.SELECTION_SEED)
+        pool = np.sort(rng.choice(len(askupo_df), size=min(AppConstants.SELECTION_MAX_SAMPLE, len(askupo_df)),
+                                  replace=False))
+        pool_normalized = self._prepare_source1(askupo_df.iloc[pool], askupo_cols)
+        order = stratified_order(length_strata(pool_normalized), seed=AppConstants.SELECTION_SEED)
+
+        def score_rows(alive: List[MatchingMethod], rows: np.ndarray) -> Dict[str, np.ndarray]:
+            queries = [pool_normalized[i] for i in rows]
+            # RapidFuzz методы - одним общим проходом
+            shared = self._find_best_matches_multi(alive, queries, eatool_normalized, choice_dict,
+                                                   settings, index_key=index_key)
+            scores = {}
+            for method in alive:
+                matches = shared.get(method.name)
+                if matches is None:
+                    matches = self._find_best_matches(method, queries, eatool_normalized, choice_dict,
+                                                      settings, index_key=index_key)
+                _, method_scores = self._match_positions(matches, eatool_row_dict)
+                # Округление - как в таблице результатов (_build_results_frame)
+                scores[method.name] = np.array([round(score, 1) for score in method_scores.tolist()],
+                                               dtype=np.float64)
+            return scores
+
+        def score_key(scores: np.ndarray) -> tuple:
+            stats = self.engine.calculate_statistics(pd.DataFrame({AppConstants.COL_PERCENT: scores}))
+            return (stats['perfect'], stats['high'], scores.mean())
+
+        selector = SuccessiveHalving(time_budget=settings.selection_budget)
+        return selector.select(methods, order, score_rows, score_key, progress_callback)
+
     def evaluate_method_fast(self, method: MatchingMethod, sample_askupo: pd.DataFrame,
-                            eatool_df: pd.DataFrame, askupo_cols: list, eatool_cols: list) -> tuple:
+                            eatool_df: pd.DataFrame, askupo_cols: list, eatool_cols: list,
+                            prepared: Tuple = None, askupo_normalized: List[str] = None,
+                            matches: List[Tuple[str, float]] = None, *, settings: RunSettings) -> tuple:
         """Быстрая оценка качества метода
 
         Возвращает кортеж для лексикографического сравнения:
@@ -923,10 +1525,16 @@ class ExpertMatcher:
         Args:
             askupo_cols: Список столбцов источника 1 для сравнения
             eatool_cols: Список столбцов источника 2 для сравнения
+            prepared: Общая для всех методов подготовка источника 2 (_prepare_source2)
+            askupo_normalized: Общие нормализованные строки sample (_prepare_source1)
+            matches: Совпадения метода из общего прохода (_find_best_matches_multi)
+            settings: Настройки обработки (_read_run_settings)
         """
         # test_method_optimized уже правильно обрабатывает списки столбцов через self.selected_*_cols
         results = self.test_method_optimized(method, sample_askupo, eatool_df,
-                                            None, None)
+                                            None, None, prepared=prepared,
+                                            askupo_normalized=askupo_normalized,
+                                            matches=matches, settings=settings)
 
         stats = self.engine.calculate_statistics(results)
 
@@ -937,191 +1545,462 @@ class ExpertMatcher:
         return score
     
     def test_method_optimized(self, method: MatchingMethod, askupo_df: pd.DataFrame,
-                             eatool_df: pd.DataFrame, askupo_col: str = None, eatool_col: str = None) -> pd.DataFrame:
+                             eatool_df: pd.DataFrame, askupo_col: str = None, eatool_col: str = None,
+                             prepared: Tuple = None, askupo_normalized: List[str] = None,
+                             matches: List[Tuple[str, float]] = None,
+                             progress_callback=None, *, settings: RunSettings) -> pd.DataFrame:
         """Оптимизированное тестирование метода
 
         Поддерживает:
         - Выбор конкретных столбцов для сравнения
         - Режим множественных столбцов (2 столбца одновременно)
         - Наследование дополнительных столбцов из источников
+
+        При сравнении нескольких методов подготовка источников не зависит от
+        метода: prepared (_prepare_source2) и askupo_normalized (_prepare_source1)
+        готовятся один раз и передаются каждому методу, а совпадения RapidFuzz
+        методов (matches) могут быть уже найдены общим проходом. Настройки
+        обработки (settings) читаются заранее в главном потоке (_read_run_settings).
         """
         # Используем выбранные столбцы из GUI или переданные параметры
         askupo_cols = self.selected_askupo_cols if self.selected_askupo_cols else [askupo_col if askupo_col else askupo_df.columns[0]]
         eatool_cols = self.selected_eatool_cols if self.selected_eatool_cols else [eatool_col if eatool_col else eatool_df.columns[0]]
 
-        # Подготовка данных из источника 2 для сравнения
-        # ОПТИМИЗАЦИЯ: один проход вместо двух (было 2 цикла - теперь 1)
-        eatool_combined_names = []
-        eatool_original_values = []
-        eatool_row_dict = {}
-
-        for _, row in eatool_df.iterrows():
-            # Объединяем значения из выбранных столбцов
-            combined = self.engine.combine_columns(row, eatool_cols)
-            eatool_combined_names.append(combined)
-            eatool_original_values.append(combined)
-            eatool_row_dict[combined] = row  # Заполняем словарь сразу в том же цикле
-
-        # Нормализация для поиска
-        eatool_normalized = [self.engine.normalize_string(name) for name in eatool_combined_names]
-        choice_dict = {norm: orig for norm, orig in zip(eatool_normalized, eatool_original_values)}
-
-        results = []
-
-        for _, row in askupo_df.iterrows():
-            # Объединяем значения из выбранных столбцов источника 1 (конкатенация)
-            askupo_combined = self.engine.combine_columns(row, askupo_cols)
-            askupo_normalized = self.engine.normalize_string(askupo_combined)
-
-            # Поиск лучшего совпадения
-            best_match, best_score = method.find_best_match(
-                askupo_normalized,
-                eatool_normalized,
-                choice_dict
-            )
+        if prepared is None:
+            prepared = self._prepare_source2(eatool_df, eatool_cols)
+        return self._match_frame(method, askupo_df, askupo_cols, eatool_df, prepared, settings,
+                                 progress_callback=progress_callback,
+                                 askupo_normalized=askupo_normalized, matches=matches)
 
-            # Применяем порог отклонения
-            if best_score < AppConstants.THRESHOLD_REJECT:
-                best_match = ""
-                best_score = 0
-
-            # Используем вспомогательный метод (рефакторинг v2.1 - устранение дублирования)
-            result_row = self._create_result_row_dict(
-                askupo_combined=askupo_combined,
-                best_match=best_match,
-                best_score=best_score,
-                method_name=method.name,
-                askupo_row=row,
-                askupo_df=askupo_df,
-                eatool_row_dict=eatool_row_dict,
-                eatool_df=eatool_df
-            )
+    def _prepare_source2(self, eatool_df: pd.DataFrame, eatool_cols: List[str]) -> Tuple[List[str], Dict[str, str], Dict[str, int], str]:
+        """Подготовка источника 2 к поиску (один раз на весь источник 1)
+
+        Большой источник 2 сохраняется в постоянный индекс (MatchIndexStore):
+        при повторных запусках на том же справочнике с теми же настройками
+        нормализации объединённые и нормализованные строки загружаются из него.
+
+        Args:
+            eatool_df: DataFrame источника 2
+            eatool_cols: Столбцы источника 2 для сравнения
+
+        Returns:
+            Tuple: (нормализованные строки, словарь {нормализованная: оригинальная},
+                    словарь {объединённая строка: позиция строки источника 2},
+                    отпечаток в постоянном индексе или None)
+        """
+        index_key = None
+        stored = None
+        if self.match_index is not None and len(eatool_df) >= AppConstants.MATCH_INDEX_MIN_ROWS:
+            # Результат нормализации зависит и от наличия библиотеки транслитерации
+            options_key = (self.engine.norm_options.key(), TRANSLITERATE_AVAILABLE)
+            index_key = self.match_index.key(eatool_df, eatool_cols, options_key)
+            stored = self.match_index.load(index_key)
+
+        if stored is not None:
+            eatool_combined_names, eatool_normalized = stored
+        else:
+            # Объединяем значения из выбранных столбцов (колоночно, без iterrows)
+            eatool_combined = self.engine.combine_columns_frame(eatool_df, eatool_cols)
+            eatool_combined_names = eatool_combined.tolist()
+
+            # Нормализация для поиска
+            eatool_normalized = self.engine.normalize_series(eatool_combined).tolist()
+
+            if index_key is not None:
+                self.match_index.store(index_key, eatool_combined_names, eatool_normalized)
+
+        # Объединённая строка -> позиция строки источника 2
+        eatool_row_dict = {combined: pos for pos, combined in enumerate(eatool_combined_names)}
+        choice_dict = {norm: orig for norm, orig in zip(eatool_normalized, eatool_combined_names)}
+
+        return eatool_normalized, choice_dict, eatool_row_dict, index_key
 
-            results.append(result_row)
+    def _prepare_source1(self, askupo_df: pd.DataFrame, askupo_cols: List[str]) -> List[str]:
+        """Нормализованные строки источника 1 (не зависят от метода сопоставления)
 
-        return pd.DataFrame(results)
+        Args:
+            askupo_df: DataFrame источника 1
+            askupo_cols: Столбцы источника 1 для сравнения
+
+        Returns:
+            Нормализованные строки (по строкам askupo_df)
+        """
+        # Объединяем значения из выбранных столбцов источника 1 (конкатенация)
+        askupo_combined = self.engine.combine_columns_frame(askupo_df, askupo_cols)
+        return self.engine.normalize_series(askupo_combined).tolist()
+
+    def _match_frame(self, method: MatchingMethod, askupo_df: pd.DataFrame, askupo_cols: List[str],
+                     eatool_df: pd.DataFrame, prepared: Tuple, settings: RunSettings,
+                     progress_callback=None, askupo_normalized: List[str] = None,
+                     matches: List[Tuple[str, float]] = None) -> pd.DataFrame:
+        """Сопоставление строк источника 1 (весь файл или очередная часть) с подготовленным источником 2
+
+        Args:
+            method: Метод сопоставления
+            askupo_df: DataFrame источника 1 (или его часть)
+            askupo_cols: Столбцы источника 1 для сравнения
+            eatool_df: DataFrame источника 2
+            prepared: Результат _prepare_source2
+            settings: Настройки обработки (_read_run_settings)
+            progress_callback: Функция (обработано, всего) для обновления прогресса
+            askupo_normalized: Результат _prepare_source1 для askupo_df (None = подготовить)
+            matches: Уже найденные совпадения (_find_best_matches_multi), None = найти
+
+        Returns:
+            DataFrame результата (строки - в порядке askupo_df)
+        """
+        eatool_normalized, choice_dict, eatool_row_dict, index_key = prepared
+
+        if askupo_normalized is None:
+            askupo_normalized = self._prepare_source1(askupo_df, askupo_cols)
+
+        # Пакетный поиск лучших совпадений (RapidFuzz - матрично через cdist)
+        if matches is None:
+            matches = self._find_best_matches(method, askupo_normalized, eatool_normalized, choice_dict,
+                                              settings, progress_callback=progress_callback,
+                                              index_key=index_key)
+
+        # Порог отклонения уже применён в find_best_matches (общий этап штрафа и порога)
+        # Результат собирается по столбцам: позиции лучших строк источника 2 + проценты
+        positions, scores = self._match_positions(matches, eatool_row_dict)
+        return self._build_results_frame(method.name, askupo_df, eatool_df,
+                                         askupo_normalized, eatool_normalized,
+                                         positions, scores, settings)
     
     def apply_method_optimized(self, method: MatchingMethod, askupo_df: pd.DataFrame,
-                               eatool_df: pd.DataFrame, askupo_cols: list, eatool_cols: list):
+                               eatool_df: pd.DataFrame, askupo_cols: list, eatool_cols: list,
+                               settings: RunSettings, previous: pd.DataFrame = None,
+                               prepared: Tuple = None):
         """Оптимизированное применение метода с поддержкой множественных столбцов
 
         Args:
             askupo_cols: Список столбцов источника 1 для сравнения
             eatool_cols: Список столбцов источника 2 для сравнения
+            settings: Настройки обработки (_read_run_settings)
+            previous: Предыдущий результат метода (инкрементальный режим, см. rematch_changed_rows)
+            prepared: Уже подготовленный источник 2 (_prepare_source2), None = подготовить
         """
+        start_time = time.time()
+        total = len(askupo_df)
 
-        progress_win = tk.Toplevel(self.root)
-        progress_win.title(f"Применение метода...")
-        progress_win.geometry("600x250")
-        progress_win.transient(self.root)
-        progress_win.grab_set()
+        def work(task: BackgroundTask) -> Tuple[pd.DataFrame, Dict, Dict]:
+            def on_progress(done: int, count: int):
+                elapsed = time.time() - start_time
+                remaining = (elapsed / max(done, 1)) * (count - done)
+                task.report(maximum=count, value=done,
+                            detail=f"{done}/{count} записей ({int(done/max(count, 1)*100)}%)",
+                            time_text=f"⏱️ Прошло: {int(elapsed)}с | Осталось: ~{int(remaining)}с")
+
+            if previous is not None:
+                task.report(status="Обработка новых и изменённых записей...", maximum=total)
+                return self.rematch_changed_rows(method, askupo_df, eatool_df,
+                                                 askupo_cols, eatool_cols, previous, settings,
+                                                 progress_callback=on_progress)
+
+            # Подготовка данных источника 2 с объединением столбцов
+            task.report(status="Подготовка данных...", maximum=total)
+            source2 = prepared if prepared is not None else self._prepare_source2(eatool_df, eatool_cols)
+
+            task.report(status="Обработка записей...")
+            results = self._match_frame_chunks(method, askupo_df, askupo_cols, eatool_df, source2,
+                                               settings, task, progress_callback=on_progress)
+            return results, None, None
+
+        def on_done(outcome: Tuple[pd.DataFrame, Dict, Dict]):
+            results, stats, changes = outcome
+            if total and results.empty:
+                self._show_task_error(TaskCancelled())
+                return
 
-        tk.Label(progress_win, text=f"⚙️ {method.name}",
-                font=("Arial", 12, "bold")).pack(pady=10)
+            self.results = results.sort_values('Процент совпадения', ascending=False)
 
-        status_label = tk.Label(progress_win, text="Подготовка данных...",
-                               font=("Arial", 10))
-        status_label.pack(pady=5)
+            self.display_results(method)
+            self.notebook.select(2)
 
-        progress_label = tk.Label(progress_win, text="", font=("Arial", 9))
-        progress_label.pack(pady=5)
+            elapsed_total = time.time() - start_time
 
-        progress_bar = ttk.Progressbar(progress_win, length=500, mode='determinate')
-        progress_bar.pack(pady=10)
+            # Используем ИСПРАВЛЕННУЮ функцию статистики
+            if stats is None:
+                stats = self.engine.calculate_statistics(self.results)
 
-        time_label = tk.Label(progress_win, text="", font=("Arial", 9), fg="gray")
-        time_label.pack(pady=5)
+            message = self._format_statistics_message(stats, elapsed_total)
+            if changes is not None:
+                message += (f"\n\n♻️ Из предыдущего результата: {changes['reused']}\n"
+                            f"   Сопоставлено заново (новые/изменённые): {changes['rematched']}\n"
+                            f"   Удалено из источника 1: {changes['removed']}")
+            if len(results) < total:
+                message += (f"\n\n⛔ Обработка отменена: сопоставлено {len(results)} из {total} "
+                            f"записей источника 1 (показаны готовые части)")
+                messagebox.showinfo("Остановлено", message)
+                return
+            messagebox.showinfo("Готово!", message)
 
-        self.root.update()
+        self._run_task("Применение метода...", f"⚙️ {method.name}", work, on_done)
 
-        start_time = time.time()
+    def _match_frame_chunks(self, method: MatchingMethod, askupo_df: pd.DataFrame, askupo_cols: List[str],
+                            eatool_df: pd.DataFrame, prepared: Tuple, settings: RunSettings,
+                            task: BackgroundTask, progress_callback=None,
+                            chunk_rows: int = AppConstants.TASK_CHUNK_ROWS) -> pd.DataFrame:
+        """Сопоставление источника 1 частями с возможностью отмены между частями
 
-        # Подготовка данных источника 2 с объединением столбцов
-        # ОПТИМИЗАЦИЯ: один проход вместо двух (было 2 цикла - теперь 1)
-        eatool_combined_names = []
-        eatool_row_dict = {}
+        Отмена (TaskCancelled из task или progress_callback) прерывает текущую
+        часть; результат содержит уже готовые части - первые строки источника 1.
 
-        for _, row in eatool_df.iterrows():
-            combined = self.engine.combine_columns(row, eatool_cols)
-            eatool_combined_names.append(combined)
-            eatool_row_dict[combined] = row  # Заполняем словарь сразу в том же цикле
+        Args:
+            method: Метод сопоставления
+            askupo_df: DataFrame источника 1
+            askupo_cols: Столбцы источника 1 для сравнения
+            eatool_df: DataFrame источника 2
+            prepared: Результат _prepare_source2
+            settings: Настройки обработки (_read_run_settings)
+            task: Фоновая задача (точки отмены)
+            progress_callback: Функция (обработано, всего) по всему источнику 1
+            chunk_rows: Количество строк источника 1 в одной части
 
-        eatool_normalized = [self.engine.normalize_string(name) for name in eatool_combined_names]
-        choice_dict = {norm: orig for norm, orig in zip(eatool_normalized, eatool_combined_names)}
+        Returns:
+            DataFrame результата (строки - в порядке askupo_df, при отмене - только готовые части)
+        """
+        total = len(askupo_df)
+        parts = []
+        for start in range(0, total, max(1, chunk_rows)):
+            chunk = askupo_df.iloc[start:start + chunk_rows]
+            on_progress = None
+            if progress_callback:
+                on_progress = lambda done, count, offset=start: progress_callback(offset + done, total)
+
+            try:
+                task.check_cancelled()
+                parts.append(self._match_frame(method, chunk, askupo_cols, eatool_df, prepared, settings,
+                                               progress_callback=on_progress))
+            except TaskCancelled:
+                break
+
+        if not parts:
+            return self._match_frame(method, askupo_df.iloc[:0], askupo_cols, eatool_df, prepared, settings)
+        if len(parts) == 1:
+            return parts[0]
+        return pd.concat(parts, ignore_index=True)
+
+    def rematch_changed_rows(self, method: MatchingMethod, askupo_df: pd.DataFrame,
+                             eatool_df: pd.DataFrame, askupo_cols: List[str], eatool_cols: List[str],
+                             previous: pd.DataFrame, settings: RunSettings,
+                             progress_callback=None) -> Tuple[pd.DataFrame, Dict, Dict]:
+        """Инкрементальное сопоставление: повторно сопоставляются только новые и изменённые строки
+
+        Ключ строки - значения сравниваемых столбцов источника 1 и их
+        нормализованная строка (столбец [DEBUG] результата): результат
+        сопоставления зависит только от них. Строки, ключ которых есть в
+        предыдущем результате, берут оттуда совпадение из источника 2 и
+        процент (остальные столбцы источника 1 - из нового файла); изменение
+        настроек нормализации меняет ключ, и такие строки сопоставляются
+        заново. Источник 2 и метод должны быть теми же, что в предыдущем
+        результате; если изменённых строк нет, источник 2 не подготавливается.
 
-        status_label.config(text="Обработка записей...")
+        Args:
+            method: Метод сопоставления (тот же, что в предыдущем результате)
+            askupo_df: Новый DataFrame источника 1
+            eatool_df: DataFrame источника 2
+            askupo_cols: Столбцы источника 1 для сравнения
+            eatool_cols: Столбцы источника 2 для сравнения
+            previous: Предыдущий результат (таблица результатов, можно с "№")
+            settings: Настройки обработки (_read_run_settings)
+            progress_callback: Функция (обработано, всего) для обновления прогресса
 
-        results = []
-        total = len(askupo_df)
-        progress_bar['maximum'] = total
+        Returns:
+            Tuple: (результат в порядке askupo_df, статистика (calculate_statistics),
+                    {'reused': ..., 'rematched': ..., 'removed': ...})
 
-        for idx, row in askupo_df.iterrows():
-            # Объединяем значения из выбранных столбцов источника 1
-            askupo_combined = self.engine.combine_columns(row, askupo_cols)
-            askupo_normalized = self.engine.normalize_string(askupo_combined)
+        Raises:
+            ValueError: Если предыдущий результат получен другим методом или
+                в нём нет сравниваемых столбцов источника 1
+        """
+        source1_prefix = f"{AppConstants.COL_SOURCE1_PREFIX} "
+        missing = [col for col in askupo_cols if source1_prefix + col not in previous.columns]
+        if missing:
+            raise ValueError(f"В предыдущем результате нет столбцов источника 1: {', '.join(missing)}")
+        methods = set(previous[AppConstants.COL_METHOD].dropna().unique())
+        if methods - {method.name}:
+            raise ValueError(f"Предыдущий результат получен другим методом: {', '.join(map(str, methods))}")
+
+        def row_keys(frame: pd.DataFrame, normalized: pd.Series = None) -> np.ndarray:
+            combined = self.engine.combine_columns_frame(frame, askupo_cols)
+            if normalized is None:
+                normalized = self.engine.normalize_series(combined)
+            return (combined.astype(str) + "\x1f" + normalized.astype(str)).to_numpy(dtype=object)
+
+        new_keys = row_keys(askupo_df)
+
+        previous_source1 = pd.DataFrame({col: previous[source1_prefix + col].to_numpy()
+                                         for col in askupo_cols})
+        previous_normalized = None
+        debug_col = '[DEBUG] Нормализованный Источник 1'
+        if debug_col in previous.columns:
+            # Пустые строки при чтении файла результата становятся NaN
+            previous_normalized = previous[debug_col].fillna("").reset_index(drop=True)
+        previous_keys = row_keys(previous_source1, previous_normalized)
+
+        # Ключ -> первая строка предыдущего результата с этим ключом
+        first = ~pd.Series(previous_keys).duplicated().to_numpy()
+        previous_rows = np.flatnonzero(first)
+        hits = pd.Index(previous_keys[first]).get_indexer(new_keys)
+        reuse = hits >= 0
+
+        # Новые и изменённые строки сопоставляются заново (источник 2 - только если они есть)
+        changed_df = askupo_df[~reuse]
+        if len(changed_df):
+            prepared = self._prepare_source2(eatool_df, eatool_cols)
+            fresh = self._match_frame(method, changed_df, askupo_cols, eatool_df, prepared, settings,
+                                      progress_callback=progress_callback)
+        else:
+            fresh = self._build_results_frame(method.name, askupo_df.iloc[:0], eatool_df, [], [],
+                                              np.empty(0, dtype=np.int64), np.empty(0), settings)
+
+        # Совпадения неизменённых строк - из предыдущего результата, источник 1 - из нового файла
+        reused_df = askupo_df[reuse]
+        reused = previous.iloc[previous_rows[hits[reuse]]].reset_index(drop=True)
+        reused = reused.reindex(columns=fresh.columns)
+        for col in reused.columns:
+            if col.startswith(source1_prefix) and col[len(source1_prefix):] in reused_df.columns:
+                reused[col] = reused_df[col[len(source1_prefix):]].to_numpy()
+            elif col not in (AppConstants.COL_PERCENT, AppConstants.COL_METHOD) and reused[col].hasnans:
+                # Нет совпадения в источнике 2 - "" (как в новом результате)
+                reused[col] = reused[col].astype(object).where(reused[col].notna(), "")
+
+        stats = self.engine.merge_statistics(self.engine.calculate_statistics(reused),
+                                             self.engine.calculate_statistics(fresh))
+
+        # Исходный порядок строк источника 1
+        reused.index = np.flatnonzero(reuse)
+        fresh.index = np.flatnonzero(~reuse)
+        parts = [part for part in (reused, fresh) if len(part)] or [fresh]
+        results = pd.concat(parts).sort_index().reset_index(drop=True)
+
+        changes = {
+            'reused': int(reuse.sum()),
+            'rematched': int((~reuse).sum()),
+            # Строки предыдущего результата, которых больше нет в источнике 1 (или они изменились)
+            'removed': int((~pd.Series(previous_keys).isin(new_keys)).sum()),
+        }
+        return results, stats, changes
+
+    def _format_statistics_message(self, stats: Dict, elapsed_total: float) -> str:
+        """Текст итогового сообщения со статистикой по категориям"""
+        if not stats['total']:
+            return "✅ Обработка завершена!\n\nИсточник 1 не содержит записей."
+
+        return (f"✅ Обработка завершена!\n\n"
+                f"⏱️ Время: {int(elapsed_total)}с ({elapsed_total/60:.1f} мин)\n"
+                f"📊 Обработано: {stats['total']} записей\n\n"
+                f"Результаты (по категориям):\n"
+                f"  • 100% (точное):     {stats['perfect']} ({stats['perfect']/stats['total']*100:.1f}%)\n"
+                f"  • 90-99% (высокое):  {stats['high']} ({stats['high']/stats['total']*100:.1f}%)\n"
+                f"  • 70-89% (среднее):  {stats['medium']} ({stats['medium']/stats['total']*100:.1f}%)\n"
+                f"  • 50-69% (низкое):   {stats['low']} ({stats['low']/stats['total']*100:.1f}%)\n"
+                f"  • 1-49% (очень низкое): {stats['very_low']} ({stats['very_low']/stats['total']*100:.1f}%)\n"
+                f"  • 0% (нет совпадения): {stats['none']} ({stats['none']/stats['total']*100:.1f}%)\n\n"
+                f"✓ Проверка: {stats['check_sum']} = {stats['total']} {'✅' if stats['check_sum'] == stats['total'] else '❌'}")
+
+    def stream_method_to_file(self, method: MatchingMethod, eatool_df: pd.DataFrame,
+                              askupo_cols: list, eatool_cols: list, save_path: str,
+                              settings: RunSettings,
+                              chunksize: int = AppConstants.STREAM_CHUNK_ROWS,
+                              progress_callback=None) -> Dict:
+        """Потоковое применение метода: источник 1 читается и записывается частями
+
+        Источник 1 целиком в память не загружается: каждая часть сопоставляется
+        с подготовленным (один раз) источником 2 и сразу дописывается в файл
+        результата. Пиковая память определяется размером части, а не файла.
+        Строки результата идут в порядке источника 1 (без сортировки по проценту).
 
-            best_match, best_score = method.find_best_match(
-                askupo_normalized,
-                eatool_normalized,
-                choice_dict
-            )
+        Args:
+            method: Метод сопоставления
+            eatool_df: DataFrame источника 2
+            askupo_cols: Список столбцов источника 1 для сравнения
+            eatool_cols: Список столбцов источника 2 для сравнения
+            save_path: Файл результата (.xlsx или .csv)
+            settings: Настройки обработки (_read_run_settings)
+            chunksize: Количество строк источника 1 в одной части
+            progress_callback: Функция (обработано записей) для обновления прогресса;
+                исключение TaskCancelled из неё останавливает обработку - уже
+                записанные части остаются в файле
 
-            # Применяем порог отклонения
-            if best_score < AppConstants.THRESHOLD_REJECT:
-                best_match = ""
-                best_score = 0
-
-            # Используем вспомогательный метод (рефакторинг v2.1 - устранение дублирования)
-            result_row = self._create_result_row_dict(
-                askupo_combined=askupo_combined,
-                best_match=best_match,
-                best_score=best_score,
-                method_name=method.name,
-                askupo_row=row,
-                askupo_df=askupo_df,
-                eatool_row_dict=eatool_row_dict,
-                eatool_df=eatool_df
-            )
+        Returns:
+            Статистика по записанному результату (calculate_statistics)
+        """
+        # Без наследования столбцов читаются только выбранные для сравнения
+        askupo_usecols = None if settings.inherit_askupo_cols else askupo_cols
 
-            results.append(result_row)
-            
-            if idx % 10 == 0:
+        prepared = self._prepare_source2(eatool_df, eatool_cols)
+        processed = 0
+
+        with ResultStreamWriter(self.exporter, save_path) as writer:
+            for chunk in self.data_manager.iter_source_chunks(self._askupo_source(), chunksize,
+                                                              usecols=askupo_usecols):
+                on_progress = None
+                if progress_callback:
+                    on_progress = lambda done, count: progress_callback(processed + done)
+
+                try:
+                    results = self._match_frame(method, chunk, askupo_cols, eatool_df, prepared, settings,
+                                                progress_callback=on_progress)
+                    writer.write(results)
+
+                    processed += len(chunk)
+                    if progress_callback:
+                        progress_callback(processed)
+                except TaskCancelled:
+                    break
+
+        return writer.statistics or self.engine.calculate_statistics(
+            pd.DataFrame({AppConstants.COL_PERCENT: []}))
+
+    def apply_method_streaming(self, method: MatchingMethod, eatool_df: pd.DataFrame,
+                               askupo_cols: list, eatool_cols: list, settings: RunSettings):
+        """Потоковое применение метода к большому источнику 1 с записью результата в файл
+
+        Args:
+            askupo_cols: Список столбцов источника 1 для сравнения
+            eatool_cols: Список столбцов источника 2 для сравнения
+            settings: Настройки обработки (_read_run_settings)
+        """
+        save_path = filedialog.asksaveasfilename(
+            title="Файл для потоковой записи результатов",
+            defaultextension=".xlsx",
+            initialfile="Результаты_сопоставления.xlsx",
+            filetypes=[("Excel files", "*.xlsx"), ("CSV files", "*.csv")]
+        )
+        if not save_path:
+            return
+
+        start_time = time.time()
+
+        def work(task: BackgroundTask) -> Tuple[Dict, bool]:
+            def on_progress(done: int):
                 elapsed = time.time() - start_time
-                remaining = (elapsed / (idx + 1)) * (total - idx - 1)
-                
-                progress_bar['value'] = idx
-                progress_label.config(text=f"{idx}/{total} записей ({int(idx/total*100)}%)")
-                time_label.config(text=f"⏱️ Прошло: {int(elapsed)}с | Осталось: ~{int(remaining)}с")
-                self.root.update()
-        
-        progress_bar['value'] = total
-        self.root.update()
-        
-        self.results = pd.DataFrame(results).sort_values('Процент совпадения', ascending=False)
-        
-        progress_win.destroy()
-        
-        self.display_results(method)
-        self.notebook.select(2)
-        
-        elapsed_total = time.time() - start_time
-        
-        # Используем ИСПРАВЛЕННУЮ функцию статистики
-        stats = self.engine.calculate_statistics(self.results)
-        
-        stats_msg = (f"✅ Обработка завершена!\n\n"
-                    f"⏱️ Время: {int(elapsed_total)}с ({elapsed_total/60:.1f} мин)\n"
-                    f"📊 Обработано: {stats['total']} записей\n\n"
-                    f"Результаты (по категориям):\n"
-                    f"  • 100% (точное):     {stats['perfect']} ({stats['perfect']/stats['total']*100:.1f}%)\n"
-                    f"  • 90-99% (высокое):  {stats['high']} ({stats['high']/stats['total']*100:.1f}%)\n"
-                    f"  • 70-89% (среднее):  {stats['medium']} ({stats['medium']/stats['total']*100:.1f}%)\n"
-                    f"  • 50-69% (низкое):   {stats['low']} ({stats['low']/stats['total']*100:.1f}%)\n"
-                    f"  • 1-49% (очень низкое): {stats['very_low']} ({stats['very_low']/stats['total']*100:.1f}%)\n"
-                    f"  • 0% (нет совпадения): {stats['none']} ({stats['none']/stats['total']*100:.1f}%)\n\n"
-                    f"✓ Проверка: {stats['check_sum']} = {stats['total']} {'✅' if stats['check_sum'] == stats['total'] else '❌'}")
-        
-        messagebox.showinfo("Готово!", stats_msg)
+                task.report(status="Обработка записей...", detail=f"Обработано записей: {done}",
+                            time_text=f"⏱️ Прошло: {int(elapsed)}с | {done / max(elapsed, 1e-6):.0f} записей/с",
+                            step=True)
+
+            task.report(status="Подготовка данных...")
+            stats = self.stream_method_to_file(method, eatool_df, askupo_cols, eatool_cols,
+                                               save_path, settings, progress_callback=on_progress)
+            return stats, task.cancelled
+
+        def on_done(outcome: Tuple[Dict, bool]):
+            stats, cancelled = outcome
+            elapsed_total = time.time() - start_time
+            message = (self._format_statistics_message(stats, elapsed_total) +
+                       f"\n\n💾 Результаты сохранены:\n{save_path}")
+            if cancelled:
+                messagebox.showinfo("Остановлено", message +
+                                    f"\n\n⛔ Обработка отменена: в файле {stats['total']} первых "
+                                    f"записей источника 1")
+                return
+            messagebox.showinfo("Готово!", message)
+
+        # Общее количество строк заранее неизвестно - индикатор без шкалы
+        self._run_task("Потоковое применение метода...", f"⚙️ {method.name}", work, on_done,
+                       indeterminate=True)
     
     def display_comparison(self, comparison_results: List[Dict]):
         """Отображение сравнения методов"""
@@ -1282,6 +2161,8 @@ class ExpertMatcher:
 
 
 def main():
+    # Нужно для ProcessPoolExecutor в собранном .exe (PyInstaller)
+    multiprocessing.freeze_support()
     root = tk.Tk()
     app = ExpertMatcher(root)
     root.mainloop()
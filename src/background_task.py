@@ -0,0 +1,165 @@
+"""
+Фоновое выполнение обработки для Expert Excel Matcher
+
+Этот модуль содержит:
+- TaskCancelled: исключение отмены обработки пользователем
+- BackgroundTask: выполнение функции в рабочем потоке; прогресс передаётся
+  через очередь и обрабатывается в главном потоке Tk (опрос через root.after)
+"""
+
+import queue
+import threading
+from typing import Any, Callable, Dict, Optional
+
+from src.constants import AppConstants
+
+
+class TaskCancelled(Exception):
+    """Обработка отменена пользователем"""
+
+
+class BackgroundTask:
+    """Функция обработки в рабочем потоке с событиями прогресса и отменой
+
+    Рабочий поток не обращается к виджетам: он только кладёт события в
+    очередь (report), а главный поток забирает их по таймеру root.after и
+    вызывает on_progress / on_done / on_error. События прогресса,
+    накопившиеся между опросами, объединяются - окно обновляется не чаще
+    одного раза за период опроса.
+
+    Отмена (cancel) лишь выставляет флаг: следующий report или
+    check_cancelled в рабочем потоке вызывает TaskCancelled, поэтому работа
+    останавливается между частями. Функция обработки может перехватить
+    TaskCancelled и вернуть частичный результат (cancelled = True).
+
+    Если Tcl собран без поддержки потоков, обращения к переменным Tk из
+    рабочего потока невозможны - тогда функция выполняется в главном потоке,
+    а окно обновляется при каждом report (root.update).
+    """
+
+    def __init__(self, root, work: Callable[['BackgroundTask'], Any],
+                 on_progress: Optional[Callable[[Dict], None]] = None,
+                 on_done: Optional[Callable[[Any], None]] = None,
+                 on_error: Optional[Callable[[BaseException], None]] = None,
+                 poll_ms: int = AppConstants.TASK_POLL_MS,
+                 threaded: Optional[bool] = None):
+        """
+        Инициализация фоновой задачи
+
+        Args:
+            root: Корневое окно Tk (для root.after)
+            work: Функция обработки (task) -> результат, выполняется в рабочем потоке
+            on_progress: Обработчик прогресса {поле: значение} (главный поток)
+            on_done: Обработчик результата work (главный поток)
+            on_error: Обработчик исключения work, в т.ч. TaskCancelled (главный поток)
+            poll_ms: Период опроса очереди событий, мс
+            threaded: Выполнять в рабочем потоке (None = если Tcl поддерживает потоки)
+        """
+        self.root = root
+        self.work = work
+        self.on_progress = on_progress
+        self.on_done = on_done
+        self.on_error = on_error
+        self.poll_ms = poll_ms
+        self.threaded = self._tcl_threaded(root) if threaded is None else threaded
+
+        self.finished = False
+        self._events = queue.Queue()
+        self._cancel = threading.Event()
+        self._thread = None
+
+    @staticmethod
+    def _tcl_threaded(root) -> bool:
+        """Поддерживает ли Tcl обращения из других потоков"""
+        try:
+            return bool(int(root.tk.eval('set tcl_platform(threaded)')))
+        except Exception:
+            return False
+
+    @property
+    def cancelled(self) -> bool:
+        """Запрошена ли отмена"""
+        return self._cancel.is_set()
+
+    def start(self):
+        """Запуск обработки"""
+        if not self.threaded:
+            self._run()
+            self.poll()
+            return
+
+        self._thread = threading.Thread(target=self._run, name="ExpertMatcherTask", daemon=True)
+        self._thread.start()
+        self.root.after(self.poll_ms, self._poll_loop)
+
+    def cancel(self):
+        """Запрос отмены (работа остановится в ближайшей точке проверки)"""
+        self._cancel.set()
+
+    def check_cancelled(self):
+        """
+        Точка отмены в рабочем потоке
+
+        Raises:
+            TaskCancelled: Если запрошена отмена
+        """
+        if self._cancel.is_set():
+            raise TaskCancelled()
+
+    def report(self, **fields):
+        """
+        Событие прогресса из рабочего потока (заодно точка отмены)
+
+        Args:
+            **fields: Поля прогресса для on_progress
+
+        Raises:
+            TaskCancelled: Если запрошена отмена
+        """
+        self.check_cancelled()
+        self._events.put(('progress', fields))
+        if not self.threaded:
+            self.poll()
+            self.root.update()
+
+    def _run(self):
+        """Выполнение work с передачей результата или исключения через очередь"""
+        try:
+            self._events.put(('done', self.work(self)))
+        except BaseException as error:  # Передаётся в главный поток, в т.ч. TaskCancelled
+            self._events.put(('error', error))
+
+    def poll(self) -> bool:
+        """
+        Обработка накопившихся событий (главный поток)
+
+        Returns:
+            bool: Завершена ли задача
+        """
+        progress = {}
+        while not self.finished:
+            try:
+                kind, payload = self._events.get_nowait()
+            except queue.Empty:
+                break
+
+            if kind == 'progress':
+                progress.update(payload)
+                continue
+
+            if progress and self.on_progress:
+                self.on_progress(progress)
+                progress = {}
+            self.finished = True
+            handler = self.on_done if kind == 'done' else self.on_error
+            if handler:
+                handler(payload)
+
+        if progress and self.on_progress:
+            self.on_progress(progress)
+        return self.finished
+
+    def _poll_loop(self):
+        """Периодический опрос очереди, пока задача не завершится"""
+        if not self.poll():
+            self.root.after(self.poll_ms, self._poll_loop)
@@ -0,0 +1,339 @@
+"""
+Пакетная оценка совпадений для Expert Excel Matcher
+
+Этот модуль содержит:
+- BatchScorer: оценка целых блоков запросов источника 1 против всех строк
+  источника 2 одним вызовом rapidfuzz.process.cdist (на всех ядрах) вместо
+  extractOne на каждую строку
+- MultiScorer: оценка нескольких scorer'ов rapidfuzz за один проход по
+  блокам с общими матрицами (режимы сравнения методов)
+- query_blocks: разбиение запросов на блоки, в т.ч. с блокировкой
+  кандидатов (NgramIndex)
+"""
+
+import numpy as np
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from src.blocking_index import NgramIndex
+from src.constants import AppConstants
+from src.scoring import apply_length_penalty, length_penalty, select_best
+
+try:
+    from rapidfuzz import fuzz, process
+    RAPIDFUZZ_AVAILABLE = True
+except ImportError:
+    RAPIDFUZZ_AVAILABLE = False
+
+
+def _candidate_block(rows: List[int], candidates: List[np.ndarray]
+                     ) -> Tuple[np.ndarray, np.ndarray, Optional[np.ndarray]]:
+    """Блок запросов против объединения их кандидатов: (запросы, варианты, маска своих кандидатов)"""
+    if len(rows) == 1:
+        # Один запрос - варианты и есть его кандидаты, маска не нужна
+        return np.array(rows, dtype=np.int64), candidates[0], None
+    cols = np.unique(np.concatenate(candidates)).astype(np.int64)
+    mask = np.zeros((len(rows), len(cols)), dtype=bool)
+    for i, ids in enumerate(candidates):
+        mask[i, np.searchsorted(cols, ids)] = True
+    return np.array(rows, dtype=np.int64), cols, mask
+
+
+def query_blocks(queries: Sequence[str], active: np.ndarray, n_choices: int, block_cells: int,
+                 blocking_index: Optional[NgramIndex] = None,
+                 max_waste: float = AppConstants.BLOCKING_BATCH_WASTE
+                 ) -> Iterator[Tuple[np.ndarray, Optional[np.ndarray], Optional[np.ndarray], int]]:
+    """
+    Блоки запросов для матричной оценки
+
+    Без блокировки блок - подряд идущие запросы против всех вариантов. С
+    блокировкой запросы оцениваются против объединения кандидатов блока, а
+    маска оставляет каждому запросу только его кандидатов (результат как при
+    оценке каждого запроса по своим кандидатам). Запросы добавляются в блок,
+    пока матрица не больше block_cells и не больше max_waste × нужных ячеек.
+
+    Args:
+        queries: Нормализованные строки запросов
+        active: Номера оцениваемых (непустых) запросов по возрастанию
+        n_choices: Количество вариантов
+        block_cells: Максимум ячеек матрицы блока
+        blocking_index: N-граммный индекс вариантов (None = без блокировки)
+        max_waste: Допустимое отношение ячеек матрицы к ячейкам своих кандидатов
+
+    Yields:
+        (номера запросов, номера вариантов или None = все, маска кандидатов или None,
+         обработано запросов из active)
+    """
+    if blocking_index is None:
+        block_size = max(1, block_cells // max(1, n_choices))
+        for start in range(0, len(active), block_size):
+            rows = active[start:start + block_size]
+            yield rows, None, None, start + len(rows)
+        return
+
+    rows, candidates = [], []
+    needed = 0  # Ячейки своих кандидатов
+    in_union = np.zeros(n_choices, dtype=bool)
+    union_size = 0
+    for position, row in enumerate(active):
+        ids = blocking_index.candidates(queries[row])
+        if not len(ids):
+            continue  # Без кандидатов - "нет совпадения", оценивать нечего
+        new_size = union_size + int(np.count_nonzero(~in_union[ids]))
+        cells = (len(rows) + 1) * new_size
+        if rows and (cells > block_cells or cells > max_waste * (needed + len(ids))):
+            rows_block, cols, mask = _candidate_block(rows, candidates)
+            yield rows_block, cols, mask, position
+            in_union[cols] = False
+            rows, candidates, needed = [], [], 0
+            new_size = len(ids)
+
+        rows.append(row)
+        candidates.append(ids)
+        needed += len(ids)
+        in_union[ids] = True
+        union_size = new_size
+
+    if rows:
+        rows_block, cols, mask = _candidate_block(rows, candidates)
+        yield rows_block, cols, mask, len(active)
+
+
+def _cdist_workers(workers: int, n_rows: int, n_cols: int) -> int:
+    """Потоков cdist для матрицы: небольшие блоки (с блокировкой) - в одном потоке"""
+    return workers if n_rows * n_cols >= AppConstants.BATCH_PARALLEL_MIN_CELLS else 1
+
+
+def _choice_ids(best: np.ndarray, cols: Optional[np.ndarray]) -> np.ndarray:
+    """Номера лучших вариантов в полном списке (cols - варианты блока, None = все)"""
+    if cols is None or not len(cols):
+        return best
+    return np.where(best >= 0, cols[np.maximum(best, 0)], -1)
+
+
+class BatchScorer:
+    """Матричная оценка блоков запросов через rapidfuzz.process.cdist"""
+
+    def __init__(self, scorer: Callable,
+                 score_cutoff: float = AppConstants.THRESHOLD_REJECT,
+                 workers: int = AppConstants.BATCH_WORKERS,
+                 block_cells: int = AppConstants.BATCH_BLOCK_CELLS):
+        """
+        Инициализация пакетного оценщика
+
+        Args:
+            scorer: Scorer rapidfuzz (fuzz.WRatio, fuzz.ratio...)
+            score_cutoff: Порог отсечения (ниже - совпадение отклоняется)
+            workers: Количество потоков cdist (-1 = все ядра)
+            block_cells: Максимум ячеек матрицы в одном блоке (ограничивает память)
+        """
+        if not RAPIDFUZZ_AVAILABLE:
+            raise ImportError("rapidfuzz не установлен. Установите: pip install rapidfuzz")
+
+        self.scorer = scorer
+        self.score_cutoff = score_cutoff
+        self.workers = workers
+        self.block_cells = block_cells
+
+    def best_matches(self, queries: Sequence[str], choices: Sequence[str],
+                     choice_lengths: Sequence[int],
+                     progress_callback: Optional[Callable[[int, int], None]] = None,
+                     blocking_index: Optional[NgramIndex] = None
+                     ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Поиск лучшего варианта для каждого запроса с учётом штрафа за длину
+
+        Args:
+            queries: Нормализованные строки запросов (источник 1)
+            choices: Нормализованные строки вариантов (источник 2)
+            choice_lengths: Длины вариантов, используемые в штрафе
+            progress_callback: Функция (обработано, всего), вызывается после каждого блока
+            blocking_index: N-граммный индекс вариантов - каждый запрос оценивается
+                только по своим кандидатам (None = без блокировки)
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: (индекс лучшего варианта или -1, скорректированный процент)
+        """
+        total = len(queries)
+        best_idx = np.full(total, -1, dtype=np.int64)
+        best_scores = np.zeros(total, dtype=np.float64)
+
+        if total == 0 or len(choices) == 0:
+            return best_idx, best_scores
+
+        choice_lens = np.asarray(choice_lengths, dtype=np.float64)
+        # Пустые запросы не оцениваем - для них сразу "нет совпадения"
+        active = np.array([i for i, q in enumerate(queries) if q], dtype=np.int64)
+
+        for rows, cols, mask, done in query_blocks(queries, active, len(choices), self.block_cells,
+                                                   blocking_index):
+            block_queries = [queries[i] for i in rows]
+            block_choices = choices if cols is None else [choices[i] for i in cols]
+            block_lens = choice_lens if cols is None else choice_lens[cols]
+
+            scores = process.cdist(block_queries, block_choices,
+                                   scorer=self.scorer,
+                                   score_cutoff=self.score_cutoff,
+                                   workers=_cdist_workers(self.workers, len(rows), len(block_choices)),
+                                   dtype=np.float32)
+
+            query_lens = np.fromiter((len(q) for q in block_queries),
+                                     dtype=np.float64, count=len(block_queries))
+            adjusted = apply_length_penalty(scores, query_lens[:, None], block_lens[None, :],
+                                            self.score_cutoff)
+            if mask is not None:
+                adjusted = np.where(mask, adjusted, 0)
+
+            block_best, best_scores[rows] = select_best(adjusted)
+            best_idx[rows] = _choice_ids(block_best, cols)
+
+            if progress_callback:
+                progress_callback(done, len(active))
+
+        return best_idx, best_scores
+
+
+def sort_tokens(s: str) -> str:
+    """Токены строки по порядку (как внутри token_sort_ratio)"""
+    return " ".join(sorted(s.split()))
+
+
+class MultiScorer:
+    """Оценка нескольких scorer'ов rapidfuzz за один проход по блокам запросов
+
+    Часть scorer'ов выражается через другие - для любых строк результат
+    тождественно равен:
+    - QRatio(a, b) = ratio(a, b) для непустого запроса (пустые не оцениваются)
+    - token_sort_ratio(a, b) = ratio(sort_tokens(a), sort_tokens(b))
+    - partial_token_sort_ratio(a, b) = partial_ratio(sort_tokens(a), sort_tokens(b))
+    - token_ratio = max(token_sort_ratio, token_set_ratio)
+    - partial_token_ratio = max(partial_token_sort_ratio, partial_token_set_ratio)
+
+    Поэтому для каждого блока запросов каждая базовая матрица считается
+    один раз, токены всех строк сортируются один раз на весь список, а
+    штраф за длину - один раз на блок для всех scorer'ов.
+    """
+
+    def __init__(self, scorers: Sequence[Callable],
+                 score_cutoff: float = AppConstants.THRESHOLD_REJECT,
+                 workers: int = AppConstants.BATCH_WORKERS,
+                 block_cells: int = AppConstants.BATCH_BLOCK_CELLS):
+        """
+        Инициализация оценщика нескольких scorer'ов
+
+        Args:
+            scorers: Scorer'ы rapidfuzz (fuzz.WRatio, fuzz.ratio...)
+            score_cutoff: Порог отсечения (ниже - совпадение отклоняется)
+            workers: Количество потоков cdist (-1 = все ядра)
+            block_cells: Максимум ячеек всех матриц блока вместе (ограничивает память)
+        """
+        if not RAPIDFUZZ_AVAILABLE:
+            raise ImportError("rapidfuzz не установлен. Установите: pip install rapidfuzz")
+
+        self.scorers = list(scorers)
+        self.score_cutoff = score_cutoff
+        self.workers = workers
+        self.block_cells = block_cells
+
+        # scorer -> (базовый scorer, по отсортированным токенам) или пара scorer'ов для max
+        self._base = {
+            fuzz.QRatio: (fuzz.ratio, False),
+            fuzz.token_sort_ratio: (fuzz.ratio, True),
+            fuzz.partial_token_sort_ratio: (fuzz.partial_ratio, True),
+        }
+        self._composite = {
+            fuzz.token_ratio: (fuzz.token_sort_ratio, fuzz.token_set_ratio),
+            fuzz.partial_token_ratio: (fuzz.partial_token_sort_ratio, fuzz.partial_token_set_ratio),
+        }
+
+    def _base_keys(self, scorer: Callable) -> List[Tuple[Callable, bool]]:
+        """Базовые матрицы (scorer cdist, по отсортированным токенам), нужные для scorer"""
+        if scorer in self._composite:
+            return [key for part in self._composite[scorer] for key in self._base_keys(part)]
+        return [self._base.get(scorer, (scorer, False))]
+
+    def _block_scores(self, scorer: Callable, matrices: Dict) -> np.ndarray:
+        """Матрица оценок scorer из базовых матриц блока"""
+        if scorer in self._composite:
+            first, second = self._composite[scorer]
+            return np.maximum(self._block_scores(first, matrices), self._block_scores(second, matrices))
+        return matrices[self._base.get(scorer, (scorer, False))]
+
+    def best_matches(self, queries: Sequence[str], choices: Sequence[str],
+                     choice_lengths: Sequence[int],
+                     progress_callback: Optional[Callable[[int, int], None]] = None,
+                     blocking_index: Optional[NgramIndex] = None
+                     ) -> List[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Поиск лучшего варианта для каждого запроса по каждому scorer с учётом штрафа за длину
+
+        Результат для каждого scorer идентичен BatchScorer(scorer).best_matches.
+
+        Args:
+            queries: Нормализованные строки запросов (источник 1)
+            choices: Нормализованные строки вариантов (источник 2)
+            choice_lengths: Длины вариантов, используемые в штрафе
+            progress_callback: Функция (обработано, всего), вызывается после каждого блока
+            blocking_index: N-граммный индекс вариантов - каждый запрос оценивается
+                только по своим кандидатам (None = без блокировки)
+
+        Returns:
+            Список (индекс лучшего варианта или -1, скорректированный процент) - по scorers
+        """
+        total = len(queries)
+        results = [(np.full(total, -1, dtype=np.int64), np.zeros(total, dtype=np.float64))
+                   for _ in self.scorers]
+
+        if total == 0 or len(choices) == 0 or not self.scorers:
+            return results
+
+        base_keys = list(dict.fromkeys(key for scorer in self.scorers for key in self._base_keys(scorer)))
+
+        # Токены сортируются один раз на весь список, а не для каждой пары строк
+        sorted_choices = None
+        sorted_queries = None
+        if any(by_tokens for _, by_tokens in base_keys):
+            sorted_choices = [sort_tokens(choice) for choice in choices]
+            sorted_queries = {i: sort_tokens(q) for i, q in enumerate(queries) if q}
+
+        choice_lens = np.asarray(choice_lengths, dtype=np.float64)
+        # Пустые запросы не оцениваем - для них сразу "нет совпадения"
+        active = np.array([i for i, q in enumerate(queries) if q], dtype=np.int64)
+        # Все базовые матрицы блока одновременно в памяти - блок во столько же раз меньше
+        block_cells = max(1, self.block_cells // len(base_keys))
+
+        for rows, cols, mask, done in query_blocks(queries, active, len(choices), block_cells,
+                                                   blocking_index):
+            block_queries = [queries[i] for i in rows]
+            block_choices = choices if cols is None else [choices[i] for i in cols]
+            block_sorted_choices = sorted_choices
+            if sorted_choices is not None and cols is not None:
+                block_sorted_choices = [sorted_choices[i] for i in cols]
+            block_lens = choice_lens if cols is None else choice_lens[cols]
+
+            matrices = {}
+            for base_scorer, by_tokens in base_keys:
+                matrices[(base_scorer, by_tokens)] = process.cdist(
+                    [sorted_queries[i] for i in rows] if by_tokens else block_queries,
+                    block_sorted_choices if by_tokens else block_choices,
+                    scorer=base_scorer,
+                    score_cutoff=self.score_cutoff,
+                    workers=_cdist_workers(self.workers, len(rows), len(block_choices)),
+                    dtype=np.float32)
+
+            # Штраф за длину - один на блок для всех scorer'ов
+            query_lens = np.fromiter((len(q) for q in block_queries),
+                                     dtype=np.float64, count=len(block_queries))
+            penalty = length_penalty(query_lens[:, None], block_lens[None, :])
+            # С блокировкой - только свои кандидаты запроса
+            keep = self.score_cutoff if mask is None else np.where(mask, self.score_cutoff, np.inf)
+
+            for scorer, (best_idx, best_scores) in zip(self.scorers, results):
+                adjusted = self._block_scores(scorer, matrices) * penalty
+                adjusted = np.where(adjusted >= keep, adjusted, 0)
+                block_best, best_scores[rows] = select_best(adjusted)
+                best_idx[rows] = _choice_ids(block_best, cols)
+
+            if progress_callback:
+                progress_callback(done, len(active))
+
+        return results
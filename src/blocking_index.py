@@ -0,0 +1,105 @@
+"""
+Блокировка кандидатов для Expert Excel Matcher
+
+Этот модуль содержит класс NgramIndex - инвертированный индекс символьных
+n-грамм нормализованных строк источника 2. Для каждого запроса индекс
+возвращает только тех кандидатов, у которых достаточно общих n-грамм,
+поэтому нечёткий метод сравнивает запрос не со всем списком (O(N×M)),
+а с небольшим подмножеством.
+"""
+
+import math
+import numpy as np
+from collections import defaultdict
+from typing import Dict, List, Set
+
+from src.constants import AppConstants
+
+
+class NgramIndex:
+    """Инвертированный индекс символьных n-грамм: n-грамма -> номера вариантов"""
+
+    def __init__(self, choices: List[str], n: int = AppConstants.BLOCKING_NGRAM,
+                 min_share: float = AppConstants.BLOCKING_LEVELS['balanced']):
+        """
+        Построение индекса (один раз на набор данных источника 2)
+
+        Args:
+            choices: Нормализованные строки источника 2
+            n: Длина n-граммы (по умолчанию триграммы)
+            min_share: Минимальная доля n-грамм запроса, общих с кандидатом (0-1)
+        """
+        self.choices = choices
+        self.n = n
+        self.min_share = min_share
+        self.size = len(choices)
+
+        postings: Dict[str, List[int]] = defaultdict(list)
+        for idx, choice in enumerate(choices):
+            for gram in self.grams(choice):
+                postings[gram].append(idx)
+
+        self.postings: Dict[str, np.ndarray] = {
+            gram: np.array(ids, dtype=np.int32) for gram, ids in postings.items()
+        }
+
+    @classmethod
+    def from_postings(cls, choices: List[str], postings: Dict[str, np.ndarray],
+                      n: int = AppConstants.BLOCKING_NGRAM,
+                      min_share: float = AppConstants.BLOCKING_LEVELS['balanced']) -> 'NgramIndex':
+        """
+        Индекс из готовых списков вхождений (например, загруженных из MatchIndexStore)
+
+        Args:
+            choices: Нормализованные строки источника 2, по которым строились списки
+            postings: n-грамма -> отсортированный массив номеров вариантов
+            n: Длина n-граммы
+            min_share: Минимальная доля n-грамм запроса, общих с кандидатом (0-1)
+
+        Returns:
+            NgramIndex без повторного построения
+        """
+        index = cls.__new__(cls)
+        index.choices = choices
+        index.n = n
+        index.min_share = min_share
+        index.size = len(choices)
+        index.postings = postings
+        return index
+
+    def grams(self, s: str) -> Set[str]:
+        """
+        Множество n-грамм строки (с пробелами по краям, чтобы учитывать начало и конец слова)
+
+        Args:
+            s: Нормализованная строка
+
+        Returns:
+            Множество n-грамм (короткие строки дают одну n-грамму - саму строку)
+        """
+        if not s:
+            return set()
+
+        padded = f" {s} "
+        if len(padded) <= self.n:
+            return {padded}
+        return {padded[i:i + self.n] for i in range(len(padded) - self.n + 1)}
+
+    def candidates(self, query: str) -> np.ndarray:
+        """
+        Номера вариантов, имеющих достаточно общих n-грамм с запросом
+
+        Args:
+            query: Нормализованная строка запроса
+
+        Returns:
+            Отсортированный массив номеров вариантов в списке choices
+        """
+        query_grams = self.grams(query)
+        postings = [self.postings[gram] for gram in query_grams if gram in self.postings]
+        if not postings:
+            return np.empty(0, dtype=np.int64)
+
+        counts = np.bincount(np.concatenate(postings), minlength=self.size)
+        required = max(1, math.ceil(self.min_share * len(query_grams)))
+        return np.flatnonzero(counts >= required)
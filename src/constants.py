@@ -35,6 +35,98 @@ class AppConstants:
     # Размеры sample для тестирования
     SAMPLE_SIZE = 200
 
+    # Выбор метода в автоматическом режиме (последовательный отсев на растущей выборке)
+    SELECTION_INITIAL_SAMPLE = 50   # Выборка первого раунда (все методы)
+    SELECTION_MAX_SAMPLE = 800      # Максимальная выборка (оставшиеся лучшие методы)
+    SELECTION_GROWTH = 2            # Выборка растёт, а число методов сокращается в 2 раза за раунд
+    SELECTION_STRATA = 4            # Страты по длине нормализованной строки источника 1
+    SELECTION_TIME_BUDGET = 0       # Лимит времени выбора метода, секунд (0 = без лимита)
+    SELECTION_SEED = 42             # Зерно случайной выборки (воспроизводимый выбор)
+
+    # Кэш нормализации (LRU): максимум различных строк
+    NORMALIZATION_CACHE_SIZE = 200_000
+
+    # Пакетная оценка (rapidfuzz.process.cdist)
+    BATCH_BLOCK_CELLS = 10_000_000  # Максимум ячеек матрицы в одном блоке (~40 МБ оценок float32)
+    BATCH_WORKERS = -1              # -1 = все ядра процессора
+    BATCH_PARALLEL_MIN_CELLS = 100_000  # Меньшие матрицы - в одном потоке (запуск потоков дороже)
+
+    # Параллельная обработка (ProcessPoolExecutor) для textdistance/jellyfish
+    PARALLEL_MIN_ROWS = 1000   # Меньше строк - запуск процессов не окупается
+    PARALLEL_SHARD_SIZE = 500  # Максимум строк источника 1 в одной задаче
+    # Запуск процессов: пулы создаются из рабочего потока при работающем главном
+    # потоке Tk - fork такого процесса может оставить в дочернем захваченные блокировки.
+    # 'spawn' - как в Windows (.exe), поведение одинаково на всех платформах
+    PROCESS_START_METHOD = 'spawn'
+
+    # Блокировка кандидатов (n-граммный индекс источника 2)
+    BLOCKING_NGRAM = 3
+    # Уровень -> минимальная доля n-грамм запроса, общих с кандидатом (0 = выключено)
+    BLOCKING_LEVELS = {
+        'off': 0.0,        # Без блокировки - сравнение со всеми строками
+        'soft': 0.2,       # Высокая полнота, умеренное ускорение
+        'balanced': 0.35,  # Баланс полноты и скорости
+        'strict': 0.5,     # Максимальная скорость, возможны пропуски
+    }
+    # Матричная оценка с блокировкой: запросы группируются против объединения их
+    # кандидатов, пока ячеек матрицы не больше, чем во столько раз от нужных
+    # (1.0 = в блоке только запросы с одинаковыми кандидатами - лишних ячеек нет)
+    BLOCKING_BATCH_WASTE = 1.0
+
+    # Кэш загруженных файлов (DataManager): максимум файлов в памяти
+    DATA_CACHE_MAX_FILES = 2  # Оба источника
+
+    # Движок чтения Excel: 'auto' = calamine (если установлен python-calamine), иначе openpyxl
+    EXCEL_ENGINE = 'auto'
+
+    # Чтение CSV: определение кодировки и разделителя по началу файла
+    CSV_SNIFF_BYTES = 64 * 1024
+    CSV_DELIMITERS = ',;\t|'
+    # Запасные кодировки, если файл не читается в определённой по началу файла
+    # (UTF-8 проверяется по префиксу; latin1 декодирует любые байты)
+    CSV_FALLBACK_ENCODINGS = ['cp1251', 'latin1']
+    # Движок чтения CSV: 'auto' = pyarrow (если установлен), иначе 'c'
+    CSV_ENGINE = 'auto'
+
+    # Хранение строковых столбцов загруженных файлов: 'numpy' = object (объекты Python),
+    # 'pyarrow' = string[pyarrow] (меньше памяти, векторные строковые операции; нужен pyarrow)
+    DTYPE_BACKEND = 'numpy'
+
+    # Дисковый кэш разобранных файлов (Feather, требуется pyarrow)
+    DISK_CACHE_ENABLED = True
+    DISK_CACHE_DIR = None                     # None = ~/.expert_matcher/cache
+    DISK_CACHE_MAX_MB = 2048                  # Лимит размера кэша
+    DISK_CACHE_MAX_AGE_DAYS = 30              # Неиспользуемые дольше записи удаляются
+    DISK_CACHE_MIN_FILE_BYTES = 1024 * 1024   # Меньшие файлы быстрее разобрать заново
+
+    # Постоянный индекс источника 2: нормализованные строки и n-граммы (Feather, нужен pyarrow)
+    MATCH_INDEX_ENABLED = True
+    MATCH_INDEX_DIR = None          # None = ~/.expert_matcher/index
+    MATCH_INDEX_MAX_MB = 1024       # Лимит размера папки индексов
+    MATCH_INDEX_MIN_ROWS = 10_000   # Меньшие источники быстрее подготовить заново
+
+    # Источник из нескольких файлов/листов: столбец происхождения записей
+    COL_SOURCE_PART = "Файл-источник"
+    SOURCE_PARSE_WORKERS = None  # Процессов для разбора частей (None = все ядра)
+
+    # Быстрая проверка файла при выборе (заголовок + оценка числа записей)
+    PROBE_CSV_COUNT_BYTES = 64 * 1024 * 1024  # Дальше число строк CSV экстраполируется по размеру
+
+    # Оценка времени по измеренной скорости методов (калибровка на пробе данных)
+    ESTIMATE_PROBE_QUERIES = 20      # Записей источника 1 в пробе
+    ESTIMATE_PROBE_CHOICES = 1000    # Записей источника 2 в пробе
+    ESTIMATE_SPREAD = 2.0            # Интервал оценки: от ожидаемого / 2 до ожидаемого * 2 (минимум)
+    ESTIMATE_HISTORY = 5             # Последних измерений скорости на метод
+    ESTIMATE_MAX_AGE_DAYS = 30       # Более старые измерения не учитываются (повторная калибровка)
+    THROUGHPUT_FILE = None           # None = ~/.expert_matcher/throughput.json
+
+    # Фоновая обработка (рабочий поток) с отменой
+    TASK_POLL_MS = 100           # Период опроса событий прогресса главным потоком Tk
+    TASK_CHUNK_ROWS = 50_000     # Строк источника 1 в части: при отмене сохраняются готовые части
+
+    # Потоковая обработка источника 1 (чтение и запись результата частями)
+    STREAM_CHUNK_ROWS = 50_000
+
 
 class NormalizationConstants:
     """Константы для расширенной нормализации текста"""
@@ -5,19 +5,78 @@
 столбцами и валидацией данных.
 """
 
+import codecs
+import csv
+import multiprocessing
+import os
+import posixpath
+import re
+import zipfile
+import xml.etree.ElementTree as ET
+import numpy as np
 import pandas as pd
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from openpyxl import load_workbook
+from pandas.io.parsers import TextParser
 from pathlib import Path
-from typing import Tuple, List, Optional
+from typing import Dict, Tuple, List, Optional, Iterable, Iterator
+
+from src.constants import AppConstants
+from src.disk_cache import FrameDiskCache, PYARROW_AVAILABLE as DISK_CACHE_AVAILABLE
+from src.models import SourcePart
+
+# Проверка доступности быстрого движка чтения Excel (Rust calamine)
+try:
+    import python_calamine  # noqa: F401
+    CALAMINE_AVAILABLE = True
+except ImportError:
+    CALAMINE_AVAILABLE = False
+
+# Проверка доступности многопоточного движка чтения CSV
+try:
+    import pyarrow  # noqa: F401
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+
+def _read_part(options: Dict, filename: str, sheet_name: Optional[str],
+               usecols: Optional[frozenset]) -> pd.DataFrame:
+    """Разбор одной части источника в процессе-исполнителе (с теми же настройками чтения)"""
+    manager = DataManager(cache_max_files=0, **options)
+    return manager.read_data_file(filename, usecols=usecols, sheet_name=sheet_name)
 
 
 class DataManager:
     """Класс для управления данными (файлы, столбцы, валидация)"""
 
-    def __init__(self):
-        """Инициализация менеджера данных"""
+    def __init__(self, cache_max_files: int = AppConstants.DATA_CACHE_MAX_FILES,
+                 excel_engine: str = AppConstants.EXCEL_ENGINE,
+                 csv_engine: str = AppConstants.CSV_ENGINE,
+                 disk_cache_enabled: bool = AppConstants.DISK_CACHE_ENABLED,
+                 disk_cache_dir: Optional[str] = AppConstants.DISK_CACHE_DIR,
+                 disk_cache_max_mb: int = AppConstants.DISK_CACHE_MAX_MB,
+                 dtype_backend: str = AppConstants.DTYPE_BACKEND):
+        """
+        Инициализация менеджера данных
+
+        Args:
+            cache_max_files: Максимум загруженных файлов в кэше (LRU)
+            excel_engine: Движок чтения Excel ('auto', 'calamine', 'openpyxl')
+            csv_engine: Движок чтения CSV ('auto', 'pyarrow', 'c')
+            disk_cache_enabled: Сохранять разобранные файлы в дисковый кэш (нужен pyarrow)
+            disk_cache_dir: Папка дискового кэша (None = ~/.expert_matcher/cache)
+            disk_cache_max_mb: Лимит размера дискового кэша в МБ
+            dtype_backend: Хранение строковых столбцов ('numpy' = object,
+                'pyarrow' = string[pyarrow]; без pyarrow - 'numpy')
+        """
         # Файлы
         self.source1_file: Optional[str] = None
         self.source2_file: Optional[str] = None
+        # Части источников (несколько файлов/листов объединяются в один источник)
+        self.source1_parts: List[SourcePart] = []
+        self.source2_parts: List[SourcePart] = []
 
         # Столбцы
         self.source1_columns: List[str] = []
@@ -25,13 +84,389 @@ class DataManager:
         self.selected_source1_cols: List[str] = []
         self.selected_source2_cols: List[str] = []
 
-    def read_data_file(self, filename: str, nrows=None) -> pd.DataFrame:
+        # Движки чтения Excel и CSV
+        self.excel_engine = excel_engine
+        self.csv_engine = csv_engine
+
+        # Настройки чтения - для процессов, разбирающих части источника параллельно
+        self._reader_options = {
+            'excel_engine': excel_engine, 'csv_engine': csv_engine,
+            'disk_cache_enabled': disk_cache_enabled, 'disk_cache_dir': disk_cache_dir,
+            'disk_cache_max_mb': disk_cache_max_mb, 'dtype_backend': dtype_backend,
+        }
+
+        # Строковые столбцы в Arrow (string[pyarrow]) вместо объектов Python
+        self.string_dtype: Optional[pd.StringDtype] = None
+        if dtype_backend == 'pyarrow' and PYARROW_AVAILABLE:
+            self.string_dtype = pd.StringDtype('pyarrow')
+
+        # Настройки чтения CSV по файлам: путь -> (кодировка, разделитель)
+        self._csv_settings: Dict[str, Tuple[str, str]] = {}
+
+        # Дисковый кэш разобранных файлов (Feather) - между сессиями
+        self.disk_cache: Optional[FrameDiskCache] = None
+        if disk_cache_enabled and DISK_CACHE_AVAILABLE:
+            self.disk_cache = FrameDiskCache(disk_cache_dir, disk_cache_max_mb * 1024 * 1024)
+
+        # Результаты быстрой проверки файлов: путь -> ((mtime, размер), (столбцы, записей))
+        self._probe_cache: Dict[str, tuple] = {}
+
+        # Кэш загруженных файлов: путь -> ((mtime, размер), DataFrame, загруженные столбцы)
+        # Загруженные столбцы = None, если файл прочитан целиком (все столбцы)
+        self.cache_max_files = cache_max_files
+        self._frame_cache: "OrderedDict[str, tuple]" = OrderedDict()
+
+    def _file_signature(self, filename: str) -> Tuple[str, Tuple[int, int]]:
+        """
+        Ключ кэша файла
+
+        Returns:
+            Tuple[str, Tuple[int, int]]: (абсолютный путь, (mtime в нс, размер в байтах))
+        """
+        path = str(Path(filename).resolve())
+        stat = os.stat(path)
+        return path, (stat.st_mtime_ns, stat.st_size)
+
+    def _get_cached_frame(self, path: str,
+                          signature: Tuple[int, int]) -> Tuple[Optional[pd.DataFrame], Optional[frozenset]]:
         """
-        Универсальное чтение Excel или CSV файла
+        Получить загруженный DataFrame из кэша (если файл не изменился на диске)
+
+        Args:
+            path: Абсолютный путь к файлу
+            signature: Текущие (mtime, размер) файла
+
+        Returns:
+            (DataFrame, загруженные столбцы или None = все) или (None, None),
+            если файла нет в кэше или он изменился
+        """
+        entry = self._frame_cache.get(path)
+        if entry is None:
+            return None, None
+
+        cached_signature, df, loaded_columns = entry
+        if cached_signature != signature:
+            # Файл изменился на диске - устаревшая запись удаляется
+            del self._frame_cache[path]
+            return None, None
+
+        self._frame_cache.move_to_end(path)
+        return df, loaded_columns
+
+    def _store_frame(self, path: str, signature: Tuple[int, int], df: pd.DataFrame,
+                     loaded_columns: Optional[frozenset] = None):
+        """Сохранить загруженный DataFrame в кэш (вытесняются давно не используемые файлы)"""
+        if self.cache_max_files <= 0:
+            return
+
+        self._frame_cache[path] = (signature, df, loaded_columns)
+        self._frame_cache.move_to_end(path)
+        while len(self._frame_cache) > self.cache_max_files:
+            self._frame_cache.popitem(last=False)
+
+    def clear_cache(self):
+        """Очистить кэш загруженных файлов"""
+        self._frame_cache.clear()
+
+    def read_data_file(self, filename: str, nrows=None,
+                       usecols: Optional[Iterable] = None,
+                       sheet_name: Optional[str] = None) -> pd.DataFrame:
+        """
+        Универсальное чтение Excel или CSV файла (с кэшем загруженных файлов)
+
+        Файл разбирается один раз за сессию: DataFrame хранится в кэше по ключу
+        (путь, mtime, размер) и повторно читается только если файл изменился
+        на диске. Запросы с nrows и usecols обслуживаются из кэша, если нужные
+        столбцы уже загружены.
 
         Args:
             filename: Путь к файлу
             nrows: Количество строк для чтения (None = все)
+            usecols: Столбцы для чтения (None = все); порядок столбцов - как в файле
+            sheet_name: Лист книги Excel (None = первый лист)
+
+        Returns:
+            DataFrame с данными
+        """
+        wanted = frozenset(usecols) if usecols is not None else None
+
+        try:
+            # Подпись снимается до разбора: изменение во время чтения не попадёт в кэш
+            path, signature = self._file_signature(filename)
+        except OSError:
+            # Файл недоступен - ошибку сообщит сам разбор
+            return self._parse_data_file(filename, nrows, wanted, sheet_name)
+
+        # Листы одной книги кэшируются отдельно
+        cache_key = path if sheet_name is None else f'{path}#{sheet_name}'
+        cached, loaded_columns = self._get_cached_frame(cache_key, signature)
+        if cached is not None and (loaded_columns is None or
+                                   (wanted is not None and wanted <= loaded_columns)):
+            df = cached if nrows is None else cached.head(nrows)
+            if wanted is not None:
+                df = df.loc[:, [col in wanted for col in df.columns]]
+            # Поверхностная копия: добавление/удаление столбцов не портит кэш
+            return df.copy(deep=False)
+
+        if nrows is not None:
+            # Частичное чтение (например, только заголовки) в кэш не попадает
+            return self._parse_data_file(filename, nrows, wanted, sheet_name)
+
+        if wanted is not None and loaded_columns is not None:
+            # Дочитываем недостающие столбцы вместе с уже загруженными
+            wanted = wanted | loaded_columns
+
+        df, loaded_columns = self._load_full_file(filename, wanted, sheet_name)
+        self._store_frame(cache_key, signature, df, loaded_columns)
+
+        if usecols is not None:
+            requested = frozenset(usecols)
+            df = df.loc[:, [col in requested for col in df.columns]]
+        return df.copy(deep=False)
+
+    @staticmethod
+    def _is_single_file(parts: List[SourcePart]) -> bool:
+        """Источник - один файл (первый лист): читается как раньше, без столбца происхождения"""
+        return len(parts) == 1 and parts[0].sheet is None
+
+    def read_source(self, parts: List[SourcePart], nrows=None,
+                    usecols: Optional[Iterable] = None) -> pd.DataFrame:
+        """
+        Чтение источника из одного или нескольких файлов/листов
+
+        Части разбираются параллельно в процессах (общее время - порядка
+        времени самой большой части) и объединяются; столбец
+        COL_SOURCE_PART указывает, из какой части взята запись. Объединённый
+        источник хранится в кэше загруженных файлов как один файл.
+
+        Args:
+            parts: Части источника (порядок записей - порядок частей)
+            nrows: Количество строк для чтения (None = все)
+            usecols: Столбцы для чтения (None = все); столбец происхождения есть всегда
+
+        Returns:
+            DataFrame с данными
+        """
+        if self._is_single_file(parts):
+            return self.read_data_file(parts[0].filename, nrows, usecols=usecols)
+
+        # Столбец происхождения добавляется при объединении, в частях его нет
+        wanted = frozenset(usecols) - {AppConstants.COL_SOURCE_PART} if usecols is not None else None
+
+        if nrows is not None:
+            # Первые строки источника: части читаются по порядку, пока не наберётся nrows
+            frames = []
+            for part in parts:
+                remaining = nrows - sum(len(frame) for frame in frames)
+                if remaining <= 0:
+                    break
+                frames.append(self.read_data_file(part.filename, remaining, wanted, part.sheet))
+            return self._combine_parts(parts[:len(frames)], frames)
+
+        try:
+            signatures = [self._file_signature(part.filename) for part in parts]
+        except OSError:
+            return self._combine_parts(parts, self._parse_parts(parts, wanted))
+
+        cache_key = '|'.join(f'{path}#{part.sheet}' for (path, _), part in zip(signatures, parts))
+        signature = tuple(sig for _, sig in signatures)
+
+        cached, loaded_columns = self._get_cached_frame(cache_key, signature)
+        if cached is None or not (loaded_columns is None or
+                                  (wanted is not None and wanted <= loaded_columns)):
+            if wanted is not None and loaded_columns is not None:
+                # Дочитываем недостающие столбцы вместе с уже загруженными
+                wanted = wanted | loaded_columns
+            cached = self._combine_parts(parts, self._parse_parts(parts, wanted))
+            self._store_frame(cache_key, signature, cached, wanted)
+
+        df = cached
+        if usecols is not None:
+            requested = frozenset(usecols) | {AppConstants.COL_SOURCE_PART}
+            df = df.loc[:, [col in requested for col in df.columns]]
+        return df.copy(deep=False)
+
+    def _parse_parts(self, parts: List[SourcePart],
+                     usecols: Optional[frozenset]) -> List[pd.DataFrame]:
+        """
+        Разбор частей источника (параллельно в процессах, если частей и ядер больше одной)
+
+        Returns:
+            DataFrame частей в порядке parts
+        """
+        workers = min(len(parts), AppConstants.SOURCE_PARSE_WORKERS or os.cpu_count() or 1)
+        if workers <= 1:
+            return [self.read_data_file(part.filename, usecols=usecols, sheet_name=part.sheet)
+                    for part in parts]
+
+        def part_size(part):
+            try:
+                return os.path.getsize(part.filename)
+            except OSError:
+                return 0
+
+        context = multiprocessing.get_context(AppConstants.PROCESS_START_METHOD)
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context) as executor:
+            # Большие файлы запускаются первыми - меньше простоя в конце
+            order = sorted(range(len(parts)), key=lambda i: part_size(parts[i]), reverse=True)
+            futures = {i: executor.submit(_read_part, self._reader_options, parts[i].filename,
+                                          parts[i].sheet, usecols)
+                       for i in order}
+            return [futures[i].result() for i in range(len(parts))]
+
+    @staticmethod
+    def _combine_parts(parts: List[SourcePart], frames: List[pd.DataFrame]) -> pd.DataFrame:
+        """Объединение частей источника со столбцом происхождения записей (в конце)"""
+        # Пустые части не участвуют в выводе типов столбцов
+        non_empty = [frame for frame in frames if len(frame)] or frames[:1]
+        df = pd.concat(non_empty, ignore_index=True) if non_empty else pd.DataFrame()
+
+        labels = np.array([part.label for part in parts], dtype=object)
+        df[AppConstants.COL_SOURCE_PART] = np.repeat(labels, [len(frame) for frame in frames])
+        return df
+
+    def iter_source_chunks(self, parts: List[SourcePart],
+                           chunksize: int = AppConstants.STREAM_CHUNK_ROWS,
+                           usecols: Optional[Iterable] = None) -> Iterator[pd.DataFrame]:
+        """
+        Потоковое чтение источника частями (части источника - по очереди)
+
+        Столбцы всех порций приводятся к общему набору столбцов источника,
+        чтобы порции из разных файлов записывались в один результат.
+
+        Args:
+            parts: Части источника
+            chunksize: Количество строк в одной порции
+            usecols: Столбцы для чтения (None = все)
+
+        Yields:
+            DataFrame очередной порции (индекс продолжается между порциями)
+        """
+        if self._is_single_file(parts):
+            yield from self.iter_data_file_chunks(parts[0].filename, chunksize, usecols)
+            return
+
+        wanted = frozenset(usecols) if usecols is not None else None
+        columns = [col for col in self.probe_source(parts)[0]
+                   if col != AppConstants.COL_SOURCE_PART and (wanted is None or col in wanted)]
+
+        offset = 0
+        for part in parts:
+            for chunk in self.iter_data_file_chunks(part.filename, chunksize, usecols, part.sheet):
+                chunk = chunk.reindex(columns=columns)
+                chunk.index = pd.RangeIndex(offset, offset + len(chunk))
+                chunk[AppConstants.COL_SOURCE_PART] = part.label
+                offset += len(chunk)
+                yield chunk
+
+    def probe_source(self, parts: List[SourcePart]) -> Tuple[List, Optional[int]]:
+        """
+        Быстрая проверка источника: объединённый заголовок и оценка числа записей
+
+        Args:
+            parts: Части источника
+
+        Returns:
+            Tuple[List, Optional[int]]: (столбцы в порядке появления + столбец
+                происхождения, сумма оценок числа записей или None)
+        """
+        if self._is_single_file(parts):
+            return self.probe_file(parts[0].filename)
+
+        columns = []
+        seen = set()
+        total = 0
+        for part in parts:
+            part_columns, row_count = self.probe_file(part.filename, part.sheet)
+            for col in part_columns:
+                if col not in seen:
+                    seen.add(col)
+                    columns.append(col)
+            total = None if total is None or row_count is None else total + row_count
+
+        return columns + [AppConstants.COL_SOURCE_PART], total
+
+    def _load_full_file(self, filename: str, usecols: Optional[frozenset],
+                        sheet_name: Optional[str] = None) -> Tuple[pd.DataFrame, Optional[frozenset]]:
+        """
+        Загрузка файла целиком: из дискового кэша или разбором
+
+        Если дисковый кэш включён, файл при первом чтении разбирается полностью
+        (без проекции) и сохраняется в кэш; последующие чтения - в т.ч. в
+        следующих сессиях - загружают из кэша только нужные столбцы.
+
+        Args:
+            filename: Путь к файлу
+            usecols: Множество столбцов (None = все)
+            sheet_name: Лист книги Excel (None = первый лист)
+
+        Returns:
+            (DataFrame, загруженные столбцы или None = все)
+        """
+        disk_key = self._disk_cache_key(filename, sheet_name)
+        if disk_key is None:
+            return self._parse_data_file(filename, None, usecols, sheet_name), usecols
+
+        df = self.disk_cache.load(disk_key, usecols, string_dtype=self.string_dtype)
+        if df is not None:
+            return df, usecols
+
+        df = self._parse_data_file(filename, sheet_name=sheet_name)
+        self.disk_cache.store(disk_key, df)
+        return df, None
+
+    def _disk_cache_key(self, filename: str, sheet_name: Optional[str] = None) -> Optional[str]:
+        """
+        Ключ дискового кэша для файла (None - файл не кэшируется на диске)
+
+        Ключ учитывает содержимое файла и движок разбора (от него зависят типы столбцов).
+        """
+        if self.disk_cache is None:
+            return None
+
+        try:
+            if os.path.getsize(filename) < AppConstants.DISK_CACHE_MIN_FILE_BYTES:
+                return None
+
+            file_ext = Path(filename).suffix.lower()
+            if file_ext == '.csv':
+                # 'pyarrow-c' - чтение pyarrow со значениями как у движка C (кэш прежнего формата не используется)
+                engine = 'pyarrow-c' if PYARROW_AVAILABLE and self.csv_engine in ('auto', 'pyarrow') else 'c'
+            else:
+                engine = self._resolve_excel_engine(file_ext) or 'default'
+            variant = f'{file_ext}|{engine}' if sheet_name is None else f'{file_ext}|{engine}|{sheet_name}'
+            return self.disk_cache.key(filename, variant)
+        except OSError:
+            return None
+
+    def _resolve_excel_engine(self, file_ext: str) -> Optional[str]:
+        """
+        Выбор движка чтения Excel
+
+        Args:
+            file_ext: Расширение файла (.xlsx, .xls...)
+
+        Returns:
+            Имя движка для pd.read_excel или None (движок pandas по умолчанию)
+        """
+        if self.excel_engine == 'auto':
+            return 'calamine' if CALAMINE_AVAILABLE else None
+        if self.excel_engine == 'openpyxl' and file_ext != '.xlsx':
+            # openpyxl читает только .xlsx - для .xls остаётся движок по умолчанию
+            return None
+        return self.excel_engine
+
+    def _parse_data_file(self, filename: str, nrows=None,
+                         usecols: Optional[frozenset] = None,
+                         sheet_name: Optional[str] = None) -> pd.DataFrame:
+        """
+        Разбор Excel или CSV файла (без кэша)
+
+        Args:
+            filename: Путь к файлу
+            nrows: Количество строк для чтения (None = все)
+            usecols: Множество столбцов для чтения (None = все)
+            sheet_name: Лист книги Excel (None = первый лист; для CSV не используется)
 
         Returns:
             DataFrame с данными
@@ -39,25 +474,359 @@ class DataManager:
         file_ext = Path(filename).suffix.lower()
 
         if file_ext == '.csv':
-            # Пробуем различные кодировки для CSV
-            encodings = ['utf-8-sig', 'utf-8', 'cp1251', 'windows-1251', 'latin1']
-            for encoding in encodings:
-                try:
-                    df = pd.read_csv(filename, encoding=encoding, nrows=nrows)
-                    return df
-                except (UnicodeDecodeError, Exception):
-                    continue
-            # Если ничего не сработало, пробуем без указания кодировки
-            df = pd.read_csv(filename, nrows=nrows)
+            df = self._read_csv(filename, nrows, usecols)
         else:
-            # Excel файлы (.xlsx, .xls)
-            df = pd.read_excel(filename, nrows=nrows)
+            # Проекция столбцов: функция проверяется по именам заголовков файла
+            column_filter = (lambda col: col in usecols) if usecols is not None else None
+            # Excel файлы (.xlsx, .xls): быстрый движок, при ошибке - движок по умолчанию
+            engine = self._resolve_excel_engine(file_ext)
+            sheet = sheet_name if sheet_name is not None else 0
+            try:
+                df = pd.read_excel(filename, sheet_name=sheet, nrows=nrows, usecols=column_filter,
+                                   engine=engine)
+            except Exception:
+                if engine is None:
+                    raise
+                df = pd.read_excel(filename, sheet_name=sheet, nrows=nrows, usecols=column_filter)
+
+        df = self._check_projection(filename, nrows, usecols, df, sheet_name)
+        return self._apply_string_dtype(df)
+
+    def _apply_string_dtype(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Перевод строковых столбцов в string[pyarrow] (если выбран dtype_backend='pyarrow')
+
+        Переводятся только столбцы, все значения которых - строки (пропуски
+        становятся pd.NA). Столбцы со смешанными типами (числа и строки в
+        одном столбце Excel) остаются object, чтобы не менять их строковое
+        представление при объединении столбцов.
+
+        Args:
+            df: Разобранный DataFrame
+
+        Returns:
+            DataFrame (тот же объект, столбцы заменяются на месте)
+        """
+        if self.string_dtype is None:
+            return df
 
+        for i, dtype in enumerate(df.dtypes):
+            if dtype == object:
+                column = df.iloc[:, i]
+                if pd.api.types.infer_dtype(column, skipna=True) == 'string':
+                    df.isetitem(i, column.astype(self.string_dtype))
         return df
 
+    @staticmethod
+    def _detect_encoding(prefix: bytes) -> str:
+        """
+        Определение кодировки по началу файла
+
+        Args:
+            prefix: Первые байты файла
+
+        Returns:
+            'utf-8-sig' (BOM), 'utf-8', 'cp1251' или 'latin1'
+        """
+        if prefix.startswith(codecs.BOM_UTF8):
+            return 'utf-8-sig'
+
+        try:
+            # final=False: многобайтовый символ, обрезанный концом префикса, не ошибка
+            codecs.getincrementaldecoder('utf-8')().decode(prefix, final=False)
+            return 'utf-8'
+        except UnicodeDecodeError:
+            pass
+
+        try:
+            prefix.decode('cp1251')
+            return 'cp1251'
+        except UnicodeDecodeError:
+            return 'latin1'
+
+    @staticmethod
+    def _detect_delimiter(text: str) -> str:
+        """
+        Определение разделителя CSV по началу файла (по умолчанию - запятая)
+
+        Args:
+            text: Декодированное начало файла
+
+        Returns:
+            Символ-разделитель
+        """
+        lines = text.splitlines()
+        if len(lines) > 1 and not text.endswith(('\n', '\r')):
+            lines = lines[:-1]  # Последняя строка обрезана концом префикса
+
+        try:
+            dialect = csv.Sniffer().sniff('\n'.join(lines), delimiters=AppConstants.CSV_DELIMITERS)
+            return dialect.delimiter
+        except csv.Error:
+            return ','
+
+    def _sniff_csv(self, filename: str) -> Tuple[str, str]:
+        """
+        Определение кодировки и разделителя CSV по первым CSV_SNIFF_BYTES байтам
+
+        Returns:
+            Tuple[str, str]: (кодировка, разделитель)
+        """
+        with open(filename, 'rb') as f:
+            prefix = f.read(AppConstants.CSV_SNIFF_BYTES)
+
+        encoding = self._detect_encoding(prefix)
+        text = codecs.getincrementaldecoder(encoding)(errors='replace').decode(prefix, final=False)
+        return encoding, self._detect_delimiter(text)
+
+    def _read_csv(self, filename: str, nrows=None,
+                  usecols: Optional[frozenset] = None) -> pd.DataFrame:
+        """
+        Чтение CSV одним разбором с определёнными кодировкой и разделителем
+
+        Кодировка и разделитель определяются по началу файла и запоминаются
+        для файла. Если файл всё же не декодируется (например, не-ASCII символы
+        встречаются только дальше префикса), пробуются запасные кодировки.
+        Прочие ошибки разбора не подавляются.
+
+        Args:
+            filename: Путь к файлу
+            nrows: Количество строк для чтения (None = все)
+            usecols: Множество столбцов для чтения (None = все)
+
+        Returns:
+            DataFrame с данными
+        """
+        path = str(Path(filename).resolve())
+        settings = self._csv_settings.get(path)
+        if settings is None:
+            settings = self._sniff_csv(filename)
+
+        encoding, delimiter = settings
+        encodings = [encoding] + [e for e in AppConstants.CSV_FALLBACK_ENCODINGS if e != encoding]
+
+        error = None
+        for candidate in encodings:
+            try:
+                df = self._read_csv_with(filename, candidate, delimiter, nrows, usecols)
+            except UnicodeDecodeError as e:
+                error = e
+                continue
+
+            self._csv_settings[path] = (candidate, delimiter)
+            return df
+
+        raise error
+
+    def _read_csv_with(self, filename: str, encoding: str, delimiter: str, nrows=None,
+                       usecols: Optional[frozenset] = None) -> pd.DataFrame:
+        """
+        Разбор CSV с заданными кодировкой и разделителем
+
+        Полное чтение идёт через многопоточный движок pyarrow (если доступен);
+        частичное (nrows), при ошибке pyarrow и при распознанных pyarrow
+        датах/времени - через движок C (значения всегда как у движка C).
+        """
+        use_pyarrow = (nrows is None and PYARROW_AVAILABLE and
+                       self.csv_engine in ('auto', 'pyarrow'))
+
+        if use_pyarrow:
+            try:
+                df = pd.read_csv(filename, encoding=encoding, sep=delimiter, engine='pyarrow')
+            except ValueError:
+                # ArrowInvalid наследует ValueError - читаем движком C
+                df = None
+
+            if df is not None and usecols is not None:
+                df = df.loc[:, [col in usecols for col in df.columns]]
+            if df is not None and self._matches_c_engine(df):
+                return df
+
+        column_filter = (lambda col: col in usecols) if usecols is not None else None
+        return pd.read_csv(filename, encoding=encoding, sep=delimiter, nrows=nrows,
+                           usecols=column_filter, engine='c')
+
+    @staticmethod
+    def _matches_c_engine(df: pd.DataFrame) -> bool:
+        """
+        Совпадают ли значения, прочитанные pyarrow, с результатом движка C
+
+        Движок C даты и время не распознаёт - они остаются строками файла.
+        pyarrow превращает их в datetime64/date/time, и после объединения
+        столбцов получается другая строка ('2024-01-15 10:00:00' вместо
+        '2024-01-15T10:00:00'): результат сопоставления зависел бы от наличия
+        pyarrow и расходился бы с частичным и потоковым чтением. Невалидный
+        UTF-8 pyarrow возвращает как bytes - это ошибка кодировки, её определит
+        движок C (UnicodeDecodeError -> запасная кодировка). В этих случаях
+        файл перечитывается движком C.
+
+        Пропуски в строковых столбцах (None у pyarrow) заменяются на NaN, как у движка C.
+
+        Args:
+            df: DataFrame, прочитанный pyarrow (object-столбцы изменяются на месте)
+
+        Returns:
+            True - значения совпадают с движком C, False - нужно перечитать движком C
+        """
+        object_columns = []
+        for i, dtype in enumerate(df.dtypes):
+            if pd.api.types.is_datetime64_any_dtype(dtype):
+                return False
+            if dtype == object:
+                if pd.api.types.infer_dtype(df.iloc[:, i], skipna=True) in ('bytes', 'date', 'time'):
+                    return False
+                object_columns.append(i)
+
+        for i in object_columns:
+            column = df.iloc[:, i]
+            df.isetitem(i, column.where(column.notna(), np.nan))
+        return True
+
+    def iter_data_file_chunks(self, filename: str,
+                              chunksize: int = AppConstants.STREAM_CHUNK_ROWS,
+                              usecols: Optional[Iterable] = None,
+                              sheet_name: Optional[str] = None) -> Iterator[pd.DataFrame]:
+        """
+        Потоковое чтение файла частями (файл целиком в память не загружается)
+
+        CSV читается через pd.read_csv(chunksize=...), .xlsx - построчно через
+        openpyxl в режиме read-only. Типы столбцов определяются по каждой части
+        отдельно. Для прочих форматов (.xls) построчное чтение недоступно -
+        файл загружается целиком и отдаётся частями.
+
+        Args:
+            filename: Путь к файлу
+            chunksize: Количество строк в одной части
+            usecols: Столбцы для чтения (None = все); порядок столбцов - как в файле
+            sheet_name: Лист книги Excel (None = первый лист)
+
+        Yields:
+            DataFrame очередной части (индекс продолжается между частями)
+        """
+        wanted = frozenset(usecols) if usecols is not None else None
+        file_ext = Path(filename).suffix.lower()
+
+        if file_ext == '.csv':
+            chunks = self._iter_csv_chunks(filename, chunksize, wanted)
+        elif file_ext == '.xlsx':
+            chunks = self._iter_xlsx_chunks(filename, chunksize, wanted, sheet_name)
+        else:
+            df = self.read_data_file(filename, usecols=usecols, sheet_name=sheet_name)
+            for start in range(0, len(df), chunksize):
+                yield df.iloc[start:start + chunksize]
+            return
+
+        for chunk in chunks:
+            yield self._apply_string_dtype(chunk)
+
+    def _iter_csv_chunks(self, filename: str, chunksize: int,
+                         usecols: Optional[frozenset]) -> Iterator[pd.DataFrame]:
+        """Чтение CSV частями (кодировка проверяется по всему файлу до начала чтения)"""
+        path = str(Path(filename).resolve())
+        encoding, delimiter = self._csv_settings.get(path) or self._sniff_csv(filename)
+
+        # Ошибка декодирования в середине потока не должна оборвать обработку -
+        # подходящая кодировка выбирается заранее (потоковая проверка, без разбора)
+        for candidate in [encoding] + [e for e in AppConstants.CSV_FALLBACK_ENCODINGS if e != encoding]:
+            if self._decodes_as(filename, candidate):
+                encoding = candidate
+                break
+        self._csv_settings[path] = (encoding, delimiter)
+
+        column_filter = (lambda col: col in usecols) if usecols is not None else None
+        with pd.read_csv(filename, encoding=encoding, sep=delimiter, usecols=column_filter,
+                         chunksize=chunksize, engine='c') as reader:
+            yield from reader
+
+    @staticmethod
+    def _decodes_as(filename: str, encoding: str) -> bool:
+        """Проверка, что файл целиком декодируется в указанной кодировке"""
+        decoder = codecs.getincrementaldecoder(encoding)()
+        try:
+            with open(filename, 'rb') as f:
+                for block in iter(lambda: f.read(1024 * 1024), b''):
+                    decoder.decode(block)
+            decoder.decode(b'', final=True)
+        except UnicodeDecodeError:
+            return False
+        return True
+
+    def _iter_xlsx_chunks(self, filename: str, chunksize: int, usecols: Optional[frozenset],
+                          sheet_name: Optional[str] = None) -> Iterator[pd.DataFrame]:
+        """
+        Чтение .xlsx частями через openpyxl (read-only)
+
+        Значения ячеек приводятся так же, как в pd.read_excel (пустые ячейки,
+        целые числа), а часть разбирается pandas TextParser - пропуски и типы
+        столбцов совпадают с обычным чтением. Пустые строки в конце листа
+        отбрасываются.
+        """
+        # Имена столбцов - как при обычном чтении (Unnamed: N, дубликаты Name.1 и т.п.)
+        header = self.probe_file(filename, sheet_name)[0]
+        keep = [i for i, col in enumerate(header) if usecols is None or col in usecols]
+        columns = [header[i] for i in keep]
+
+        def convert(value):
+            if value is None:
+                return ""
+            if isinstance(value, float) and value.is_integer():
+                return int(value)
+            return value
+
+        def to_frame(rows, start):
+            df = TextParser(rows, names=columns, header=None).read()
+            df.index = pd.RangeIndex(start, start + len(df))
+            return df
+
+        workbook = load_workbook(filename, read_only=True, data_only=True)
+        try:
+            worksheet = workbook.worksheets[0] if sheet_name is None else workbook[sheet_name]
+            rows = worksheet.iter_rows(min_row=2, values_only=True)
+            buffer, blank_rows, emitted = [], [], 0
+
+            for row in rows:
+                values = [convert(row[i]) if i < len(row) else "" for i in keep]
+                if all(value is None for value in row):
+                    # Пустые строки сохраняются, только если за ними есть данные
+                    blank_rows.append(values)
+                    continue
+
+                buffer.extend(blank_rows)
+                blank_rows = []
+                buffer.append(values)
+
+                if len(buffer) >= chunksize:
+                    yield to_frame(buffer, emitted)
+                    emitted += len(buffer)
+                    buffer = []
+
+            if buffer:
+                yield to_frame(buffer, emitted)
+        finally:
+            workbook.close()
+
+    def _check_projection(self, filename: str, nrows, usecols: Optional[frozenset],
+                          df: pd.DataFrame, sheet_name: Optional[str] = None) -> pd.DataFrame:
+        """
+        Проверка проекции столбцов
+
+        Имена заголовков в файле могут отличаться от итоговых имён столбцов
+        (числовые заголовки, дубликаты). Если какой-то из запрошенных столбцов
+        не прочитан, файл перечитывается целиком.
+        """
+        if usecols is None or usecols <= frozenset(df.columns):
+            return df
+
+        df = self._parse_data_file(filename, nrows, sheet_name=sheet_name)
+        return df.loc[:, [col in usecols for col in df.columns]]
+
     def validate_file(self, filename: str) -> Tuple[bool, str]:
         """
-        Валидация Excel или CSV файла
+        Быстрая валидация Excel или CSV файла (без чтения данных)
+
+        Читаются только заголовок и оценка числа записей (probe_file), поэтому
+        проверка не зависит от размера файла. Полное чтение выполняется при
+        запуске сопоставления.
 
         Args:
             filename: Путь к файлу
@@ -65,28 +834,276 @@ class DataManager:
         Returns:
             Tuple[bool, str]: (успешная_валидация, сообщение)
         """
-        try:
-            df = self.read_data_file(filename)
+        return self.validate_source([SourcePart(filename)])
+
+    def validate_source(self, parts: List[SourcePart]) -> Tuple[bool, str]:
+        """
+        Быстрая валидация источника из одного или нескольких файлов/листов
+
+        Args:
+            parts: Части источника
 
-            if df.empty:
-                return False, "Файл пустой (нет данных)"
+        Returns:
+            Tuple[bool, str]: (успешная_валидация, сообщение)
+        """
+        try:
+            columns, row_count = self.probe_source(parts)
 
-            if len(df.columns) == 0:
+            if len(columns) == 0:
                 return False, "Файл не содержит столбцов"
 
-            if len(df) == 0:
+            if row_count == 0:
                 return False, "Файл не содержит строк с данными"
 
             # Успешная валидация - показываем информацию о файле
-            columns_preview = ', '.join(df.columns[:5])
-            if len(df.columns) > 5:
+            columns_preview = ', '.join(str(col) for col in columns[:5])
+            if len(columns) > 5:
                 columns_preview += ' ...'
 
-            return True, f"✅ Файл валидный\n   Записей: {len(df)}\n   Столбцов: {len(df.columns)}\n   Список столбцов: {columns_preview}"
+            rows_info = f"~{row_count}" if row_count is not None else "будет определено при загрузке"
+            parts_info = f"\n   Файлов/листов: {len(parts)}" if len(parts) > 1 else ""
+            return True, f"✅ Файл валидный{parts_info}\n   Записей: {rows_info}\n   Столбцов: {len(columns)}\n   Список столбцов: {columns_preview}"
 
         except Exception as e:
             return False, f"Ошибка чтения файла:\n{str(e)}"
 
+    def probe_file(self, filename: str, sheet_name: Optional[str] = None) -> Tuple[List, Optional[int]]:
+        """
+        Быстрая проверка файла: заголовок и оценка числа записей
+
+        .xlsx: заголовок и тег dimension листа читаются напрямую из архива
+        (общие строки - только нужные заголовку). CSV: заголовок по началу
+        файла и подсчёт переводов строк. Прочие форматы (.xls): заголовок
+        через pandas, число записей неизвестно.
+
+        Args:
+            filename: Путь к файлу
+            sheet_name: Лист книги Excel (None = первый лист)
+
+        Returns:
+            Tuple[List, Optional[int]]: (столбцы - как при чтении pandas,
+                оценка числа записей или None, если неизвестно)
+        """
+        path, signature = self._file_signature(filename)
+        cache_key = path if sheet_name is None else f'{path}#{sheet_name}'
+        cached = self._probe_cache.get(cache_key)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+
+        file_ext = Path(filename).suffix.lower()
+        if file_ext == '.csv':
+            columns = list(self._read_csv(filename, 0, None).columns)
+            result = columns, self._count_csv_records(filename)
+        elif file_ext == '.xlsx':
+            try:
+                result = self._probe_xlsx(filename, sheet_name)
+            except (KeyError, ValueError, IndexError, StopIteration, ET.ParseError, zipfile.BadZipFile):
+                result = None
+            if result is None:
+                # Нестандартная структура книги - заголовок через pandas
+                header = self.read_data_file(filename, nrows=0, sheet_name=sheet_name)
+                result = list(header.columns), None
+        else:
+            header = self.read_data_file(filename, nrows=0, sheet_name=sheet_name)
+            result = list(header.columns), None
+
+        self._probe_cache[cache_key] = (signature, result)
+        return result
+
+    def list_sheets(self, filename: str) -> List[str]:
+        """
+        Названия листов книги Excel (для CSV - пустой список)
+
+        Для .xlsx читается только workbook.xml из архива, без загрузки книги.
+
+        Args:
+            filename: Путь к файлу
+
+        Returns:
+            Список названий листов в порядке книги
+        """
+        file_ext = Path(filename).suffix.lower()
+        if file_ext == '.csv':
+            return []
+        if file_ext == '.xlsx':
+            try:
+                with zipfile.ZipFile(filename) as archive:
+                    return [name for name, _ in self._xlsx_sheets(archive)]
+            except (KeyError, StopIteration, ET.ParseError, zipfile.BadZipFile):
+                pass
+        with pd.ExcelFile(filename) as workbook:
+            return [str(name) for name in workbook.sheet_names]
+
+    @staticmethod
+    def _xlsx_sheets(archive: zipfile.ZipFile) -> List[Tuple[str, str]]:
+        """Листы книги .xlsx: (название, путь к XML листа в архиве) в порядке книги"""
+        def local(tag):
+            return tag.rsplit('}', 1)[-1]
+
+        # workbook.xml -> связь r:id -> путь к XML листа
+        rels = ET.fromstring(archive.read('xl/_rels/workbook.xml.rels'))
+        targets = {el.get('Id'): el.get('Target') for el in rels}
+
+        sheets = []
+        workbook = ET.fromstring(archive.read('xl/workbook.xml'))
+        for sheet in workbook.iter():
+            if local(sheet.tag) != 'sheet':
+                continue
+            rel_id = next(value for key, value in sheet.attrib.items() if local(key) == 'id')
+            target = targets[rel_id]
+            sheet_path = target.lstrip('/') if target.startswith('/') else posixpath.normpath(
+                posixpath.join('xl', target))
+            sheets.append((sheet.get('name'), sheet_path))
+        return sheets
+
+    @staticmethod
+    def _count_csv_records(filename: str) -> int:
+        """
+        Оценка числа записей CSV по числу переводов строк (без заголовка)
+
+        Первые PROBE_CSV_COUNT_BYTES байт считаются точно, для больших
+        файлов остаток экстраполируется по средней длине строки. Переводы
+        строк внутри значений в кавычках также учитываются - это оценка.
+        """
+        size = os.path.getsize(filename)
+        limit = AppConstants.PROBE_CSV_COUNT_BYTES
+        lines = 0
+        scanned = 0
+        last = b''
+
+        with open(filename, 'rb') as f:
+            while scanned < limit:
+                block = f.read(min(1024 * 1024, limit - scanned))
+                if not block:
+                    break
+                lines += block.count(b'\n')
+                scanned += len(block)
+                last = block[-1:]
+
+        if scanned < size and lines:
+            lines = round(lines * size / scanned)
+        elif last and last != b'\n':
+            lines += 1  # Последняя строка без перевода строки
+
+        return max(lines - 1, 0)
+
+    _CELL_REF_RE = re.compile(r'([A-Z]+)(\d+)')
+
+    @staticmethod
+    def _column_index(letters: str) -> int:
+        """Номер столбца Excel по буквам (A -> 0, AA -> 26)"""
+        index = 0
+        for char in letters:
+            index = index * 26 + ord(char) - ord('A') + 1
+        return index - 1
+
+    def _probe_xlsx(self, filename: str,
+                    sheet_name: Optional[str] = None) -> Optional[Tuple[List, Optional[int]]]:
+        """
+        Заголовок и число записей листа .xlsx без загрузки книги (None = первый лист)
+
+        Разбор XML листа останавливается на первой непустой строке (заголовок),
+        число записей берётся из тега dimension в начале листа. Имена столбцов
+        приводятся как в pd.read_excel (Unnamed: N, повторы Name.1).
+
+        Returns:
+            (столбцы, оценка числа записей) или None, если заголовок не в первой
+            строке листа (пустые строки перед ним pandas обрабатывает по-своему)
+        """
+        def local(tag):
+            return tag.rsplit('}', 1)[-1]
+
+        with zipfile.ZipFile(filename) as archive:
+            sheets = self._xlsx_sheets(archive)
+            sheet_path = sheets[0][1] if sheet_name is None else dict(sheets)[sheet_name]
+
+            dimension_rows = None
+            header_row = None
+            cells = {}
+
+            with archive.open(sheet_path) as stream:
+                cell = None
+                for event, el in ET.iterparse(stream, events=('start', 'end')):
+                    tag = local(el.tag)
+                    if event == 'start':
+                        if tag == 'c':
+                            cell = {'ref': el.get('r'), 'type': el.get('t', 'n'), 'value': None}
+                        continue
+
+                    if tag == 'dimension':
+                        match = self._CELL_REF_RE.fullmatch(el.get('ref', '').rsplit(':', 1)[-1])
+                        if match and ':' in el.get('ref', ''):
+                            dimension_rows = int(match.group(2))
+                    elif tag in ('v', 't') and cell is not None:
+                        cell['value'] = (cell['value'] or '') + (el.text or '')
+                    elif tag == 'c' and cell is not None:
+                        if cell['value'] is not None and cell['ref']:
+                            letters, row = self._CELL_REF_RE.fullmatch(cell['ref']).groups()
+                            cells[self._column_index(letters)] = (cell['type'], cell['value'])
+                            header_row = int(row)
+                        cell = None
+                    elif tag == 'row':
+                        if cells:
+                            break  # Первая непустая строка - заголовок
+                    elif tag == 'sheetData':
+                        break
+                    el.clear()
+
+            shared_strings = self._read_shared_strings(
+                archive, {int(value) for kind, value in cells.values() if kind == 's'})
+
+        def convert(kind, value):
+            if kind == 's':
+                return shared_strings[int(value)]
+            if kind in ('str', 'inlineStr', 'e'):
+                return value
+            if kind == 'b':
+                return bool(int(value))
+            number = float(value)
+            return int(number) if number.is_integer() else number
+
+        if not cells:
+            return [], 0
+        if header_row != 1:
+            return None
+
+        header = [""] * (max(cells) + 1)
+        for index, (kind, value) in cells.items():
+            header[index] = convert(kind, value)
+
+        columns = list(TextParser([header], header=0).read().columns)
+        row_count = dimension_rows - header_row if dimension_rows else None
+        return columns, row_count
+
+    @staticmethod
+    def _read_shared_strings(archive: zipfile.ZipFile, indices: set) -> Dict[int, str]:
+        """Чтение из sharedStrings.xml только нужных строк (разбор до наибольшего индекса)"""
+        if not indices:
+            return {}
+
+        strings = {}
+        last = max(indices)
+        position = 0
+        with archive.open('xl/sharedStrings.xml') as stream:
+            for event, el in ET.iterparse(stream, events=('end',)):
+                if el.tag.rsplit('}', 1)[-1] != 'si':
+                    continue
+                if position in indices:
+                    # Текст - <t> или фрагменты форматированного текста <r><t> (фонетика <rPh> не входит)
+                    parts = []
+                    for child in el:
+                        name = child.tag.rsplit('}', 1)[-1]
+                        if name == 't':
+                            parts.append(child.text or '')
+                        elif name == 'r':
+                            parts.extend(t.text or '' for t in child if t.tag.rsplit('}', 1)[-1] == 't')
+                    strings[position] = ''.join(parts)
+                if position == last:
+                    break
+                position += 1
+                el.clear()
+        return strings
+
     def set_source1_file(self, filename: str) -> Tuple[bool, str]:
         """
         Установить файл источника 1 (с валидацией)
@@ -97,14 +1114,26 @@ class DataManager:
         Returns:
             Tuple[bool, str]: (успешно, сообщение)
         """
-        is_valid, message = self.validate_file(filename)
+        return self.set_source1_parts([SourcePart(filename)])
+
+    def set_source1_parts(self, parts: List[SourcePart]) -> Tuple[bool, str]:
+        """
+        Установить источник 1 из одного или нескольких файлов/листов (с валидацией)
+
+        Args:
+            parts: Части источника
+
+        Returns:
+            Tuple[bool, str]: (успешно, сообщение)
+        """
+        is_valid, message = self.validate_source(parts)
 
         if is_valid:
-            self.source1_file = filename
-            # Загружаем столбцы
+            self.source1_parts = list(parts)
+            self.source1_file = parts[0].filename
+            # Загружаем столбцы (заголовок уже прочитан при проверке)
             try:
-                df = self.read_data_file(filename, nrows=0)
-                self.source1_columns = list(df.columns)
+                self.source1_columns = self.probe_source(parts)[0]
                 # По умолчанию выбираем первый столбец
                 if self.source1_columns:
                     self.selected_source1_cols = [self.source1_columns[0]]
@@ -123,14 +1152,26 @@ class DataManager:
         Returns:
             Tuple[bool, str]: (успешно, сообщение)
         """
-        is_valid, message = self.validate_file(filename)
+        return self.set_source2_parts([SourcePart(filename)])
+
+    def set_source2_parts(self, parts: List[SourcePart]) -> Tuple[bool, str]:
+        """
+        Установить источник 2 из одного или нескольких файлов/листов (с валидацией)
+
+        Args:
+            parts: Части источника
+
+        Returns:
+            Tuple[bool, str]: (успешно, сообщение)
+        """
+        is_valid, message = self.validate_source(parts)
 
         if is_valid:
-            self.source2_file = filename
-            # Загружаем столбцы
+            self.source2_parts = list(parts)
+            self.source2_file = parts[0].filename
+            # Загружаем столбцы (заголовок уже прочитан при проверке)
             try:
-                df = self.read_data_file(filename, nrows=0)
-                self.source2_columns = list(df.columns)
+                self.source2_columns = self.probe_source(parts)[0]
                 # По умолчанию выбираем первый столбец
                 if self.source2_columns:
                     self.selected_source2_cols = [self.source2_columns[0]]
@@ -216,6 +1257,28 @@ class DataManager:
         """
         return self.selected_source1_cols, self.selected_source2_cols
 
+    def get_source_display_name(self, parts: List[SourcePart], max_length: int = 50) -> str:
+        """
+        Получить короткое название источника для отображения
+
+        Args:
+            parts: Части источника
+            max_length: Максимальная длина имени файла
+
+        Returns:
+            str: Имя файла; для нескольких частей - с числом листов/файлов
+        """
+        if not parts:
+            return self.get_short_filename(None)
+
+        display_name = self.get_short_filename(parts[0].filename, max_length)
+        files = len({part.filename for part in parts})
+        if files > 1:
+            return f"{display_name} + ещё {files - 1} файл(ов)"
+        if len(parts) > 1:
+            return f"{display_name} ({len(parts)} листов)"
+        return display_name
+
     def get_short_filename(self, filename: Optional[str], max_length: int = 50) -> str:
         """
         Получить короткое имя файла для отображения
@@ -236,12 +1299,13 @@ class DataManager:
 
         return display_name
 
-    def load_source1_data(self, nrows=None) -> pd.DataFrame:
+    def load_source1_data(self, nrows=None, usecols: Optional[Iterable] = None) -> pd.DataFrame:
         """
         Загрузить данные из источника 1
 
         Args:
             nrows: Количество строк (None = все)
+            usecols: Столбцы для чтения (None = все)
 
         Returns:
             DataFrame с данными
@@ -252,14 +1316,16 @@ class DataManager:
         if not self.source1_file:
             raise ValueError("Файл источника 1 не выбран")
 
-        return self.read_data_file(self.source1_file, nrows=nrows)
+        parts = self.source1_parts or [SourcePart(self.source1_file)]
+        return self.read_source(parts, nrows=nrows, usecols=usecols)
 
-    def load_source2_data(self, nrows=None) -> pd.DataFrame:
+    def load_source2_data(self, nrows=None, usecols: Optional[Iterable] = None) -> pd.DataFrame:
         """
         Загрузить данные из источника 2
 
         Args:
             nrows: Количество строк (None = все)
+            usecols: Столбцы для чтения (None = все)
 
         Returns:
             DataFrame с данными
@@ -270,4 +1336,5 @@ class DataManager:
         if not self.source2_file:
             raise ValueError("Файл источника 2 не выбран")
 
-        return self.read_data_file(self.source2_file, nrows=nrows)
+        parts = self.source2_parts or [SourcePart(self.source2_file)]
+        return self.read_source(parts, nrows=nrows, usecols=usecols)
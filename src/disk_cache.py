@@ -0,0 +1,216 @@
+"""
+Дисковый кэш разобранных файлов для Expert Excel Matcher
+
+Этот модуль содержит класс FrameDiskCache, который сохраняет разобранные
+DataFrame источников в колоночном формате Feather (Arrow IPC) в папке
+кэша пользователя. Ключ - хэш содержимого файла, поэтому повторный
+запуск на том же справочнике читает готовый кэш (с отображением в память)
+вместо повторного разбора xlsx/csv.
+"""
+
+import hashlib
+import os
+import time
+from pathlib import Path
+from typing import Iterable, Optional
+
+import numpy as np
+import pandas as pd
+
+from src.constants import AppConstants
+
+try:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+
+class FrameDiskCache:
+    """Кэш DataFrame в файлах Feather с ключом по хэшу содержимого"""
+
+    SUFFIX = '.feather'
+    # Версия формата записи: меняется при изменении способа разбора/записи
+    FORMAT_VERSION = 1
+
+    def __init__(self, directory: Optional[str] = AppConstants.DISK_CACHE_DIR,
+                 max_bytes: int = AppConstants.DISK_CACHE_MAX_MB * 1024 * 1024,
+                 max_age_days: float = AppConstants.DISK_CACHE_MAX_AGE_DAYS):
+        """
+        Инициализация дискового кэша
+
+        Args:
+            directory: Папка кэша (None = ~/.expert_matcher/cache)
+            max_bytes: Максимальный суммарный размер кэша (старые записи вытесняются)
+            max_age_days: Записи, не использовавшиеся дольше, удаляются
+        """
+        if not PYARROW_AVAILABLE:
+            raise ImportError("pyarrow не установлен. Установите: pip install pyarrow")
+
+        self.directory = Path(directory) if directory else Path.home() / '.expert_matcher' / 'cache'
+        self.max_bytes = max_bytes
+        self.max_age_days = max_age_days
+
+    def key(self, filename: str, variant: str = '') -> str:
+        """
+        Ключ кэша: хэш содержимого файла и параметров разбора
+
+        Args:
+            filename: Путь к исходному файлу
+            variant: Параметры, влияющие на результат разбора (движок и т.п.)
+
+        Returns:
+            Шестнадцатеричный ключ
+        """
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(f'{self.FORMAT_VERSION}|{variant}|'.encode('utf-8'))
+        with open(filename, 'rb') as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f'{key}{self.SUFFIX}'
+
+    def load_table(self, key: str, columns: Optional[Iterable] = None) -> Optional['pa.Table']:
+        """
+        Загрузка таблицы Arrow из кэша с отображением файла в память (без копирования)
+
+        Args:
+            key: Ключ кэша
+            columns: Столбцы для загрузки (None = все); порядок - как в исходном файле
+
+        Returns:
+            pyarrow.Table или None (нет записи / запись повреждена)
+        """
+        path = self._path(key)
+        if not path.exists():
+            return None
+
+        try:
+            table = feather.read_table(str(path), memory_map=True)
+            if columns is not None:
+                wanted = set(columns)
+                table = table.select([i for i, name in enumerate(table.column_names) if name in wanted])
+        except (OSError, ValueError):
+            # Повреждённая запись (ArrowInvalid наследует ValueError) - удаляем
+            self._remove(path)
+            return None
+
+        # Время использования записи - для вытеснения давно не используемых
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+        return table
+
+    def load(self, key: str, columns: Optional[Iterable] = None,
+             string_dtype: Optional[pd.StringDtype] = None) -> Optional[pd.DataFrame]:
+        """
+        Загрузка DataFrame из кэша (с отображением файла в память)
+
+        Args:
+            key: Ключ кэша
+            columns: Столбцы для загрузки (None = все); порядок - как в исходном файле
+            string_dtype: dtype строковых столбцов (None = object); string[pyarrow]
+                загружается из кэша без создания объектов Python
+
+        Returns:
+            DataFrame или None (нет записи / запись повреждена)
+        """
+        table = self.load_table(key, columns)
+        if table is None:
+            return None
+
+        try:
+            # Без поиска повторяющихся строк: преобразование в разы быстрее
+            types_mapper = None
+            if string_dtype is not None:
+                types_mapper = {pa.string(): string_dtype, pa.large_string(): string_dtype}.get
+            df = table.to_pandas(deduplicate_objects=False, types_mapper=types_mapper)
+        except (OSError, ValueError):
+            self._remove(self._path(key))
+            return None
+
+        # Пропуски в строковых столбцах Arrow возвращает как None, разбор файла - как NaN
+        for i, dtype in enumerate(df.dtypes):
+            if dtype == object:
+                values = df.iloc[:, i]
+                missing = values.isna()
+                if missing.any():
+                    df.isetitem(i, values.mask(missing, np.nan))
+
+        return df
+
+    def store(self, key: str, df: pd.DataFrame) -> bool:
+        """
+        Запись DataFrame в кэш (без сжатия - для чтения с отображением в память)
+
+        DataFrame, которые нельзя записать в Feather (нестроковые или
+        повторяющиеся имена столбцов, смешанные типы значений в столбце),
+        не кэшируются.
+
+        Args:
+            key: Ключ кэша
+            df: DataFrame для сохранения
+
+        Returns:
+            bool: Записан ли DataFrame
+        """
+        # Feather хранит только уникальные строковые имена столбцов
+        if not df.columns.is_unique or not all(isinstance(col, str) for col in df.columns):
+            return False
+
+        path = self._path(key)
+        tmp_path = path.with_suffix(f'{self.SUFFIX}.{os.getpid()}.tmp')
+
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            feather.write_feather(df, str(tmp_path), compression='uncompressed')
+            os.replace(tmp_path, path)
+        except (OSError, ValueError, TypeError):
+            # ArrowTypeError наследует TypeError, ArrowInvalid - ValueError
+            self._remove(tmp_path)
+            return False
+
+        self.evict()
+        return True
+
+    def evict(self):
+        """Удаление устаревших записей и вытеснение давно не используемых сверх лимита размера"""
+        try:
+            entries = [(entry.stat(), entry) for entry in self.directory.glob(f'*{self.SUFFIX}')]
+        except OSError:
+            return
+
+        now = time.time()
+        max_age = self.max_age_days * 24 * 3600
+        fresh = []
+        for stat, entry in entries:
+            if now - stat.st_mtime > max_age:
+                self._remove(entry)
+            else:
+                fresh.append((stat, entry))
+
+        # Сначала вытесняются записи, которые дольше всего не использовались
+        fresh.sort(key=lambda item: item[0].st_mtime)
+        total = sum(stat.st_size for stat, _ in fresh)
+        for stat, entry in fresh:
+            if total <= self.max_bytes:
+                break
+            self._remove(entry)
+            total -= stat.st_size
+
+    def clear(self):
+        """Удаление всех записей кэша"""
+        for entry in self.directory.glob(f'*{self.SUFFIX}'):
+            self._remove(entry)
+
+    @staticmethod
+    def _remove(path: Path):
+        try:
+            path.unlink()
+        except OSError:
+            pass
@@ -7,6 +7,7 @@
 
 import pandas as pd
 import numpy as np
+import xlsxwriter
 from pathlib import Path
 from typing import Dict, List, Optional
 from tkinter import messagebox, filedialog
@@ -182,8 +183,20 @@ class ExcelExporter:
             return
 
         stats = self.engine.calculate_statistics(self.results)
+        stats_data = self._statistics_frame(stats)
+        stats_data.to_excel(writer, sheet_name='Статистика', index=False)
+
+    def _statistics_frame(self, stats: Dict) -> pd.DataFrame:
+        """
+        Таблица статистики по категориям для листа 'Статистика'
+
+        Args:
+            stats: Статистика (MatchingEngine.calculate_statistics)
 
-        stats_data = pd.DataFrame([
+        Returns:
+            DataFrame со столбцами Категория, Количество, Процент
+        """
+        return pd.DataFrame([
             {'Категория': 'Всего записей', 'Количество': stats['total'], 'Процент': '100%'},
             {'Категория': '100% (точное совпадение)', 'Количество': stats['perfect'],
              'Процент': f"{stats['perfect']/stats['total']*100:.1f}%"},
@@ -202,8 +215,6 @@ class ExcelExporter:
              'Процент': 'OK' if stats['check_sum'] == stats['total'] else 'ОШИБКА!'}
         ])
 
-        stats_data.to_excel(writer, sheet_name='Статистика', index=False)
-
     # ========== ОСНОВНЫЕ МЕТОДЫ ЭКСПОРТА ==========
 
     def export_results(self, data: pd.DataFrame, filename: str,
@@ -421,3 +432,128 @@ class ExcelExporter:
         except Exception as e:
             messagebox.showerror("Ошибка", f"❌ Ошибка при экспорте:\n{str(e)}")
             return False
+
+
+class ResultStreamWriter:
+    """
+    Потоковая запись результатов сопоставления частями (.xlsx или .csv)
+
+    Результат не накапливается в памяти: каждая часть сразу записывается
+    в файл. Для .xlsx используется режим xlsxwriter constant_memory
+    (строки сбрасываются на диск по мере записи) с форматированием как в
+    ExcelExporter; при превышении лимита строк Excel создаётся следующий
+    лист. Статистика накапливается по частям и записывается на отдельный
+    лист при закрытии.
+    """
+
+    # Лимит строк листа Excel без строки заголовка
+    EXCEL_MAX_DATA_ROWS = 1_048_575
+
+    def __init__(self, exporter: ExcelExporter, filename: str):
+        """
+        Инициализация записи
+
+        Args:
+            exporter: Экспортер (форматы, ширина столбцов, движок для статистики)
+            filename: Путь к файлу результата (.xlsx или .csv)
+        """
+        self.exporter = exporter
+        self.filename = filename
+        self.is_csv = Path(filename).suffix.lower() == '.csv'
+        self.rows_written = 0
+        self.statistics = None
+
+        self._columns = None
+        self._sheet_count = 0
+        self._sheet_rows = 0
+
+        if self.is_csv:
+            # utf-8-sig - чтобы Excel открывал кириллицу без ручного выбора кодировки
+            self._handle = open(filename, 'w', encoding='utf-8-sig', newline='')
+            self._workbook = None
+        else:
+            self._handle = None
+            self._workbook = xlsxwriter.Workbook(filename, {'constant_memory': True})
+            self._header_format = exporter._create_header_format(self._workbook)
+            self._formats = exporter._create_color_formats(self._workbook)
+            self._worksheet = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+    def write(self, results: pd.DataFrame):
+        """
+        Запись очередной части результата
+
+        Args:
+            results: DataFrame части результата (столбцы - как у первой части)
+        """
+        if self._columns is None:
+            self._columns = ['№'] + list(results.columns)
+
+        self.statistics = self.exporter.engine.merge_statistics(
+            self.statistics, self.exporter.engine.calculate_statistics(results))
+
+        data = self.exporter._clean_dataframe(results)
+        data.insert(0, '№', range(self.rows_written + 1, self.rows_written + len(data) + 1))
+
+        if self.is_csv:
+            data.to_csv(self._handle, header=self.rows_written == 0, index=False)
+        else:
+            self._write_excel_rows(data)
+
+        self.rows_written += len(data)
+
+    def _new_sheet(self):
+        """Создание очередного листа результатов с заголовком"""
+        self._sheet_count += 1
+        name = 'Результаты' if self._sheet_count == 1 else f'Результаты ({self._sheet_count})'
+        self._worksheet = self._workbook.add_worksheet(name)
+        self.exporter._apply_header_format(self._worksheet, self._columns, self._header_format)
+        self.exporter._set_column_widths(self._worksheet, self._columns)
+        self._sheet_rows = 0
+
+    def _write_excel_rows(self, data: pd.DataFrame):
+        """Построчная запись части в .xlsx (строки идут строго по порядку)"""
+        debug_columns = {i for i, col in enumerate(self._columns) if '[DEBUG]' in str(col)}
+        percent_pos = self._columns.index(AppConstants.COL_PERCENT)
+        debug_format = self._formats['debug']
+
+        for row in data.itertuples(index=False, name=None):
+            if self._worksheet is None or self._sheet_rows >= self.EXCEL_MAX_DATA_ROWS:
+                self._new_sheet()
+            self._sheet_rows += 1
+
+            fmt = self.exporter._get_format_by_percent(row[percent_pos], self._formats)
+            for col_num, value in enumerate(row):
+                cell_fmt = debug_format if col_num in debug_columns else fmt
+                self._worksheet.write(self._sheet_rows, col_num, value, cell_fmt)
+
+    def close(self):
+        """Завершение записи (лист статистики для .xlsx) и закрытие файла"""
+        if self.is_csv:
+            if self._handle is not None:
+                self._handle.close()
+                self._handle = None
+            return
+
+        if self._workbook is None:
+            return
+
+        if self._worksheet is None and self._columns is not None:
+            self._new_sheet()
+
+        if self.statistics and self.statistics['total']:
+            stats_data = self.exporter._statistics_frame(self.statistics)
+            worksheet = self._workbook.add_worksheet('Статистика')
+            self.exporter._apply_header_format(worksheet, stats_data.columns, self._header_format)
+            for row_num, row in enumerate(stats_data.itertuples(index=False, name=None), start=1):
+                for col_num, value in enumerate(row):
+                    worksheet.write(row_num, col_num, value)
+
+        self._workbook.close()
+        self._workbook = None
@@ -0,0 +1,151 @@
+"""
+Постоянный индекс источника 2 для Expert Excel Matcher
+
+Этот модуль содержит класс MatchIndexStore, который сохраняет подготовленный
+к поиску источник 2 (объединённые и нормализованные строки, n-граммный
+индекс блокировки) в файлах Feather. Ключ - отпечаток значений сравниваемых
+столбцов и настроек нормализации, поэтому повторные запуски на том же
+справочнике загружают готовый индекс (с отображением в память) вместо
+объединения, нормализации и построения n-грамм заново.
+"""
+
+import hashlib
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.blocking_index import NgramIndex
+from src.constants import AppConstants
+from src.disk_cache import FrameDiskCache, PYARROW_AVAILABLE
+
+
+class MatchIndexStore:
+    """Хранилище подготовленных индексов источника 2 (Feather) с ключом по отпечатку данных"""
+
+    # Версия формата индекса: меняется при изменении подготовки строк или n-грамм
+    FORMAT_VERSION = 1
+
+    def __init__(self, directory: Optional[str] = AppConstants.MATCH_INDEX_DIR,
+                 max_bytes: int = AppConstants.MATCH_INDEX_MAX_MB * 1024 * 1024):
+        """
+        Инициализация хранилища индексов
+
+        Args:
+            directory: Папка индексов (None = ~/.expert_matcher/index)
+            max_bytes: Максимальный суммарный размер индексов (старые вытесняются)
+
+        Raises:
+            ImportError: Если pyarrow не установлен
+        """
+        if not PYARROW_AVAILABLE:
+            raise ImportError("pyarrow не установлен. Установите: pip install pyarrow")
+
+        directory = directory or str(Path.home() / '.expert_matcher' / 'index')
+        self.cache = FrameDiskCache(directory, max_bytes)
+
+    def key(self, df: pd.DataFrame, columns: List[str], options_key: Tuple) -> str:
+        """
+        Отпечаток источника 2: значения сравниваемых столбцов и настройки нормализации
+
+        Хэшируются только значения (векторно, без объединения и нормализации),
+        поэтому отпечаток не зависит от того, из какого файла прочитан DataFrame.
+
+        Args:
+            df: DataFrame источника 2
+            columns: Столбцы для сравнения
+            options_key: Ключ настроек нормализации (NormalizationOptions.key)
+
+        Returns:
+            Шестнадцатеричный ключ
+        """
+        present = [col for col in columns if col in df.columns]
+
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(f'{self.FORMAT_VERSION}|{AppConstants.VERSION}|{options_key}|'
+                      f'{columns}|{present}|{len(df)}|'.encode('utf-8'))
+        if present and len(df):
+            hashes = pd.util.hash_pandas_object(df[present], index=False)
+            digest.update(hashes.to_numpy().tobytes())
+        return digest.hexdigest()
+
+    def load(self, key: str) -> Optional[Tuple[List[str], List[str]]]:
+        """
+        Загрузка подготовленных строк источника 2
+
+        Args:
+            key: Отпечаток источника 2
+
+        Returns:
+            (объединённые строки, нормализованные строки) или None, если индекса нет
+        """
+        table = self.cache.load_table(key)
+        if table is None or table.column_names != ['combined', 'normalized']:
+            return None
+
+        # Повторяющиеся строки справочника становятся одним объектом Python
+        df = table.to_pandas(deduplicate_objects=True)
+        return df['combined'].tolist(), df['normalized'].tolist()
+
+    def store(self, key: str, combined: List[str], normalized: List[str]) -> bool:
+        """
+        Сохранение подготовленных строк источника 2
+
+        Args:
+            key: Отпечаток источника 2
+            combined: Объединённые строки (по строкам источника 2)
+            normalized: Нормализованные строки (по строкам источника 2)
+
+        Returns:
+            bool: Записан ли индекс
+        """
+        return self.cache.store(key, pd.DataFrame({'combined': combined, 'normalized': normalized},
+                                                  dtype=object))
+
+    @staticmethod
+    def _ngram_key(key: str, n: int) -> str:
+        return f'{key}-ngram{n}'
+
+    def load_ngrams(self, key: str, choices: List[str],
+                    n: int = AppConstants.BLOCKING_NGRAM) -> Optional[NgramIndex]:
+        """
+        Загрузка n-граммного индекса блокировки
+
+        Списки вхождений остаются срезами отображённого в память файла (без копирования).
+
+        Args:
+            key: Отпечаток источника 2
+            choices: Нормализованные строки источника 2 (из load или подготовки)
+            n: Длина n-граммы
+
+        Returns:
+            NgramIndex или None, если индекса нет
+        """
+        table = self.cache.load_table(self._ngram_key(key, n))
+        if table is None or table.column_names != ['gram', 'ids']:
+            return None
+
+        postings: Dict[str, np.ndarray] = {}
+        for grams, ids in zip(table.column('gram').chunks, table.column('ids').chunks):
+            values = ids.values.to_numpy()
+            offsets = ids.offsets.to_numpy()
+            for i, gram in enumerate(grams.to_pylist()):
+                postings[gram] = values[offsets[i]:offsets[i + 1]]
+
+        return NgramIndex.from_postings(choices, postings, n)
+
+    def store_ngrams(self, key: str, index: NgramIndex) -> bool:
+        """
+        Сохранение n-граммного индекса блокировки
+
+        Args:
+            key: Отпечаток источника 2
+            index: Построенный NgramIndex
+
+        Returns:
+            bool: Записан ли индекс
+        """
+        frame = pd.DataFrame({'gram': list(index.postings.keys()),
+                              'ids': list(index.postings.values())})
+        return self.cache.store(self._ngram_key(key, index.n), frame)
@@ -5,9 +5,11 @@
 """
 
 import re
+import numpy as np
 import pandas as pd
-from typing import List, Dict
-from src.constants import NormalizationConstants
+from functools import lru_cache
+from typing import List, Dict, Optional, Tuple
+from src.constants import AppConstants, NormalizationConstants
 
 # Проверка доступности транслитерации
 try:
@@ -17,6 +19,22 @@ except ImportError:
     TRANSLITERATE_AVAILABLE = False
 
 
+# Предкомпилированные выражения, не зависящие от настроек
+_PUNCTUATION_RE = re.compile(r'[^a-zа-яё0-9\s]')
+_CYRILLIC_RE = re.compile(r'[а-яё]')
+
+
+def _compile_group(patterns: List[str]) -> Tuple['re.Pattern', List['re.Pattern']]:
+    """
+    Компиляция группы паттернов удаления (без учёта регистра)
+
+    Returns:
+        (общее выражение (?:p1)|(?:p2)|... для проверки, список отдельных выражений)
+    """
+    any_re = re.compile('|'.join(f'(?:{p})' for p in patterns), re.IGNORECASE)
+    return any_re, [re.compile(p, re.IGNORECASE) for p in patterns]
+
+
 class NormalizationOptions:
     """Настройки нормализации"""
 
@@ -42,23 +60,100 @@ class NormalizationOptions:
         self.transliterate = transliterate
         self.remove_punctuation = remove_punctuation
 
+    def key(self) -> Tuple[bool, ...]:
+        """Кортеж настроек (используется как часть ключа кэша нормализации)"""
+        return (self.remove_legal, self.remove_versions, self.remove_stopwords,
+                self.transliterate, self.remove_punctuation)
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, NormalizationOptions) and self.key() == other.key()
+
+    def __hash__(self) -> int:
+        return hash(self.key())
+
 
 class MatchingEngine:
     """Движок нормализации и сопоставления строк"""
 
-    def __init__(self, normalization_options: NormalizationOptions = None):
+    def __init__(self, normalization_options: NormalizationOptions = None,
+                 cache_size: int = AppConstants.NORMALIZATION_CACHE_SIZE):
         """
         Инициализация движка
 
         Args:
             normalization_options: Настройки нормализации (если None - используются по умолчанию)
+            cache_size: Размер LRU-кэша нормализации (количество различных строк)
         """
         self.norm_options = normalization_options or NormalizationOptions()
+        self._compile_pipeline()
+        # Кэш по ключу (строка, настройки): повторяющиеся строки нормализуются один раз
+        # typed=True: 1 и 1.0 нормализуются по-разному ("1" и "1 0")
+        self._normalize_cached = lru_cache(maxsize=cache_size, typed=True)(self._normalize)
+
+    def set_options(self, normalization_options: NormalizationOptions):
+        """
+        Смена настроек нормализации (кэш сбрасывается, если настройки изменились)
+
+        Args:
+            normalization_options: Новые настройки нормализации
+        """
+        if normalization_options != self.norm_options:
+            self.norm_options = normalization_options
+            self._compile_pipeline()
+            self._normalize_cached.cache_clear()
+
+    def _compile_pipeline(self):
+        """
+        Компиляция регулярных выражений для активных настроек (один раз)
+
+        Для каждой группы удаляемых паттернов (юридические формы, версии) создаётся
+        общее выражение (?:p1)|(?:p2)|... для быстрой проверки «есть ли что удалять»
+        и список отдельно скомпилированных паттернов. Объединять группу в одну замену
+        нельзя: замена на пробел меняет границы слов, и результат зависит от порядка
+        (например, 'S.A.Co.' или '8.2021').
+        """
+        self._removal_groups = []
+
+        if self.norm_options.remove_legal:
+            self._removal_groups.append(_compile_group(NormalizationConstants.LEGAL_PREFIXES))
+
+        if self.norm_options.remove_versions:
+            self._removal_groups.append(_compile_group(NormalizationConstants.VERSION_PATTERNS))
+
+    def cache_stats(self) -> Dict[str, int]:
+        """
+        Статистика кэша нормализации
+
+        Returns:
+            Словарь {'hits', 'misses', 'size', 'max_size'}
+        """
+        info = self._normalize_cached.cache_info()
+        return {'hits': info.hits, 'misses': info.misses,
+                'size': info.currsize, 'max_size': info.maxsize}
 
     def normalize_string(self, s: str) -> str:
+        """
+        Нормализация строки с кэшированием (каждая различная строка - один раз)
+
+        Args:
+            s: Строка для нормализации
+
+        Returns:
+            Нормализованная строка
+        """
+        try:
+            return self._normalize_cached(s, self.norm_options.key())
+        except TypeError:
+            # Нехэшируемое значение - нормализуем без кэша
+            return self._normalize(s, self.norm_options.key())
+
+    def _normalize(self, s: str, options_key: Tuple[bool, ...]) -> str:
         """
         Расширенная нормализация строки с учётом настроек
 
+        options_key не используется в вычислениях - это часть ключа кэша,
+        чтобы результаты для разных настроек не смешивались.
+
         Применяет различные преобразования в зависимости от настроек:
         - Удаление юридических форм (ООО, Ltd, Inc...)
         - Удаление версий (2021, v4.x, R2, SP1, x64...)
@@ -78,41 +173,83 @@ class MatchingEngine:
         s = str(s).strip()
 
         # 1. Удаление юридических префиксов (ООО, Ltd, Inc, GmbH...)
-        if self.norm_options.remove_legal:
-            for pattern in NormalizationConstants.LEGAL_PREFIXES:
-                s = re.sub(pattern, ' ', s, flags=re.IGNORECASE)
-
         # 2. Удаление версий (2021, v4.x, R2, SP1, x64, Windows 10...)
-        if self.norm_options.remove_versions:
-            for pattern in NormalizationConstants.VERSION_PATTERNS:
-                s = re.sub(pattern, ' ', s, flags=re.IGNORECASE)
+        # Паттерны каждой группы применяются последовательно (результат зависит от порядка),
+        # но только если общее выражение группы нашло в строке хотя бы одно совпадение
+        for any_re, pattern_res in self._removal_groups:
+            if any_re.search(s):
+                for pattern in pattern_res:
+                    s = pattern.sub(' ', s)
 
         # 3. Приведение к нижнему регистру (всегда)
         s = s.lower()
 
         # 4. Удаление пунктуации (кроме букв, цифр, пробелов)
         if self.norm_options.remove_punctuation:
-            s = re.sub(r'[^a-zа-яё0-9\s]', ' ', s)
+            s = _PUNCTUATION_RE.sub(' ', s)
 
-        # 5. Удаление стоп-слов (и, в, the, a, and...)
+        # 5. Разбиение на слова + удаление стоп-слов (и, в, the, a, and...)
+        # Разбиение по пробелам заодно схлопывает пробелы
+        words = s.split()
         if self.norm_options.remove_stopwords:
-            words = s.split()
-            words = [w for w in words if w and w not in NormalizationConstants.STOP_WORDS]
-            s = ' '.join(words)
+            words = [w for w in words if w not in NormalizationConstants.STOP_WORDS]
+        s = ' '.join(words)
 
         # 6. Транслитерация кириллицы → латиница
         if self.norm_options.transliterate and TRANSLITERATE_AVAILABLE:
-            if re.search(r'[а-яё]', s):
+            if _CYRILLIC_RE.search(s):
                 try:
                     s = translit(s, 'ru', reversed=True)
+                    # 7. Схлопывание пробелов после транслитерации
+                    s = ' '.join(s.split())
                 except Exception:
                     pass  # Если транслитерация не удалась, оставляем как есть
 
-        # 7. Схлопывание пробелов (всегда)
-        s = re.sub(r'\s+', ' ', s).strip()
-
         return s
 
+    def normalize_series(self, series: pd.Series) -> pd.Series:
+        """
+        Нормализация целого столбца
+
+        Столбец разбивается на уникальные значения (pd.factorize), каждое уникальное
+        значение проходит конвейер normalize_string один раз (через кэш), результат
+        раскладывается обратно по строкам позиционным take. Результат идентичен
+        построчному normalize_string.
+
+        Args:
+            series: Столбец со строками (любой dtype)
+
+        Returns:
+            Series нормализованных строк с тем же индексом
+        """
+        if isinstance(series.dtype, pd.StringDtype):
+            # Строковый столбец (string[pyarrow]): факторизация без упаковки значений
+            # в объекты Python; пропуски получают код -1 -> последний элемент ""
+            codes, uniques = pd.factorize(series)
+            normalized = np.array([self.normalize_string(u) for u in uniques] + [""], dtype=object)
+            return pd.Series(normalized.take(codes), index=series.index, name=series.name)
+
+        values = series.to_numpy(dtype=object)
+        result = np.full(len(values), "", dtype=object)
+        all_strings = pd.api.types.infer_dtype(values, skipna=True) in ('string', 'empty')
+
+        # Пустые значения (NaN/None, "", 0) normalize_string превращает в ""
+        empty = pd.isna(values) | (values == "")
+        if not all_strings:
+            empty |= (values == 0)
+        keep = ~empty
+
+        if keep.any():
+            kept = values[keep]
+            if not all_strings:
+                # Сравниваем строковые представления: 1, 1.0 и True - разные строки
+                kept = pd.Series(kept, dtype=object).astype(str).to_numpy(dtype=object)
+            codes, uniques = pd.factorize(kept)
+            normalized = np.array([self.normalize_string(u) for u in uniques], dtype=object)
+            result[keep] = normalized.take(codes)
+
+        return pd.Series(result, index=series.index, name=series.name)
+
     def combine_columns(self, row: pd.Series, columns: List[str]) -> str:
         """
         Объединение значений из нескольких столбцов в одну строку
@@ -133,6 +270,48 @@ class MatchingEngine:
 
         return " ".join(values) if values else ""
 
+    def combine_columns_frame(self, df: pd.DataFrame, columns: List[str]) -> pd.Series:
+        """
+        Объединение значений из нескольких столбцов для всех строк DataFrame сразу
+
+        Колоночный аналог combine_columns (без iterrows): отсутствующие столбцы
+        пропускаются, NaN/None и пустые после strip значения игнорируются,
+        остальные значения str(val).strip() соединяются через пробел.
+
+        Args:
+            df: DataFrame с данными
+            columns: список столбцов для объединения
+
+        Returns:
+            Series объединенных строк с тем же индексом, что и df
+        """
+        present = [col for col in columns if col in df.columns]
+        if present and all(isinstance(df[col].dtype, pd.StringDtype) for col in present):
+            # Все столбцы строковые (string[pyarrow]): векторные строковые операции
+            combined = df[present[0]].str.strip().fillna("")
+            for col in present[1:]:
+                part = df[col].str.strip().fillna("")
+                # Части уже без краевых пробелов: strip убирает только лишний разделитель
+                combined = (combined + " " + part).str.strip()
+            return combined
+
+        combined = np.full(len(df), "", dtype=object)
+
+        for col in columns:
+            if col not in df.columns:
+                continue
+
+            values = df[col].to_numpy(dtype=object)
+            missing = pd.isna(values)
+            part = pd.Series(values, dtype=object).astype(str).str.strip().to_numpy(dtype=object)
+            part[missing] = ""
+
+            # Разделитель нужен только между двумя непустыми частями
+            both = (combined != "") & (part != "")
+            combined = np.where(both, combined + " " + part, combined + part)
+
+        return pd.Series(combined, index=df.index, dtype=object)
+
     def prepare_choice_dict(self, df: pd.DataFrame, columns: List[str]) -> Dict[str, str]:
         """
         Подготовка словаря нормализованных строк для быстрого поиска
@@ -144,10 +323,11 @@ class MatchingEngine:
         Returns:
             Словарь {нормализованная_строка: оригинальная_строка}
         """
+        originals = self.combine_columns_frame(df, columns)
+        normalized_values = self.normalize_series(originals)
+
         choice_dict = {}
-        for _, row in df.iterrows():
-            original = self.combine_columns(row, columns)
-            normalized = self.normalize_string(original)
+        for original, normalized in zip(originals, normalized_values):
             if normalized:  # Пропускаем пустые строки
                 choice_dict[normalized] = original
 
@@ -189,3 +369,22 @@ class MatchingEngine:
             'none': none,            # 0%
             'check_sum': check_sum   # Для проверки
         }
+
+    @staticmethod
+    def merge_statistics(accumulated: Optional[Dict], stats: Dict) -> Dict:
+        """
+        Сложение статистики по частям результата (потоковая обработка)
+
+        Категории не пересекаются, поэтому статистика всего результата -
+        сумма статистик его частей.
+
+        Args:
+            accumulated: Накопленная статистика (None - ещё нет)
+            stats: Статистика очередной части (calculate_statistics)
+
+        Returns:
+            Словарь со статистикой (в формате calculate_statistics)
+        """
+        if accumulated is None:
+            return dict(stats)
+        return {key: accumulated[key] + value for key, value in stats.items()}
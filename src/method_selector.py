@@ -0,0 +1,181 @@
+"""
+Выбор лучшего метода сопоставления для Expert Excel Matcher
+
+Этот модуль содержит:
+- length_strata / stratified_order: случайный порядок строк, любой префикс
+  которого пропорционально представляет строки разной длины
+- SuccessiveHalving: выбор метода последовательным отсевом (successive halving)
+  на растущей выборке источника 1
+"""
+
+import math
+import time
+import numpy as np
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from src.constants import AppConstants
+from src.models import MatchingMethod
+
+
+def stratified_order(strata: Sequence, seed: Optional[int] = None) -> np.ndarray:
+    """
+    Случайная перестановка позиций, стратифицированная по префиксам
+
+    Внутри каждой страты позиции перемешиваются, затем страты чередуются
+    пропорционально своему размеру: первые n позиций результата содержат
+    каждую страту в доле, близкой к её доле во всех данных. Поэтому выборки
+    растущего размера вложены друг в друга и все стратифицированы.
+
+    Args:
+        strata: Метка страты для каждой позиции
+        seed: Зерно генератора случайных чисел (None = случайно)
+
+    Returns:
+        Массив позиций (перестановка range(len(strata)))
+    """
+    rng = np.random.default_rng(seed)
+    labels = np.asarray(strata)
+    if labels.size == 0:
+        return np.zeros(0, dtype=np.int64)
+
+    # Ранг позиции внутри страты (в случайном порядке), делённый на размер страты
+    order = rng.permutation(labels.size)
+    _, inverse, counts = np.unique(labels[order], return_inverse=True, return_counts=True)
+    ranks = np.zeros(labels.size, dtype=np.float64)
+    for stratum in range(len(counts)):
+        members = np.flatnonzero(inverse == stratum)
+        ranks[members] = (np.arange(len(members)) + rng.random(len(members))) / len(members)
+
+    return order[np.argsort(ranks, kind='stable')]
+
+
+def length_strata(strings: Sequence[str], n_strata: int = AppConstants.SELECTION_STRATA) -> np.ndarray:
+    """
+    Страты строк по длине (квантили длины)
+
+    Короткие и длинные названия сопоставляются по-разному, поэтому выборка
+    должна содержать их в тех же долях, что и весь источник.
+
+    Args:
+        strings: Нормализованные строки
+        n_strata: Количество страт
+
+    Returns:
+        Номер страты для каждой строки
+    """
+    lengths = np.fromiter((len(s) for s in strings), dtype=np.int64, count=len(strings))
+    if lengths.size == 0 or n_strata < 2:
+        return np.zeros(lengths.size, dtype=np.int64)
+    edges = np.quantile(lengths, np.linspace(0, 1, n_strata + 1)[1:-1])
+    return np.digitize(lengths, edges)
+
+
+@dataclass
+class SelectionRound:
+    """Раунд отбора методов"""
+
+    sample_size: int
+    """Размер выборки источника 1 в раунде"""
+
+    scores: Dict[str, Tuple[int, int, float]]
+    """Оценка (100%, 90-99%, средний процент) каждого оставшегося метода"""
+
+    elapsed: float
+    """Время от начала отбора в секундах"""
+
+
+class SuccessiveHalving:
+    """Выбор метода последовательным отсевом на растущей выборке
+
+    Все методы оцениваются на небольшой выборке; после каждого раунда
+    остаётся лучшая 1/growth часть методов (равные на границе не
+    отбрасываются), а выборка для оставшихся увеличивается в growth раз.
+    Выборки вложены: каждый метод оценивает только новые строки выборки.
+    Методы сравниваются по тому же ключу, что и в режиме сравнения:
+    (100%, 90-99%, средний процент); при равенстве выигрывает метод,
+    выбранный раньше.
+    """
+
+    def __init__(self, initial_sample: int = AppConstants.SELECTION_INITIAL_SAMPLE,
+                 max_sample: int = AppConstants.SELECTION_MAX_SAMPLE,
+                 growth: int = AppConstants.SELECTION_GROWTH,
+                 time_budget: Optional[float] = AppConstants.SELECTION_TIME_BUDGET):
+        """
+        Инициализация отбора методов
+
+        Args:
+            initial_sample: Размер выборки в первом раунде
+            max_sample: Максимальный размер выборки
+            growth: Во сколько раз растёт выборка и сокращается число методов за раунд
+            time_budget: Лимит времени отбора в секундах (None или 0 = без лимита);
+                         по его исчерпании выбирается лучший метод последнего раунда
+        """
+        self.initial_sample = max(1, initial_sample)
+        self.max_sample = max(self.initial_sample, max_sample)
+        self.growth = max(2, growth)
+        self.time_budget = time_budget
+
+    def select(self, methods: Sequence[MatchingMethod], order: Sequence[int],
+               score_rows: Callable[[List[MatchingMethod], np.ndarray], Dict[str, np.ndarray]],
+               score_key: Callable[[np.ndarray], Tuple[int, int, float]],
+               progress_callback: Optional[Callable[[int, int, int], None]] = None
+               ) -> Tuple[MatchingMethod, Tuple[int, int, float], List[SelectionRound]]:
+        """
+        Отбор лучшего метода
+
+        Args:
+            methods: Методы-кандидаты (порядок определяет выбор при равенстве)
+            order: Позиции строк в порядке включения в выборку (stratified_order)
+            score_rows: Функция (методы, позиции строк) -> {название метода: проценты по строкам}
+            score_key: Функция (проценты выборки) -> (100%, 90-99%, средний процент)
+            progress_callback: Функция (раунд, осталось методов, размер выборки),
+                               вызывается перед каждым раундом
+
+        Returns:
+            Tuple: (лучший метод, его оценка, раунды отбора)
+
+        Raises:
+            ValueError: Нет методов-кандидатов
+        """
+        if not methods:
+            raise ValueError("Не выбрано ни одного метода")
+
+        order = np.asarray(order, dtype=np.int64)
+        start_time = time.time()
+        alive = list(methods)
+        scores = {method.name: np.zeros(0, dtype=np.float64) for method in alive}
+        rounds = []
+        evaluated = 0
+        sample_size = min(self.initial_sample, len(order))
+
+        while True:
+            if progress_callback:
+                progress_callback(len(rounds) + 1, len(alive), sample_size)
+
+            # Оцениваются только строки, добавленные в выборку в этом раунде
+            new_scores = score_rows(alive, order[evaluated:sample_size])
+            for method in alive:
+                scores[method.name] = np.concatenate([scores[method.name], new_scores[method.name]])
+            evaluated = sample_size
+
+            keys = {method.name: score_key(scores[method.name]) for method in alive}
+            # sorted устойчива: при равенстве раньше выбранный метод остаётся первым
+            alive = sorted(alive, key=lambda m: keys[m.name], reverse=True)
+            rounds.append(SelectionRound(sample_size, dict(keys), time.time() - start_time))
+
+            out_of_time = self.time_budget and time.time() - start_time >= self.time_budget
+            if len(alive) == 1 or sample_size >= min(self.max_sample, len(order)) or out_of_time:
+                break
+
+            # Отсев: остаётся лучшая 1/growth часть и все равные последнему оставшемуся
+            keep = math.ceil(len(alive) / self.growth)
+            threshold = keys[alive[keep - 1].name]
+            alive = [method for method in alive if keys[method.name] >= threshold]
+            if len(alive) == 1:
+                break
+
+            sample_size = min(sample_size * self.growth, self.max_sample, len(order))
+
+        best = alive[0]
+        return best, keys[best.name], rounds
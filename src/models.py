@@ -5,12 +5,21 @@
 - MatchingMethod: Класс метода сопоставления
 - MatchResult: Результат сопоставления одной записи (dataclass)
 - MethodStatistics: Статистика работы метода (dataclass)
+- SourcePart: Часть источника данных - файл или лист книги (dataclass)
+- RunSettings: Настройки обработки, прочитанные из интерфейса перед запуском (dataclass)
 """
 
 from dataclasses import dataclass, field
+from pathlib import Path
 from typing import Dict, List, Tuple, Callable, Optional
+import numpy as np
 import pandas as pd
 
+from src.batch_scorer import BatchScorer
+from src.blocking_index import NgramIndex
+from src.constants import AppConstants
+from src.scoring import apply_length_penalty, select_best, to_percent
+
 # Флаги доступности библиотек (будут установлены при импорте)
 RAPIDFUZZ_AVAILABLE = False
 process = None
@@ -36,7 +45,7 @@ class MatchingMethod:
             name: Название метода (отображаемое)
             func: Функция сопоставления
             library: Библиотека (rapidfuzz, textdistance, jellyfish, builtin)
-            use_process: Использовать ли rapidfuzz.process.extractOne (оптимизация)
+            use_process: Использовать ли rapidfuzz.process (extract/cdist - оптимизация)
             scorer: Scorer для rapidfuzz (если use_process=True)
             use_original_strings: Legacy параметр (не используется)
             is_exact_match: Флаг точного совпадения для оптимизации ВПР (O(1) вместо O(N))
@@ -49,6 +58,12 @@ class MatchingMethod:
         self.use_original_strings = use_original_strings  # Не используется (Legacy)
         self.is_exact_match = is_exact_match
 
+    @property
+    def batch_scorable(self) -> bool:
+        """Метод оценивается матрично через rapidfuzz.process.cdist (BatchScorer/MultiScorer)"""
+        return self.use_process and RAPIDFUZZ_AVAILABLE and not self.use_original_strings \
+            and not self.is_exact_match
+
     def find_best_match(self, query: str, choices: List[str],
                        choice_dict: Dict[str, str]) -> Tuple[str, float]:
         """
@@ -78,73 +93,118 @@ class MatchingMethod:
 
             if self.use_process and RAPIDFUZZ_AVAILABLE and not self.use_original_strings:
                 # RapidFuzz process работает только с нормализованными строками
-                result = process.extractOne(
-                    query,
-                    choices,
-                    scorer=self.scorer,
-                    score_cutoff=50
-                )
-                if result:
-                    match_normalized, score, _ = result
-                    original_match = choice_dict.get(match_normalized, "")
-
-                    # Применяем штраф за разницу в длине
-                    match_len = len(original_match)
-                    length_ratio = min(query_len, match_len) / max(query_len, match_len) if max(query_len, match_len) > 0 else 0
-
-                    # Штраф: если длины очень разные, снижаем score
-                    # Для коротких строк (<=3 символа) штраф сильнее
-                    if query_len <= 3 or match_len <= 3:
-                        # Для очень коротких строк требуем почти точное совпадение длин
-                        length_penalty = length_ratio ** 2  # Квадратичный штраф
-                    else:
-                        # Для длинных строк штраф мягче
-                        length_penalty = length_ratio ** 0.5  # Корень квадратный
-
-                    adjusted_score = float(score) * length_penalty
-
-                    # Если после штрафа score < 50, отбрасываем
-                    if adjusted_score < 50:
-                        return "", 0.0
-
-                    return original_match, adjusted_score
-                return "", 0.0
+                # Оцениваются все варианты строки (как в пакетном BatchScorer): после
+                # штрафа за длину лучшим может оказаться не кандидат с максимальным
+                # «сырым» процентом
+                raw_scores = process.cdist([query], choices,
+                                           scorer=self.scorer,
+                                           score_cutoff=AppConstants.THRESHOLD_REJECT,
+                                           dtype=np.float32)[0]
+                candidate_ids = np.flatnonzero(raw_scores)
+                if not len(candidate_ids):
+                    return "", 0.0
+
+                originals = [choice_dict.get(choices[idx], "") for idx in candidate_ids]
+                original_lens = np.fromiter((len(o) for o in originals), dtype=np.float64, count=len(originals))
+
+                # Штраф за длину + порог отклонения (общий этап для всех методов)
+                adjusted = apply_length_penalty(raw_scores[candidate_ids], query_len, original_lens)
+                best_idx, best_scores = select_best(adjusted)
+
+                if best_idx[0] < 0:
+                    return "", 0.0
+                return originals[best_idx[0]], float(best_scores[0])
             else:
                 # Ручной перебор для других библиотек
-                best_match = ""
-                best_score = 0.0
+                # Идентичная строка всегда даёт 100% - ищем её за O(1)
+                if query in choice_dict:
+                    return choice_dict[query], 100.0
 
+                raw_scores = []
                 for choice in choices:
                     try:
-                        score = self.func(query, choice)
-                        # Нормализация score в диапазон 0-100
-                        if isinstance(score, float) and 0 <= score <= 1:
-                            score = score * 100
-                        score = float(score)
+                        raw_scores.append(self.func(query, choice))
+                    except Exception:
+                        raw_scores.append(0.0)
 
-                        # Применяем штраф за разницу в длине
-                        choice_len = len(choice)
-                        length_ratio = min(query_len, choice_len) / max(query_len, choice_len) if max(query_len, choice_len) > 0 else 0
+                # Штраф за длину + порог отклонения (общий этап для всех методов)
+                choice_lens = np.fromiter((len(c) for c in choices), dtype=np.float64, count=len(choices))
+                adjusted = apply_length_penalty(to_percent(raw_scores), query_len, choice_lens)
+                best_idx, best_scores = select_best(adjusted)
 
-                        if query_len <= 3 or choice_len <= 3:
-                            length_penalty = length_ratio ** 2
-                        else:
-                            length_penalty = length_ratio ** 0.5
+                if best_idx[0] < 0:
+                    return "", 0.0
+                return choice_dict.get(choices[best_idx[0]], ""), float(best_scores[0])
+        except Exception:
+            return "", 0.0
 
-                        adjusted_score = score * length_penalty
+    def find_best_matches(self, queries: List[str], choices: List[str],
+                          choice_dict: Dict[str, str],
+                          progress_callback: Optional[Callable[[int, int], None]] = None,
+                          blocking_index: Optional[NgramIndex] = None
+                          ) -> List[Tuple[str, float]]:
+        """
+        Пакетный поиск лучших совпадений для списка запросов
 
-                        if adjusted_score > best_score:
-                            best_score = adjusted_score
-                            best_match = choice_dict.get(choice, "")
+        Для RapidFuzz методов весь список оценивается блоками через
+        rapidfuzz.process.cdist (BatchScorer), для остальных - построчно
+        через find_best_match. Если передан blocking_index, каждый запрос
+        сравнивается только с кандидатами, отобранными по общим n-граммам
+        (RapidFuzz - блоками против объединения кандидатов блока).
 
-                            if best_score >= 99.9:
-                                break
-                    except Exception:
-                        continue
+        Args:
+            queries: Нормализованные строки запросов
+            choices: Список нормализованных строк для сравнения
+            choice_dict: Словарь {нормализованная_строка: оригинальная_строка}
+            progress_callback: Функция (обработано, всего) для обновления прогресса
+            blocking_index: N-граммный индекс, построенный по choices (None = без блокировки)
 
-                return best_match, best_score
-        except Exception:
-            return "", 0.0
+        Returns:
+            List[Tuple[str, float]]: (оригинальная строка совпадения, процент) для каждого запроса
+        """
+        if self.batch_scorable:
+            # Штраф за длину считается по оригинальной строке, как в find_best_match
+            choice_lengths = [len(choice_dict.get(choice, "")) for choice in choices]
+            best_idx, best_scores = BatchScorer(self.scorer).best_matches(
+                queries, choices, choice_lengths, progress_callback, blocking_index=blocking_index
+            )
+            return [(choice_dict.get(choices[idx], ""), float(score)) if idx >= 0 else ("", 0.0)
+                    for idx, score in zip(best_idx, best_scores)]
+
+        if blocking_index is not None and not self.is_exact_match:
+            return self._find_best_matches_blocked(queries, choices, choice_dict,
+                                                   blocking_index, progress_callback)
+
+        results = []
+        total = len(queries)
+        for i, query in enumerate(queries):
+            results.append(self.find_best_match(query, choices, choice_dict))
+            if progress_callback and i % 10 == 0:
+                progress_callback(i + 1, total)
+
+        if progress_callback:
+            progress_callback(total, total)
+
+        return results
+
+    def _find_best_matches_blocked(self, queries: List[str], choices: List[str],
+                                   choice_dict: Dict[str, str], blocking_index: NgramIndex,
+                                   progress_callback: Optional[Callable[[int, int], None]] = None
+                                   ) -> List[Tuple[str, float]]:
+        """Построчный поиск среди кандидатов, отобранных n-граммным индексом"""
+        results = []
+        total = len(queries)
+        for i, query in enumerate(queries):
+            candidate_ids = blocking_index.candidates(query)
+            candidates = [choices[idx] for idx in candidate_ids]
+            results.append(self.find_best_match(query, candidates, choice_dict))
+            if progress_callback and i % 10 == 0:
+                progress_callback(i + 1, total)
+
+        if progress_callback:
+            progress_callback(total, total)
+
+        return results
 
 
 @dataclass
@@ -183,6 +243,47 @@ class MatchResult:
         return result
 
 
+@dataclass(frozen=True)
+class SourcePart:
+    """Часть источника данных: файл (первый лист) или конкретный лист книги Excel"""
+
+    filename: str
+    """Путь к файлу"""
+
+    sheet: Optional[str] = None
+    """Название листа (None = первый лист; для CSV не используется)"""
+
+    @property
+    def label(self) -> str:
+        """Подпись части для столбца происхождения записей"""
+        name = Path(self.filename).name
+        return f"{name} [{self.sheet}]" if self.sheet is not None else name
+
+
+@dataclass(frozen=True)
+class RunSettings:
+    """Настройки обработки: читаются из переменных Tk в главном потоке перед запуском
+
+    Рабочий поток обработки получает только этот снимок и к виджетам
+    (tk.BooleanVar, tk.StringVar...) не обращается.
+    """
+
+    inherit_askupo_cols: bool = True
+    """Добавлять в результат остальные столбцы источника 1"""
+
+    inherit_eatool_cols: bool = True
+    """Добавлять в результат остальные столбцы источника 2"""
+
+    blocking_min_share: float = 0.0
+    """Минимальная доля общих n-грамм кандидата (0 = блокировка выключена)"""
+
+    parallel: bool = True
+    """Параллельная обработка методов textdistance/jellyfish"""
+
+    selection_budget: float = AppConstants.SELECTION_TIME_BUDGET
+    """Лимит времени выбора метода в автоматическом режиме, секунд (0 = без лимита)"""
+
+
 @dataclass
 class MethodStatistics:
     """Статистика работы метода сопоставления"""
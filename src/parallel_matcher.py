@@ -0,0 +1,146 @@
+"""
+Параллельное сопоставление для Expert Excel Matcher
+
+Этот модуль содержит класс ParallelMatcher, который распределяет строки
+источника 1 по процессам (ProcessPoolExecutor) для методов на чистом Python
+(textdistance, jellyfish), упирающихся в GIL. Нормализованные строки
+источника 2 и словарь вариантов передаются каждому процессу один раз
+при его запуске (initializer), а не с каждой задачей. Пул процессов
+сохраняется между вызовами (части источника 1, потоковая обработка) и
+создаётся заново только при смене источника 2 или метода; по окончании
+обработки пул останавливается (close).
+"""
+
+import math
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+
+from src.blocking_index import NgramIndex
+from src.constants import AppConstants
+from src.models import MatchingMethod
+
+# Состояние процесса-исполнителя (заполняется в _init_worker)
+_worker_state: Dict = {}
+
+
+def _init_worker(method: MatchingMethod, choices: List[str], choice_dict: Dict[str, str],
+                 blocking_index: Optional[NgramIndex]):
+    """Инициализация процесса: источник 2 передаётся один раз"""
+    _worker_state['method'] = method
+    _worker_state['choices'] = choices
+    _worker_state['choice_dict'] = choice_dict
+    _worker_state['blocking_index'] = blocking_index
+
+
+def _match_shard(queries: List[str]) -> List[Tuple[str, float]]:
+    """Сопоставление одной порции запросов в процессе-исполнителе"""
+    return _worker_state['method'].find_best_matches(
+        queries,
+        _worker_state['choices'],
+        _worker_state['choice_dict'],
+        blocking_index=_worker_state['blocking_index']
+    )
+
+
+class ParallelMatcher:
+    """Распределение сопоставления по процессам для методов на чистом Python"""
+
+    def __init__(self, max_workers: Optional[int] = None,
+                 min_rows: int = AppConstants.PARALLEL_MIN_ROWS,
+                 shard_size: int = AppConstants.PARALLEL_SHARD_SIZE):
+        """
+        Инициализация
+
+        Args:
+            max_workers: Количество процессов (None = все ядра)
+            min_rows: Минимум запросов, при котором включается параллельность
+            shard_size: Максимум запросов в одной задаче
+        """
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.min_rows = min_rows
+        self.shard_size = shard_size
+
+        self._pool: Optional[ProcessPoolExecutor] = None
+        # (метод, источник 2, словарь, индекс), переданные процессам пула
+        self._pool_args: Tuple = ()
+
+    def is_suitable(self, method: MatchingMethod, n_queries: int) -> bool:
+        """
+        Имеет ли смысл параллельная обработка
+
+        RapidFuzz уже работает на всех ядрах (cdist), точное совпадение - O(1),
+        поэтому параллельно обрабатываются только методы с ручным перебором.
+        """
+        return (not method.use_process and not method.is_exact_match
+                and self.max_workers > 1 and n_queries >= self.min_rows)
+
+    def _shards(self, queries: List[str]) -> List[List[str]]:
+        """Разбиение запросов на порции (несколько порций на процесс для балансировки)"""
+        size = max(1, min(self.shard_size, math.ceil(len(queries) / (self.max_workers * 4))))
+        return [queries[i:i + size] for i in range(0, len(queries), size)]
+
+    def _get_pool(self, initargs: Tuple) -> ProcessPoolExecutor:
+        """Пул процессов для метода и источника 2 (сравнение по идентичности объектов)"""
+        same = (self._pool is not None and len(initargs) == len(self._pool_args)
+                and all(new is old for new, old in zip(initargs, self._pool_args)))
+        if not same:
+            self.close()
+            self._pool = ProcessPoolExecutor(max_workers=self.max_workers,
+                                             mp_context=multiprocessing.get_context(
+                                                 AppConstants.PROCESS_START_METHOD),
+                                             initializer=_init_worker,
+                                             initargs=initargs)
+            self._pool_args = initargs
+        return self._pool
+
+    def close(self):
+        """Остановка пула процессов (окончание обработки); повторный вызов безопасен"""
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+        self._pool = None
+        self._pool_args = ()
+
+    def find_best_matches(self, method: MatchingMethod, queries: List[str], choices: List[str],
+                          choice_dict: Dict[str, str],
+                          progress_callback: Optional[Callable[[int, int], None]] = None,
+                          blocking_index: Optional[NgramIndex] = None
+                          ) -> List[Tuple[str, float]]:
+        """
+        Параллельный аналог MatchingMethod.find_best_matches
+
+        Результаты возвращаются в исходном порядке запросов и совпадают
+        с последовательной обработкой. Пул процессов предыдущего вызова
+        используется повторно, если метод и источник 2 те же объекты.
+
+        Args:
+            method: Метод сопоставления
+            queries: Нормализованные строки запросов
+            choices: Список нормализованных строк для сравнения
+            choice_dict: Словарь {нормализованная_строка: оригинальная_строка}
+            progress_callback: Функция (обработано, всего) для обновления прогресса
+            blocking_index: N-граммный индекс (None = без блокировки)
+
+        Returns:
+            List[Tuple[str, float]]: (оригинальная строка совпадения, процент) для каждого запроса
+        """
+        total = len(queries)
+        results: List[Tuple[str, float]] = []
+
+        pool = self._get_pool((method, choices, choice_dict, blocking_index))
+        futures = [pool.submit(_match_shard, shard) for shard in self._shards(queries)]
+
+        # Собираем по порядку - порядок результатов совпадает с порядком запросов
+        try:
+            for future in futures:
+                results.extend(future.result())
+                if progress_callback:
+                    progress_callback(len(results), total)
+        except BaseException:
+            # Прерывание (в т.ч. отмена из progress_callback) или сбой процесса
+            # (BrokenProcessPool) - оставшиеся части не ждём, пул не используется дальше
+            self.close()
+            raise
+
+        return results
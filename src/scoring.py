@@ -0,0 +1,107 @@
+"""
+Общий этап пост-обработки оценок для Expert Excel Matcher
+
+Этот модуль содержит векторизованные (NumPy) функции, которые используются
+всеми методами сопоставления после вычисления «сырых» процентов:
+- to_percent: приведение оценок 0-1 к диапазону 0-100
+- length_penalty: штраф за разницу в длине строк
+- apply_length_penalty: штраф + порог отклонения за один проход
+- select_best: выбор лучшего варианта по строкам матрицы
+"""
+
+import numpy as np
+from typing import Sequence, Tuple, Union
+
+from src.constants import AppConstants
+
+ArrayLike = Union[np.ndarray, Sequence[float]]
+
+
+def to_percent(raw_scores: ArrayLike) -> np.ndarray:
+    """
+    Приведение оценок к диапазону 0-100
+
+    Библиотеки textdistance и jellyfish возвращают сходство 0-1,
+    rapidfuzz - сразу проценты. Значения 0-1 умножаются на 100.
+
+    Args:
+        raw_scores: Массив «сырых» оценок
+
+    Returns:
+        Массив процентов (float64)
+    """
+    scores = np.asarray(raw_scores, dtype=np.float64)
+    return np.where((scores >= 0) & (scores <= 1), scores * 100, scores)
+
+
+def length_penalty(query_lens: ArrayLike, choice_lens: ArrayLike) -> np.ndarray:
+    """
+    Штраф за разницу в длине строк
+
+    Если длины очень разные, процент снижается:
+    - для коротких строк (<=3 символа) - квадратичный штраф (ratio ** 2)
+    - для длинных строк - мягкий штраф (ratio ** 0.5)
+
+    Массивы длин транслируются (broadcast) по правилам NumPy:
+    query_lens[:, None] и choice_lens[None, :] дают матрицу штрафов.
+
+    Штраф считается в float64, как в построчной формуле: проценты у границ
+    категорий и порога отклонения не должны сдвигаться из-за округления.
+
+    Args:
+        query_lens: Длины запросов
+        choice_lens: Длины вариантов
+
+    Returns:
+        Массив штрафов в диапазоне 0-1 (float64)
+    """
+    q = np.asarray(query_lens, dtype=np.float64)
+    c = np.asarray(choice_lens, dtype=np.float64)
+
+    longest = np.maximum(q, c)
+    ratio = np.divide(np.minimum(q, c), longest,
+                      out=np.zeros(longest.shape, dtype=np.float64),
+                      where=longest > 0)
+
+    short = (q <= 3) | (c <= 3)
+    return np.where(short, ratio ** 2, np.sqrt(ratio))
+
+
+def apply_length_penalty(scores: ArrayLike, query_lens: ArrayLike, choice_lens: ArrayLike,
+                         score_cutoff: float = AppConstants.THRESHOLD_REJECT) -> np.ndarray:
+    """
+    Применение штрафа за длину и порога отклонения за один проход
+
+    Args:
+        scores: «Сырые» проценты (0-100)
+        query_lens: Длины запросов (транслируются вместе со scores)
+        choice_lens: Длины вариантов (транслируются вместе со scores)
+        score_cutoff: Порог - скорректированные проценты ниже обнуляются
+
+    Returns:
+        Скорректированные проценты (ниже порога = 0)
+    """
+    adjusted = np.asarray(scores) * length_penalty(query_lens, choice_lens)
+    return np.where(adjusted >= score_cutoff, adjusted, 0)
+
+
+def select_best(adjusted: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Выбор лучшего варианта по строкам матрицы скорректированных процентов
+
+    При равенстве выбирается первый вариант (как в extractOne).
+
+    Args:
+        adjusted: Матрица shape (B, M) после apply_length_penalty
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: (индекс лучшего варианта или -1, процент или 0)
+    """
+    adjusted = np.atleast_2d(adjusted)
+    if adjusted.shape[1] == 0:
+        return np.full(adjusted.shape[0], -1, dtype=np.int64), np.zeros(adjusted.shape[0])
+
+    cols = adjusted.argmax(axis=1)
+    best = adjusted[np.arange(adjusted.shape[0]), cols].astype(np.float64)
+    matched = best > 0
+    return np.where(matched, cols, -1).astype(np.int64), np.where(matched, best, 0.0)
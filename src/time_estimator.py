@@ -0,0 +1,254 @@
+"""
+Оценка времени обработки для Expert Excel Matcher
+
+Этот модуль содержит:
+- ThroughputStore: измеренная скорость методов на этом компьютере (JSON)
+- TimeEstimate: оценка времени с интервалом (нижняя граница, ожидаемое, верхняя)
+- TimeEstimator: калибровка методов на малой пробе и экстраполяция на
+  реальные размеры источников (N x M сравнений, доля кандидатов при блокировке)
+"""
+
+import json
+import math
+import os
+import platform
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from src.blocking_index import NgramIndex
+from src.constants import AppConstants
+from src.models import MatchingMethod
+
+
+def format_duration(seconds: float) -> str:
+    """
+    Длительность в удобных единицах (секунды, минуты, часы)
+
+    Args:
+        seconds: Длительность в секундах
+
+    Returns:
+        Строка вида "40 с", "12 мин", "2.5 ч"
+    """
+    if seconds < 60:
+        return f"{max(1, round(seconds))} с"
+    if seconds < 3600:
+        return f"{round(seconds / 60)} мин"
+    return f"{seconds / 3600:.1f} ч"
+
+
+def blocking_ratio(queries: Sequence[str], choices: List[str], min_share: float) -> float:
+    """
+    Средняя доля вариантов, остающихся кандидатами при блокировке
+
+    Args:
+        queries: Нормализованные строки пробы источника 1
+        choices: Нормализованные строки пробы источника 2
+        min_share: Минимальная доля общих n-грамм (уровень блокировки)
+
+    Returns:
+        Доля кандидатов (1.0 = без блокировки)
+    """
+    if not min_share or not choices or not queries:
+        return 1.0
+    index = NgramIndex(choices, min_share=min_share)
+    return float(np.mean([len(index.candidates(query)) for query in queries])) / len(choices)
+
+
+@dataclass
+class TimeEstimate:
+    """Оценка времени в секундах с интервалом"""
+
+    low: float = 0.0
+    """Нижняя граница"""
+
+    expected: float = 0.0
+    """Ожидаемое время"""
+
+    high: float = 0.0
+    """Верхняя граница"""
+
+    def __add__(self, other: 'TimeEstimate') -> 'TimeEstimate':
+        """Сумма оценок последовательных этапов"""
+        return TimeEstimate(self.low + other.low, self.expected + other.expected, self.high + other.high)
+
+    def __str__(self) -> str:
+        """Текст для диалогов: ожидаемое время и интервал"""
+        return (f"~{format_duration(self.expected)} "
+                f"(от {format_duration(self.low)} до {format_duration(self.high)})")
+
+
+class ThroughputStore:
+    """Измеренная скорость методов (секунд на сравнение), отдельно для каждого компьютера"""
+
+    # Версия формата файла: меняется при изменении единиц измерения
+    FORMAT_VERSION = 1
+
+    def __init__(self, path: Optional[str] = AppConstants.THROUGHPUT_FILE,
+                 history: int = AppConstants.ESTIMATE_HISTORY):
+        """
+        Инициализация хранилища скорости методов
+
+        Args:
+            path: Файл JSON (None = ~/.expert_matcher/throughput.json)
+            history: Сколько последних измерений хранить для каждого метода
+        """
+        self.path = Path(path) if path else Path.home() / '.expert_matcher' / 'throughput.json'
+        self.history = max(1, history)
+        # Скорость зависит от процессора и версий библиотек сопоставления
+        self.machine = f"{platform.node()}|{platform.machine()}|{os.cpu_count()}|{platform.python_version()}"
+        self._data = self._load()
+
+    def _load(self) -> Dict:
+        """Чтение файла (повреждённый или чужой версии файл игнорируется)"""
+        try:
+            data = json.loads(self.path.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            return {'version': self.FORMAT_VERSION, 'machines': {}}
+        if not isinstance(data, dict) or data.get('version') != self.FORMAT_VERSION:
+            return {'version': self.FORMAT_VERSION, 'machines': {}}
+        return data
+
+    def _save(self):
+        """Атомарная запись файла (ошибки записи не мешают работе - оценки просто не сохранятся)"""
+        tmp_path = self.path.with_suffix(f'.{os.getpid()}.tmp')
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path.write_text(json.dumps(self._data, ensure_ascii=False, indent=1), encoding='utf-8')
+            os.replace(tmp_path, self.path)
+        except OSError:
+            try:
+                tmp_path.unlink()
+            except OSError:
+                pass
+
+    def measurements(self, method_name: str) -> List[Dict]:
+        """Измерения метода на этом компьютере: [{'rate': секунд на сравнение, 'time': когда}]"""
+        return self._data['machines'].get(self.machine, {}).get(method_name, [])
+
+    def rates(self, method_name: str,
+              max_age_days: Optional[float] = AppConstants.ESTIMATE_MAX_AGE_DAYS) -> List[float]:
+        """
+        Актуальные измерения скорости метода
+
+        Args:
+            method_name: Название метода
+            max_age_days: Измерения старше не учитываются (None = все)
+
+        Returns:
+            Секунд на одно сравнение (от старых к новым)
+        """
+        oldest = time.time() - max_age_days * 86400 if max_age_days else 0
+        return [m['rate'] for m in self.measurements(method_name) if m.get('time', 0) >= oldest]
+
+    def record(self, method_name: str, rate: float):
+        """
+        Сохранение измерения скорости метода
+
+        Args:
+            method_name: Название метода
+            rate: Секунд на одно сравнение
+        """
+        machine = self._data['machines'].setdefault(self.machine, {})
+        history = machine.get(method_name, []) + [{'rate': rate, 'time': time.time()}]
+        machine[method_name] = history[-self.history:]
+        self._save()
+
+
+class TimeEstimator:
+    """Оценка времени методов по измеренной скорости
+
+    Скорость метода измеряется на малой пробе реальных данных (запросы x
+    варианты) и сохраняется в ThroughputStore, поэтому повторные оценки на
+    этом компьютере не требуют калибровки. Время на всех данных
+    экстраполируется по числу сравнений N x M (для точного совпадения - по
+    числу запросов N) с учётом доли кандидатов при блокировке. Интервал
+    отражает разброс измерений и погрешность экстраполяции с малой пробы.
+    """
+
+    def __init__(self, store: ThroughputStore,
+                 spread: float = AppConstants.ESTIMATE_SPREAD):
+        """
+        Инициализация оценщика
+
+        Args:
+            store: Хранилище измеренной скорости методов
+            spread: Минимальный множитель интервала (ожидаемое / spread ... ожидаемое * spread)
+        """
+        self.store = store
+        self.spread = max(1.0, spread)
+
+    @staticmethod
+    def comparisons(method: MatchingMethod, n_queries: int, n_choices: float) -> float:
+        """Число сравнений метода (точное совпадение - поиск в словаре, одно на запрос)"""
+        return float(n_queries) if method.is_exact_match else float(n_queries) * n_choices
+
+    def needs_calibration(self, method: MatchingMethod) -> bool:
+        """Нет актуальных измерений скорости метода на этом компьютере"""
+        return not self.store.rates(method.name)
+
+    def calibrate(self, methods: Sequence[MatchingMethod], queries: List[str], choices: List[str],
+                  choice_dict: Dict[str, str], force: bool = False,
+                  progress_callback: Optional[Callable[[int, int], None]] = None) -> int:
+        """
+        Измерение скорости методов на пробе
+
+        Args:
+            methods: Методы сопоставления
+            queries: Нормализованные строки пробы источника 1
+            choices: Нормализованные строки пробы источника 2
+            choice_dict: Словарь {нормализованная_строка: оригинальная_строка}
+            force: Измерить и методы с актуальными измерениями
+            progress_callback: Функция (проверено методов, всего) перед каждым методом;
+                исключение из неё прерывает калибровку (измеренное сохраняется)
+
+        Returns:
+            Количество измеренных методов
+        """
+        calibrated = 0
+        for done, method in enumerate(methods):
+            if progress_callback:
+                progress_callback(done, len(methods))
+            if not force and not self.needs_calibration(method):
+                continue
+            count = self.comparisons(method, len(queries), len(choices))
+            if not count:
+                continue
+
+            start = time.perf_counter()
+            method.find_best_matches(queries, choices, choice_dict)
+            self.store.record(method.name, (time.perf_counter() - start) / count)
+            calibrated += 1
+        return calibrated
+
+    def estimate(self, method: MatchingMethod, n_queries: int, n_choices: int,
+                 candidate_ratio: float = 1.0, workers: int = 1) -> TimeEstimate:
+        """
+        Оценка времени метода на данных заданного размера
+
+        Args:
+            method: Метод сопоставления
+            n_queries: Записей источника 1
+            n_choices: Записей источника 2
+            candidate_ratio: Доля кандидатов при блокировке (1.0 = без блокировки)
+            workers: Процессов параллельной обработки
+
+        Returns:
+            TimeEstimate (нулевая, если метод не откалиброван)
+        """
+        rates = self.store.rates(method.name)
+        if not rates:
+            return TimeEstimate()
+
+        # Медиана и разброс - в логарифмах (скорость мультипликативна)
+        logs = np.log(rates)
+        rate = float(np.exp(np.median(logs)))
+        spread = max(self.spread, math.exp(2 * float(np.std(logs))))
+
+        choices = n_choices if method.is_exact_match else n_choices * candidate_ratio
+        expected = rate * self.comparisons(method, n_queries, choices) / max(1, workers)
+        return TimeEstimate(expected / spread, expected, expected * spread)
@@ -289,6 +289,101 @@ class FileSelectorWidget(tk.Frame):
             self.file_label.config(text="📂 Файл не выбран", fg="gray")
 
 
+class ProgressDialog(tk.Toplevel):
+    """
+    Модальное окно прогресса обработки с кнопкой отмены
+
+    Использование:
+        dialog = ProgressDialog(root, "Применение метода...", "⚙️ RapidFuzz: WRatio",
+                                on_cancel=task.cancel)
+        dialog.update_progress(status="Обработка записей...", value=100, maximum=1000)
+    """
+
+    def __init__(self, parent, title: str, header: str,
+                 on_cancel: Optional[Callable] = None,
+                 indeterminate: bool = False,
+                 geometry: str = "600x260"):
+        """
+        Инициализация окна прогресса
+
+        Args:
+            parent: Родительское окно
+            title: Заголовок окна
+            header: Текст заголовка в окне
+            on_cancel: Callback кнопки "Отмена" и закрытия окна (None = без отмены)
+            indeterminate: Индикатор без шкалы (общий объём работы неизвестен)
+            geometry: Размер окна
+        """
+        super().__init__(parent)
+        self.title(title)
+        self.geometry(geometry)
+        self.transient(parent)
+        self.grab_set()
+
+        self.on_cancel = on_cancel
+        self.cancelling = False
+
+        tk.Label(self, text=header, font=("Arial", 12, "bold")).pack(pady=10)
+
+        self.status_label = tk.Label(self, text="", font=("Arial", 10))
+        self.status_label.pack(pady=5)
+
+        self.detail_label = tk.Label(self, text="", font=("Arial", 9))
+        self.detail_label.pack()
+
+        self.progress_bar = ttk.Progressbar(self, length=500,
+                                            mode='indeterminate' if indeterminate else 'determinate')
+        self.progress_bar.pack(pady=10)
+
+        self.time_label = tk.Label(self, text="", font=("Arial", 9), fg="gray")
+        self.time_label.pack(pady=5)
+
+        self.cancel_button = tk.Button(self, text="⛔ Отмена", command=self.cancel,
+                                       state=tk.NORMAL if on_cancel else tk.DISABLED,
+                                       font=("Arial", 9), padx=15, pady=3)
+        self.cancel_button.pack(pady=5)
+
+        # Закрытие окна крестиком - та же отмена (окно закрывается после остановки обработки)
+        self.protocol("WM_DELETE_WINDOW", self.cancel)
+
+    def cancel(self):
+        """Запрос отмены: обработка остановится между частями работы"""
+        if self.on_cancel is None or self.cancelling:
+            return
+        self.cancelling = True
+        self.cancel_button.config(state=tk.DISABLED, text="⏳ Отмена...")
+        self.status_label.config(text="Отмена: завершается текущая часть работы...")
+        self.on_cancel()
+
+    def update_progress(self, status: Optional[str] = None, detail: Optional[str] = None,
+                        value: Optional[float] = None, maximum: Optional[float] = None,
+                        time_text: Optional[str] = None, step: bool = False):
+        """
+        Обновить показания окна (None - поле не меняется)
+
+        Args:
+            status: Текущий этап
+            detail: Подробности (записей обработано, метод...)
+            value: Значение шкалы
+            maximum: Максимум шкалы
+            time_text: Прошедшее и оставшееся время
+            step: Сдвинуть индикатор без шкалы
+        """
+        # После запроса отмены этап не меняется - окно показывает, что идёт отмена
+        if status is not None and not self.cancelling:
+            self.status_label.config(text=status)
+        if detail is not None:
+            self.detail_label.config(text=detail)
+        if maximum is not None:
+            self.progress_bar['maximum'] = maximum
+        if value is not None:
+            self.progress_bar['value'] = value
+        if time_text is not None:
+            self.time_label.config(text=time_text)
+        if step:
+            self.progress_bar.step()
+
+
 # ========== ФУНКЦИИ-ХЕЛПЕРЫ ДЛЯ СТИЛИЗАЦИИ ==========
 
 def create_label_frame(parent, title: str, **kwargs) -> tk.LabelFrame:
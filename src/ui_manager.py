@@ -281,6 +281,68 @@ class UIManager:
                  command=self.deselect_all_methods,
                  font=("Arial", 8), padx=10, pady=3).pack(side=tk.LEFT, padx=5)
 
+        # Блокировка кандидатов (n-граммный индекс источника 2)
+        blocking_frame = tk.Frame(settings_frame)
+        blocking_frame.pack(fill=tk.X, pady=5)
+
+        tk.Label(blocking_frame, text="⚡ Блокировка кандидатов (ускорение на больших справочниках):",
+                font=("Arial", 9, "bold")).pack(anchor=tk.W, padx=20)
+
+        blocking_options = [
+            ("Выключена - сравнение со всеми строками", "off"),
+            ("Мягкая - высокая полнота", "soft"),
+            ("Сбалансированная", "balanced"),
+            ("Строгая - максимальная скорость, возможны пропуски", "strict"),
+        ]
+        for text, value in blocking_options:
+            tk.Radiobutton(blocking_frame, text=text,
+                          variable=self.parent.blocking_level_var, value=value,
+                          font=("Arial", 9)).pack(anchor=tk.W, padx=40)
+
+        tk.Label(blocking_frame,
+                text="💡 Строка сравнивается только с кандидатами, у которых достаточно общих триграмм",
+                font=("Arial", 8), fg="gray").pack(anchor=tk.W, padx=40)
+
+        tk.Checkbutton(settings_frame,
+                      text="🧵 Параллельная обработка на всех ядрах (методы TextDistance и Jellyfish)",
+                      variable=self.parent.parallel_var,
+                      font=("Arial", 9)).pack(anchor=tk.W, padx=20, pady=(5, 0))
+
+        # Лимит времени выбора метода (автоматический режим)
+        budget_frame = tk.Frame(settings_frame)
+        budget_frame.pack(fill=tk.X, padx=20, pady=(5, 0))
+
+        tk.Label(budget_frame, text="⏳ Лимит времени выбора метода (автоматический режим), сек:",
+                font=("Arial", 9)).pack(side=tk.LEFT)
+        tk.Spinbox(budget_frame, from_=0, to=3600, increment=10, width=6,
+                  textvariable=self.parent.selection_budget_var,
+                  font=("Arial", 9)).pack(side=tk.LEFT, padx=5)
+
+        tk.Label(settings_frame,
+                text="💡 0 = без лимита; методы отсеиваются на малой выборке, выборка растёт только "
+                     "для лучших",
+                font=("Arial", 8), fg="gray").pack(anchor=tk.W, padx=40)
+
+        tk.Checkbutton(settings_frame,
+                      text="🌊 Потоковая обработка больших файлов (источник 1 частями, результат сразу в файл)",
+                      variable=self.parent.streaming_var,
+                      font=("Arial", 9)).pack(anchor=tk.W, padx=20, pady=(5, 0))
+
+        tk.Label(settings_frame,
+                text="💡 Только автоматический режим: память не зависит от размера источника 1, "
+                     "результат не сортируется и не показывается в таблице",
+                font=("Arial", 8), fg="gray").pack(anchor=tk.W, padx=40)
+
+        tk.Checkbutton(settings_frame,
+                      text="♻️ Инкрементальный режим (обновить предыдущий результат)",
+                      variable=self.parent.incremental_var,
+                      font=("Arial", 9)).pack(anchor=tk.W, padx=20, pady=(5, 0))
+
+        tk.Label(settings_frame,
+                text="💡 Метод берётся из предыдущего результата; заново сопоставляются только новые и "
+                     "изменённые записи источника 1 (источник 2 должен быть тем же)",
+                font=("Arial", 8), fg="gray").pack(anchor=tk.W, padx=40)
+
         # ==== НОВАЯ СЕКЦИЯ: Выбор столбцов для сравнения ====
         columns_frame = tk.LabelFrame(main_frame, text="Выбор столбцов для сравнения",
                                       font=("Arial", 11, "bold"), padx=10, pady=10)
@@ -0,0 +1,140 @@
+"""
+Тесты для фонового выполнения обработки
+"""
+import sys
+import threading
+from pathlib import Path
+import pytest
+
+root_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(root_dir))
+
+from src.background_task import BackgroundTask, TaskCancelled
+
+
+class FakeRoot:
+    """Корневое окно без Tk: таймеры after выполняются вручную"""
+
+    def __init__(self):
+        self.callbacks = []
+        self.updates = 0
+
+    def after(self, ms, callback):
+        self.callbacks.append(callback)
+
+    def update(self):
+        self.updates += 1
+
+    def run_timers(self, task: BackgroundTask):
+        """Опрос очереди до завершения задачи (как mainloop)"""
+        task._thread.join(timeout=10)
+        while self.callbacks:
+            self.callbacks.pop(0)()
+
+
+class TestBackgroundTask:
+    """Тесты фоновой задачи"""
+
+    @staticmethod
+    def _task(root, work, threaded=True):
+        events = {'progress': [], 'done': [], 'error': []}
+        task = BackgroundTask(root, work,
+                              on_progress=events['progress'].append,
+                              on_done=events['done'].append,
+                              on_error=events['error'].append,
+                              threaded=threaded)
+        return task, events
+
+    def test_result_and_merged_progress(self):
+        """Результат передаётся в главный поток, прогресс между опросами объединяется"""
+        root = FakeRoot()
+        worker_threads = []
+
+        def work(task):
+            worker_threads.append(threading.current_thread())
+            task.report(status="Подготовка", value=0)
+            task.report(value=5, detail="5/10")
+            return 42
+
+        task, events = self._task(root, work)
+        task.start()
+        root.run_timers(task)
+
+        assert worker_threads[0] is not threading.current_thread()
+        assert events['progress'] == [{'status': "Подготовка", 'value': 5, 'detail': "5/10"}]
+        assert events['done'] == [42]
+        assert events['error'] == []
+        assert task.finished and not task.cancelled
+
+    def test_error_passed_to_main_thread(self):
+        """Исключение обработки передаётся в on_error"""
+        root = FakeRoot()
+
+        def work(task):
+            raise ValueError("ошибка")
+
+        task, events = self._task(root, work)
+        task.start()
+        root.run_timers(task)
+
+        assert events['done'] == []
+        assert isinstance(events['error'][0], ValueError)
+
+    def test_cancel_between_chunks(self):
+        """Отмена останавливает работу в точке проверки, готовые части сохраняются"""
+        root = FakeRoot()
+        started = threading.Event()
+        resume = threading.Event()
+
+        def work(task):
+            done = []
+            for chunk in range(10):
+                try:
+                    task.report(value=chunk)
+                except TaskCancelled:
+                    break
+                done.append(chunk)
+                if chunk == 2:
+                    started.set()
+                    resume.wait(timeout=10)
+            return done
+
+        task, events = self._task(root, work)
+        task.start()
+        started.wait(timeout=10)
+        task.cancel()
+        resume.set()
+        root.run_timers(task)
+
+        assert task.cancelled
+        assert events['done'] == [[0, 1, 2]]
+
+    def test_uncaught_cancel_is_error(self):
+        """Неперехваченная отмена передаётся в on_error как TaskCancelled"""
+        root = FakeRoot()
+        task, events = self._task(root, lambda task: task.check_cancelled(), threaded=False)
+        task.cancel()
+        task.start()
+
+        assert isinstance(events['error'][0], TaskCancelled)
+        with pytest.raises(TaskCancelled):
+            task.check_cancelled()
+
+    def test_synchronous_without_threaded_tcl(self):
+        """Без поддержки потоков в Tcl работа выполняется сразу, окно обновляется при report"""
+        root = FakeRoot()
+
+        def work(task):
+            task.report(value=1)
+            task.report(value=2)
+            return "готово"
+
+        task, events = self._task(root, work, threaded=False)
+        task.start()
+
+        assert events['progress'] == [{'value': 1}, {'value': 2}]
+        assert events['done'] == ["готово"]
+        assert root.updates == 2
+        assert root.callbacks == []
+        # Корневое окно без tcl_platform - потоки не используются
+        assert BackgroundTask(root, lambda task: None).threaded is False
@@ -0,0 +1,188 @@
+"""
+Тесты для пакетной оценки (rapidfuzz.process.cdist)
+"""
+import sys
+from pathlib import Path
+import pytest
+
+root_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(root_dir))
+
+rapidfuzz = pytest.importorskip("rapidfuzz")
+from rapidfuzz import fuzz
+
+from src.batch_scorer import BatchScorer, MultiScorer, query_blocks
+from src.blocking_index import NgramIndex
+from src.models import MatchingMethod
+
+
+class TestBatchScorer:
+    """Тесты пакетного оценщика"""
+
+    choices = ['microsoft office', 'adobe acrobat reader', 'google chrome', 'nginx web server enterprise', 'r']
+    queries = ['microsoft office 365', 'acrobat reader', '', 'chrome', 'r', 'postgresql']
+
+    def _brute_force(self, query):
+        """Эталон: лучший скорректированный процент перебором"""
+        best_idx, best_score = -1, 0.0
+        for idx, choice in enumerate(self.choices):
+            score = fuzz.WRatio(query, choice, score_cutoff=50)
+            q_len, c_len = len(query), len(choice)
+            ratio = min(q_len, c_len) / max(q_len, c_len) if max(q_len, c_len) > 0 else 0
+            penalty = ratio ** 2 if q_len <= 3 or c_len <= 3 else ratio ** 0.5
+            if score * penalty > best_score:
+                best_idx, best_score = idx, score * penalty
+        if best_score < 50:
+            return -1, 0.0
+        return best_idx, best_score
+
+    def test_matches_brute_force(self):
+        """Результат совпадает с построчным перебором"""
+        scorer = BatchScorer(fuzz.WRatio)
+        best_idx, best_scores = scorer.best_matches(self.queries, self.choices,
+                                                    [len(c) for c in self.choices])
+
+        for i, query in enumerate(self.queries):
+            expected_idx, expected_score = self._brute_force(query)
+            assert best_idx[i] == expected_idx, f"Query '{query}'"
+            assert best_scores[i] == pytest.approx(expected_score, abs=1e-3)
+
+    def test_blocks_give_same_result(self):
+        """Разбиение на блоки не влияет на результат"""
+        lengths = [len(c) for c in self.choices]
+        whole = BatchScorer(fuzz.WRatio).best_matches(self.queries, self.choices, lengths)
+        blocked = BatchScorer(fuzz.WRatio, block_cells=len(self.choices)).best_matches(
+            self.queries, self.choices, lengths)
+
+        assert list(whole[0]) == list(blocked[0])
+        assert list(whole[1]) == pytest.approx(list(blocked[1]))
+
+    def test_progress_callback(self):
+        """Прогресс сообщается после каждого блока"""
+        calls = []
+        BatchScorer(fuzz.ratio, block_cells=len(self.choices) * 2).best_matches(
+            self.queries, self.choices, [len(c) for c in self.choices],
+            progress_callback=lambda done, total: calls.append((done, total)))
+
+        # 5 непустых запросов, по 2 в блоке
+        assert calls == [(2, 5), (4, 5), (5, 5)]
+
+    def test_empty_inputs(self):
+        """Пустые списки не ломают оценку"""
+        best_idx, best_scores = BatchScorer(fuzz.ratio).best_matches([], self.choices, [1] * 5)
+        assert len(best_idx) == 0
+
+        best_idx, best_scores = BatchScorer(fuzz.ratio).best_matches(['test'], [], [])
+        assert list(best_idx) == [-1]
+        assert list(best_scores) == [0.0]
+
+    def test_blocking_index_scores_only_candidates(self):
+        """С блокировкой - как оценка каждого запроса по своим кандидатам, при любом разбиении на блоки"""
+        method = MatchingMethod("RapidFuzz: WRatio", fuzz.WRatio, "rapidfuzz",
+                                use_process=True, scorer=fuzz.WRatio)
+        choice_dict = {c: c.upper() for c in self.choices}
+        queries = self.queries * 3
+
+        for min_share in (0.2, 0.5):
+            index = NgramIndex(self.choices, min_share=min_share)
+            expected = [method.find_best_match(q, [self.choices[i] for i in index.candidates(q)], choice_dict)
+                        for q in queries]
+            assert method.find_best_matches(queries, self.choices, choice_dict, blocking_index=index) == expected
+
+            lengths = [len(choice_dict[c]) for c in self.choices]
+            for block_cells in (1, 7, 10 ** 6):
+                best_idx, _ = BatchScorer(fuzz.WRatio, block_cells=block_cells).best_matches(
+                    queries, self.choices, lengths, blocking_index=index)
+                assert [choice_dict[self.choices[i]] if i >= 0 else "" for i in best_idx] == \
+                    [match for match, _ in expected]
+
+    def test_query_blocks(self):
+        """Блоки покрывают все запросы по порядку, лишних ячеек не больше допустимого"""
+        queries = ['microsoft office', 'microsoft office 365', 'google chrome', 'chrome', 'nginx', 'zzz']
+        active = list(range(len(queries)))
+        index = NgramIndex(self.choices, min_share=0.2)
+
+        blocks = list(query_blocks(queries, active, len(self.choices), 100, index, max_waste=2))
+        # Запросы без кандидатов не оцениваются
+        assert [row for rows, _, _, _ in blocks for row in rows] == \
+            [row for row in active if len(index.candidates(queries[row]))]
+        assert blocks[-1][3] == len(queries)
+        for rows, cols, mask, _ in blocks:
+            needed = sum(len(index.candidates(queries[row])) for row in rows)
+            if mask is None:
+                # Один запрос - без маски, только его кандидаты
+                assert len(rows) == 1 and list(cols) == list(index.candidates(queries[rows[0]]))
+                continue
+            assert len(rows) * len(cols) <= 2 * needed
+            for row, row_mask in zip(rows, mask):
+                assert list(cols[row_mask]) == list(index.candidates(queries[row]))
+
+        # Без блокировки - подряд идущие запросы против всех вариантов
+        assert [(list(rows), cols, done) for rows, cols, _, done in query_blocks(queries, active, 5, 15)] == \
+            [([0, 1, 2], None, 3), ([3, 4, 5], None, 6)]
+
+    def test_find_best_matches_returns_originals(self):
+        """MatchingMethod.find_best_matches возвращает оригинальные строки"""
+        method = MatchingMethod("RapidFuzz: WRatio", fuzz.WRatio, "rapidfuzz",
+                                use_process=True, scorer=fuzz.WRatio)
+        choice_dict = {c: c.upper() for c in self.choices}
+
+        matches = method.find_best_matches(['microsoft office', ''], self.choices, choice_dict)
+
+        assert matches[0] == ('MICROSOFT OFFICE', 100.0)
+        assert matches[1] == ('', 0.0)
+
+
+class TestMultiScorer:
+    """Тесты оценки нескольких scorer'ов за один проход"""
+
+    choices = ['microsoft office', 'office microsoft professional', 'adobe acrobat reader',
+               'reader acrobat', 'google chrome', 'nginx web server enterprise', 'r', 'chrome google browser']
+    queries = ['microsoft office 365', 'acrobat reader adobe', '', 'chrome', 'r',
+               'postgresql', 'google chrome', 'server web nginx', 'office']
+
+    scorers = [fuzz.WRatio, fuzz.QRatio, fuzz.ratio, fuzz.partial_ratio,
+               fuzz.token_sort_ratio, fuzz.token_set_ratio, fuzz.token_ratio,
+               fuzz.partial_token_sort_ratio, fuzz.partial_token_set_ratio, fuzz.partial_token_ratio]
+
+    def test_matches_single_scorers(self):
+        """Для каждого scorer результат совпадает с отдельным BatchScorer"""
+        lengths = [len(c) for c in self.choices]
+        results = MultiScorer(self.scorers).best_matches(self.queries, self.choices, lengths)
+
+        for scorer, (best_idx, best_scores) in zip(self.scorers, results):
+            expected_idx, expected_scores = BatchScorer(scorer).best_matches(
+                self.queries, self.choices, lengths)
+            assert list(best_idx) == list(expected_idx), scorer.__name__
+            assert list(best_scores) == pytest.approx(list(expected_scores), abs=1e-3), scorer.__name__
+
+    def test_blocks_and_progress(self):
+        """Блоки учитывают все базовые матрицы, результат от разбиения не зависит"""
+        lengths = [len(c) for c in self.choices]
+        scorers = [fuzz.ratio, fuzz.token_ratio]
+        whole = MultiScorer(scorers).best_matches(self.queries, self.choices, lengths)
+
+        calls = []
+        # ratio + token_sort (ratio по сортированным токенам) + token_set = 3 матрицы
+        blocked = MultiScorer(scorers, block_cells=len(self.choices) * 3 * 3).best_matches(
+            self.queries, self.choices, lengths,
+            progress_callback=lambda done, total: calls.append((done, total)))
+
+        for (idx_a, scores_a), (idx_b, scores_b) in zip(whole, blocked):
+            assert list(idx_a) == list(idx_b)
+            assert list(scores_a) == pytest.approx(list(scores_b))
+        # 8 непустых запросов, по 3 в блоке
+        assert calls == [(3, 8), (6, 8), (8, 8)]
+
+    def test_blocking_index(self):
+        """С блокировкой результат каждого scorer - как у BatchScorer с тем же индексом"""
+        lengths = [len(c) for c in self.choices]
+        index = NgramIndex(self.choices, min_share=0.2)
+        results = MultiScorer(self.scorers, block_cells=50).best_matches(
+            self.queries, self.choices, lengths, blocking_index=index)
+
+        for scorer, (best_idx, best_scores) in zip(self.scorers, results):
+            expected_idx, expected_scores = BatchScorer(scorer).best_matches(
+                self.queries, self.choices, lengths, blocking_index=index)
+            assert list(best_idx) == list(expected_idx), scorer.__name__
+            assert list(best_scores) == pytest.approx(list(expected_scores), abs=1e-3), scorer.__name__
@@ -0,0 +1,65 @@
+"""
+Тесты для n-граммного индекса блокировки кандидатов
+"""
+import sys
+from pathlib import Path
+import pytest
+
+root_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(root_dir))
+
+from src.blocking_index import NgramIndex
+from src.models import MatchingMethod
+
+
+class TestNgramIndex:
+    """Тесты блокировки кандидатов"""
+
+    choices = ['microsoft office', 'adobe acrobat reader', 'google chrome', 'mozilla firefox', 'r']
+
+    def test_grams(self):
+        """Триграммы строятся с пробелами по краям"""
+        index = NgramIndex([])
+        assert index.grams('abc') == {' ab', 'abc', 'bc '}
+        assert index.grams('r') == {' r '}
+        assert index.grams('') == set()
+
+    def test_candidates_share_grams(self):
+        """Кандидаты - только строки с общими триграммами"""
+        index = NgramIndex(self.choices, min_share=0.3)
+
+        assert list(index.candidates('microsoft ofice')) == [0]
+        assert list(index.candidates('chrome browser')) == [2]
+        assert list(index.candidates('r')) == [4]
+        assert len(index.candidates('postgresql')) == 0
+
+    def test_min_share_tradeoff(self):
+        """Чем выше min_share, тем меньше кандидатов"""
+        soft = NgramIndex(self.choices, min_share=0.05)
+        strict = NgramIndex(self.choices, min_share=0.9)
+
+        assert len(soft.candidates('mozilla office')) >= len(strict.candidates('mozilla office'))
+        assert len(strict.candidates('mozilla office')) == 0
+
+    def test_identical_string_always_candidate(self):
+        """Идентичная строка всегда попадает в кандидаты при любом уровне"""
+        index = NgramIndex(self.choices, min_share=1.0)
+        for idx, choice in enumerate(self.choices):
+            assert idx in index.candidates(choice)
+
+    def test_blocked_matching(self):
+        """find_best_matches с индексом находит те же совпадения"""
+        pytest.importorskip("rapidfuzz")
+        from rapidfuzz import fuzz
+
+        method = MatchingMethod("RapidFuzz: WRatio", fuzz.WRatio, "rapidfuzz",
+                                use_process=True, scorer=fuzz.WRatio)
+        choice_dict = {c: c for c in self.choices}
+        queries = ['microsoft office', 'acrobat reader', 'postgresql']
+
+        full = method.find_best_matches(queries, self.choices, choice_dict)
+        blocked = method.find_best_matches(queries, self.choices, choice_dict,
+                                           blocking_index=NgramIndex(self.choices, min_share=0.2))
+
+        assert [m for m, _ in blocked] == [m for m, _ in full]
+        assert blocked[2] == ('', 0.0)
@@ -12,6 +12,8 @@ root_dir = Path(__file__).parent.parent
 sys.path.insert(0, str(root_dir))
 
 from expert_matcher import ExpertMatcher
+from src.constants import AppConstants
+from src.models import SourcePart
 
 
 class TestDataManagement:
@@ -136,3 +138,271 @@ class TestDataManagement:
 
         assert askupo_cols == ['Col1', 'Col2']
         assert eatool_cols == ['ColA']
+
+    def test_loaded_frame_cache(self, monkeypatch):
+        """Тест кэша загруженных файлов: файл разбирается один раз"""
+        data_manager = self.matcher.data_manager
+        parse_calls = []
+        original_parse = data_manager._parse_data_file
+
+        def counting_parse(filename, nrows=None, usecols=None, sheet_name=None):
+            parse_calls.append(nrows)
+            return original_parse(filename, nrows, usecols, sheet_name)
+
+        monkeypatch.setattr(data_manager, '_parse_data_file', counting_parse)
+
+        is_valid, _ = data_manager.set_source1_file(str(self.csv_path))
+        assert is_valid
+        assert data_manager.source1_columns == ['Software', 'Type']
+
+        df = data_manager.load_source1_data()
+        header = self.matcher.read_data_file(str(self.csv_path), nrows=0)
+
+        # Валидация, заголовки и загрузка - один разбор файла
+        assert parse_calls == [None]
+        assert len(df) == 3
+        assert list(header.columns) == ['Software', 'Type'] and len(header) == 0
+
+        # Изменение возвращённого DataFrame не портит кэш
+        df['Extra'] = 1
+        assert 'Extra' not in data_manager.load_source1_data().columns
+
+    def test_loaded_frame_cache_invalidation(self):
+        """Тест кэша загруженных файлов: изменённый на диске файл читается заново"""
+        data_manager = self.matcher.data_manager
+        assert len(data_manager.read_data_file(str(self.csv_path))) == 3
+
+        pd.DataFrame({'Software': ['Nginx'], 'Type': ['Web']}).to_csv(self.csv_path, index=False)
+
+        df = data_manager.read_data_file(str(self.csv_path))
+        assert df['Software'].tolist() == ['Nginx']
+
+    def test_read_with_usecols_projection(self):
+        """Тест чтения только выбранных столбцов (Excel и CSV)"""
+        df = self.matcher.read_data_file(str(self.excel_path), usecols=['Version'])
+        assert list(df.columns) == ['Version']
+        assert len(df) == 3
+
+        df = self.matcher.read_data_file(str(self.csv_path), usecols=['Type'])
+        assert list(df.columns) == ['Type']
+        assert df['Type'].tolist() == ['Database', 'Database', 'Cache']
+
+    def test_usecols_served_from_cache(self, monkeypatch):
+        """Тест проекции из кэша: файл, загруженный целиком, повторно не читается"""
+        data_manager = self.matcher.data_manager
+        full = data_manager.read_data_file(str(self.excel_path))
+
+        def fail_parse(*args, **kwargs):
+            raise AssertionError("файл не должен читаться повторно")
+
+        monkeypatch.setattr(data_manager, '_parse_data_file', fail_parse)
+
+        projected = data_manager.read_data_file(str(self.excel_path), usecols=['Product'])
+        assert list(projected.columns) == ['Product']
+        assert projected['Product'].tolist() == full['Product'].tolist()
+
+    def test_usecols_cache_extends_loaded_columns(self):
+        """Тест кэша проекций: недостающие столбцы дочитываются вместе с загруженными"""
+        data_manager = self.matcher.data_manager
+        data_manager.read_data_file(str(self.csv_path), usecols=['Software'])
+        df = data_manager.read_data_file(str(self.csv_path), usecols=['Type'])
+        assert list(df.columns) == ['Type']
+
+        # Оба столбца уже в кэше; порядок столбцов - как в файле
+        both = data_manager.read_data_file(str(self.csv_path), usecols=['Type', 'Software'])
+        assert list(both.columns) == ['Software', 'Type']
+
+    def test_read_csv_cp1251_semicolon(self):
+        """Тест CSV в cp1251 с разделителем ';' (выгрузка 1С)"""
+        path = self.tmp_path / "export_1c.csv"
+        path.write_bytes('Наименование;Цена\nМышь, беспроводная;100\nКлавиатура;200\n'.encode('cp1251'))
+
+        df = self.matcher.read_data_file(str(path))
+
+        assert list(df.columns) == ['Наименование', 'Цена']
+        assert df['Наименование'].tolist() == ['Мышь, беспроводная', 'Клавиатура']
+        # Кодировка и разделитель запоминаются для файла
+        assert self.matcher.data_manager._csv_settings[str(path.resolve())] == ('cp1251', ';')
+
+    def test_read_csv_encoding_fallback_after_prefix(self):
+        """Тест CSV, где не-ASCII символы встречаются только после проверяемого начала файла"""
+        path = self.tmp_path / "late_cyrillic.csv"
+        filler = ''.join(f'item{i},{i}\n' for i in range(10000))
+        path.write_bytes(('Name,Value\n' + filler + 'Антивирус,1\n').encode('cp1251'))
+
+        df = self.matcher.read_data_file(str(path))
+
+        assert len(df) == 10001
+        assert df['Name'].iloc[-1] == 'Антивирус'
+
+    def test_iter_chunks_matches_full_read(self):
+        """Тест потокового чтения частями: объединение частей совпадает с полным чтением"""
+        df = pd.DataFrame({
+            'Name': ['Office', None, 'Chrome', '7-Zip', None],
+            'Count': [1, 2, None, 4, 5],
+            'Version': [2021, 22.5, 95, None, 1],
+        })
+        xlsx_path = self.tmp_path / "chunks.xlsx"
+        df.to_excel(xlsx_path, index=False)
+        csv_path = self.tmp_path / "chunks.csv"
+        df.to_csv(csv_path, index=False)
+
+        data_manager = self.matcher.data_manager
+        for path in (xlsx_path, csv_path):
+            full = data_manager.read_data_file(str(path))
+            parts = list(data_manager.iter_data_file_chunks(str(path), chunksize=2))
+
+            assert [len(part) for part in parts] == [2, 2, 1]
+            assert parts[1].index.tolist() == [2, 3]
+            combined = pd.concat([part.astype(object) for part in parts])
+            pd.testing.assert_frame_equal(combined, full.astype(object))
+
+    def test_pyarrow_csv_matches_c_engine(self):
+        """Тест полного чтения CSV через pyarrow: значения как у движка C (частичное и потоковое чтение)"""
+        pytest.importorskip("pyarrow")
+        from src.data_manager import DataManager
+
+        path = self.tmp_path / "dates.csv"
+        path.write_text('Name,Stamp,Day,Time,Count\n'
+                        'Office,2024-01-15T10:00:00,2024-01-15,10:00:00,1\n'
+                        ',,,,\n'
+                        'Chrome,2024-02-01 11:30:00,2024-02-01,11:30,3\n', encoding='utf-8')
+        plain_path = self.tmp_path / "plain.csv"
+        plain_path.write_text('Name,Code\nOffice,A1\n,\nChrome,B2\n', encoding='utf-8')
+
+        arrow_manager = DataManager(csv_engine='pyarrow', disk_cache_enabled=False, cache_max_files=0)
+        c_manager = DataManager(csv_engine='c', disk_cache_enabled=False, cache_max_files=0)
+        for csv_path in (path, plain_path):
+            full = arrow_manager.read_data_file(str(csv_path))
+            expected = c_manager.read_data_file(str(csv_path))
+            pd.testing.assert_frame_equal(full, expected)
+            pd.testing.assert_frame_equal(full, arrow_manager.read_data_file(str(csv_path), nrows=10))
+            pd.testing.assert_frame_equal(
+                full, pd.concat(arrow_manager.iter_data_file_chunks(str(csv_path), chunksize=2)))
+            # Пропуски - NaN, как у движка C (не None)
+            assert all(value is not None for value in full.values.ravel())
+
+        full = arrow_manager.read_data_file(str(path))
+        assert full['Stamp'].tolist()[0] == '2024-01-15T10:00:00'
+        assert full['Day'].tolist()[2] == '2024-02-01'
+
+    def test_iter_chunks_usecols(self):
+        """Тест потокового чтения только выбранных столбцов"""
+        parts = list(self.matcher.data_manager.iter_data_file_chunks(
+            str(self.excel_path), chunksize=10, usecols=['Version']))
+
+        assert len(parts) == 1
+        assert list(parts[0].columns) == ['Version']
+        full = self.matcher.read_data_file(str(self.excel_path))
+        assert parts[0]['Version'].tolist() == full['Version'].tolist()
+
+    def test_string_dtype_backend(self):
+        """Тест загрузки строковых столбцов в string[pyarrow]"""
+        pytest.importorskip("pyarrow")
+        from src.data_manager import DataManager
+
+        path = self.tmp_path / "mixed.csv"
+        path.write_text('Name,Count,Code\nOffice,1,A1\n,2,7\nChrome,3,B2\n', encoding='utf-8')
+        excel_path = self.tmp_path / "mixed.xlsx"
+        pd.DataFrame({'Name': ['Office', 'Chrome'], 'Code': ['A1', 7]}).to_excel(excel_path, index=False)
+
+        data_manager = DataManager(dtype_backend='pyarrow', disk_cache_enabled=False)
+        df = data_manager.read_data_file(str(path))
+
+        assert df['Name'].dtype == 'string[pyarrow]'
+        assert df['Code'].dtype == 'string[pyarrow]'
+        assert df['Count'].dtype == 'int64'
+        assert pd.isna(df['Name'][1])
+
+        # Смешанные типы (число и строка в одном столбце Excel) остаются object
+        excel_df = data_manager.read_data_file(str(excel_path))
+        assert excel_df['Name'].dtype == 'string[pyarrow]'
+        assert excel_df['Code'].dtype == object
+
+    def test_probe_file_header_only(self, monkeypatch):
+        """Тест быстрой проверки файла: заголовок и число записей без чтения данных"""
+        df = pd.DataFrame([[1, 2, 3, 4]] * 5, columns=['Продукт', 'Продукт', 2021, ''])
+        excel_path = self.tmp_path / "probe.xlsx"
+        df.to_excel(excel_path, index=False)
+        expected_columns = list(pd.read_excel(excel_path, nrows=0).columns)
+
+        data_manager = self.matcher.data_manager
+
+        def fail_parse(*args, **kwargs):
+            raise AssertionError("данные не должны читаться при выборе файла")
+
+        monkeypatch.setattr(data_manager, '_parse_data_file', fail_parse)
+
+        assert data_manager.probe_file(str(excel_path)) == (expected_columns, 5)
+        assert data_manager.probe_file(str(self.csv_path)) == (['Software', 'Type'], 3)
+
+        is_valid, message = data_manager.set_source1_file(str(excel_path))
+        assert is_valid
+        assert data_manager.source1_columns == expected_columns
+        assert '~5' in message
+
+    def test_probe_file_without_data_rows(self):
+        """Тест быстрой проверки: файл только с заголовком не проходит валидацию"""
+        path = self.tmp_path / "header_only.xlsx"
+        pd.DataFrame(columns=['Name', 'Version']).to_excel(path, index=False)
+
+        is_valid, message = self.matcher.validate_excel_file(str(path))
+
+        assert not is_valid
+        assert 'строк' in message
+
+    def test_read_source_sheets_and_files(self):
+        """Тест источника из нескольких листов и файлов: записи по порядку частей и столбец происхождения"""
+        data_manager = self.matcher.data_manager
+        book = self.tmp_path / "regions.xlsx"
+        with pd.ExcelWriter(book) as writer:
+            pd.DataFrame({'Name': ['Office', 'Chrome']}).to_excel(writer, sheet_name='Север', index=False)
+            pd.DataFrame({'Name': ['Zoom'], 'Vendor': ['Zoom Inc']}).to_excel(writer, sheet_name='Юг', index=False)
+
+        assert data_manager.list_sheets(str(book)) == ['Север', 'Юг']
+        assert data_manager.list_sheets(str(self.csv_path)) == []
+
+        parts = [SourcePart(str(book), 'Север'), SourcePart(str(book), 'Юг'), SourcePart(str(self.csv_path))]
+        df = data_manager.read_source(parts)
+
+        assert list(df.columns) == ['Name', 'Vendor', 'Software', 'Type', AppConstants.COL_SOURCE_PART]
+        assert list(df.index) == list(range(6))
+        assert df['Name'].tolist()[:3] == ['Office', 'Chrome', 'Zoom']
+        assert df[AppConstants.COL_SOURCE_PART].tolist() == (
+            ['regions.xlsx [Север]'] * 2 + ['regions.xlsx [Юг]'] + ['test.csv'] * 3)
+
+        # Первые строки и проекция столбцов (столбец происхождения остаётся)
+        head = data_manager.read_source(parts, nrows=3, usecols=['Name'])
+        assert list(head.columns) == ['Name', AppConstants.COL_SOURCE_PART]
+        assert head['Name'].tolist() == ['Office', 'Chrome', 'Zoom']
+
+        columns, row_count = data_manager.probe_source(parts)
+        assert columns == list(df.columns)
+        assert row_count == 6
+
+        # Потоковое чтение - те же записи с общим набором столбцов
+        chunks = list(data_manager.iter_source_chunks(parts, chunksize=2))
+        pd.testing.assert_frame_equal(pd.concat(chunks), df, check_dtype=False)
+
+    def test_read_source_parts_in_processes(self, monkeypatch):
+        """Тест разбора частей в процессах (spawn): результат как при последовательном разборе"""
+        second = self.tmp_path / "second.csv"
+        pd.DataFrame({'Software': ['Zoom', 'Slack'], 'Type': ['App', 'App']}).to_csv(second, index=False)
+        parts = [SourcePart(str(self.csv_path)), SourcePart(str(second)), SourcePart(str(self.excel_path))]
+
+        monkeypatch.setattr(AppConstants, 'SOURCE_PARSE_WORKERS', 1)
+        serial = self.matcher.data_manager._parse_parts(parts, None)
+        monkeypatch.setattr(AppConstants, 'SOURCE_PARSE_WORKERS', 2)
+        parallel = self.matcher.data_manager._parse_parts(parts, None)
+
+        for expected, frame in zip(serial, parallel):
+            pd.testing.assert_frame_equal(frame, expected)
+
+    def test_read_source_single_file_unchanged(self):
+        """Тест источника из одного файла: чтение как раньше, без столбца происхождения"""
+        data_manager = self.matcher.data_manager
+
+        df = data_manager.read_source([SourcePart(str(self.csv_path))])
+
+        pd.testing.assert_frame_equal(df, data_manager.read_data_file(str(self.csv_path)))
+        assert AppConstants.COL_SOURCE_PART not in df.columns
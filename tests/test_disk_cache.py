@@ -0,0 +1,108 @@
+"""
+Тесты для дискового кэша разобранных файлов (Feather)
+"""
+import os
+import sys
+import time
+from pathlib import Path
+import numpy as np
+import pandas as pd
+import pytest
+
+root_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(root_dir))
+
+pytest.importorskip("pyarrow")
+
+from src.constants import AppConstants
+from src.data_manager import DataManager
+from src.disk_cache import FrameDiskCache
+
+
+class TestFrameDiskCache:
+    """Тесты FrameDiskCache"""
+
+    def test_store_and_load_roundtrip(self, tmp_path):
+        """Сохранённый DataFrame загружается без изменений (пропуски - NaN)"""
+        cache = FrameDiskCache(str(tmp_path))
+        df = pd.DataFrame({'Название': ['Office', np.nan, 'Chrome'], 'Лицензий': [1, 2, 3]})
+
+        assert cache.store('k', df)
+        loaded = cache.load('k')
+
+        pd.testing.assert_frame_equal(loaded, df)
+        assert isinstance(loaded['Название'][1], float)
+
+    def test_load_string_dtype(self, tmp_path):
+        """Строковые столбцы загружаются сразу в string[pyarrow] (пропуски - pd.NA)"""
+        cache = FrameDiskCache(str(tmp_path))
+        cache.store('k', pd.DataFrame({'Название': ['Office', np.nan], 'Лицензий': [1, 2]}))
+
+        loaded = cache.load('k', string_dtype=pd.StringDtype('pyarrow'))
+
+        assert loaded['Название'].dtype == 'string[pyarrow]'
+        assert loaded['Лицензий'].dtype == 'int64'
+        assert loaded['Название'][1] is pd.NA
+
+    def test_load_columns_projection(self, tmp_path):
+        """Загрузка только нужных столбцов, порядок - как в исходном файле"""
+        cache = FrameDiskCache(str(tmp_path))
+        cache.store('k', pd.DataFrame({'a': [1], 'b': [2], 'c': [3]}))
+
+        assert list(cache.load('k', ['c', 'a']).columns) == ['a', 'c']
+        assert cache.load('missing') is None
+
+    def test_unsupported_frames_not_stored(self, tmp_path):
+        """Нестроковые имена столбцов и смешанные типы не кэшируются"""
+        cache = FrameDiskCache(str(tmp_path))
+
+        assert not cache.store('numeric_header', pd.DataFrame({2021: [1]}))
+        assert not cache.store('mixed', pd.DataFrame({'x': [1, 'a', 2.5]}))
+        assert list(tmp_path.iterdir()) == []
+
+    def test_key_depends_on_content(self, tmp_path):
+        """Ключ зависит от содержимого файла и параметров разбора"""
+        cache = FrameDiskCache(str(tmp_path / 'cache'))
+        source = tmp_path / 'source.csv'
+        source.write_text('a\n1\n')
+        key = cache.key(str(source), 'csv')
+
+        assert cache.key(str(source), 'csv') == key
+        assert cache.key(str(source), 'xlsx') != key
+
+        source.write_text('a\n2\n')
+        assert cache.key(str(source), 'csv') != key
+
+    def test_eviction_by_size(self, tmp_path):
+        """Сверх лимита размера вытесняются давно не использованные записи"""
+        df = pd.DataFrame({'x': np.arange(10000)})
+        cache = FrameDiskCache(str(tmp_path))
+        cache.store('old', df)
+        entry_size = (tmp_path / 'old.feather').stat().st_size
+        past = time.time() - 3600
+        os.utime(tmp_path / 'old.feather', (past, past))
+
+        cache.max_bytes = entry_size * 3 // 2
+        cache.store('new', df)
+
+        assert cache.load('old') is None
+        assert cache.load('new') is not None
+
+    def test_data_manager_uses_disk_cache(self, tmp_path, monkeypatch):
+        """Файл, разобранный в одной сессии, в следующей загружается из кэша"""
+        monkeypatch.setattr(AppConstants, 'DISK_CACHE_MIN_FILE_BYTES', 0)
+        source = tmp_path / 'catalog.csv'
+        pd.DataFrame({'Продукт': ['Office', 'Chrome'], 'Вендор': ['Microsoft', 'Google']}).to_csv(
+            source, index=False)
+        cache_dir = str(tmp_path / 'cache')
+
+        first = DataManager(disk_cache_dir=cache_dir).read_data_file(str(source))
+
+        second_session = DataManager(disk_cache_dir=cache_dir)
+
+        def fail_parse(*args, **kwargs):
+            raise AssertionError("файл не должен разбираться повторно")
+
+        monkeypatch.setattr(second_session, '_parse_data_file', fail_parse)
+        pd.testing.assert_frame_equal(second_session.read_data_file(str(source)), first)
+        assert list(second_session.read_data_file(str(source), usecols=['Вендор']).columns) == ['Вендор']
@@ -0,0 +1,64 @@
+"""
+Тесты для постоянного индекса источника 2 (MatchIndexStore)
+"""
+import sys
+from pathlib import Path
+import numpy as np
+import pandas as pd
+import pytest
+
+root_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(root_dir))
+
+pytest.importorskip("pyarrow")
+
+from src.blocking_index import NgramIndex
+from src.match_index import MatchIndexStore
+
+
+class TestMatchIndexStore:
+    """Тесты MatchIndexStore"""
+
+    choices = ['microsoft office', 'adobe acrobat reader', 'google chrome', '', 'office']
+
+    def test_requires_pyarrow(self, tmp_path, monkeypatch):
+        """Без pyarrow хранилище не создаётся"""
+        import src.match_index
+        monkeypatch.setattr(src.match_index, 'PYARROW_AVAILABLE', False)
+
+        with pytest.raises(ImportError):
+            MatchIndexStore(str(tmp_path))
+
+    def test_strings_roundtrip(self, tmp_path):
+        """Подготовленные строки загружаются без изменений"""
+        store = MatchIndexStore(str(tmp_path))
+        combined = ['Microsoft Office', 'Adobe Acrobat Reader', 'Google Chrome', '', 'Office']
+
+        assert store.load('k') is None
+        assert store.store('k', combined, self.choices)
+        assert store.load('k') == (combined, self.choices)
+
+    def test_ngrams_roundtrip(self, tmp_path):
+        """Загруженный n-граммный индекс отбирает тех же кандидатов"""
+        store = MatchIndexStore(str(tmp_path))
+        built = NgramIndex(self.choices, min_share=0.3)
+
+        assert store.load_ngrams('k', self.choices) is None
+        assert store.store_ngrams('k', built)
+        loaded = store.load_ngrams('k', self.choices)
+        loaded.min_share = 0.3
+
+        for query in ['office 365', 'chrome', 'acrobat', 'nginx', '']:
+            np.testing.assert_array_equal(loaded.candidates(query), built.candidates(query))
+
+    def test_key_depends_on_values_and_options(self, tmp_path):
+        """Отпечаток зависит от значений сравниваемых столбцов и настроек нормализации"""
+        store = MatchIndexStore(str(tmp_path))
+        df = pd.DataFrame({'Продукт': ['Office', 'Chrome'], 'Вендор': ['Microsoft', 'Google']})
+        key = store.key(df, ['Продукт'], (True, False))
+
+        # Несравниваемые столбцы и источник DataFrame не важны
+        assert store.key(df[['Продукт']].copy(), ['Продукт'], (True, False)) == key
+        assert store.key(df, ['Продукт'], (False, False)) != key
+        assert store.key(df, ['Продукт', 'Вендор'], (True, False)) != key
+        assert store.key(df.assign(Продукт=['Office', 'Edge']), ['Продукт'], (True, False)) != key
@@ -3,6 +3,8 @@
 """
 import sys
 from pathlib import Path
+import numpy as np
+import pandas as pd
 import pytest
 import tkinter as tk
 
@@ -10,6 +12,8 @@ root_dir = Path(__file__).parent.parent
 sys.path.insert(0, str(root_dir))
 
 from expert_matcher import ExpertMatcher, MatchingMethod
+from src.background_task import BackgroundTask, TaskCancelled
+from src.constants import AppConstants
 
 
 class TestMatching:
@@ -60,6 +64,410 @@ class TestMatching:
         result = self.matcher.combine_columns(row_with_empty, ['Название ПО', 'Версия'])
         assert result == 'Microsoft Office 365'
 
+    def test_combine_columns_frame(self):
+        """Тест колоночного объединения - совпадает с построчным combine_columns"""
+        df = pd.DataFrame({
+            'Название ПО': ['Microsoft Office', '  Adobe Reader ', None, '', 'Chrome', np.nan],
+            'Версия': [2021, np.nan, 11.0, '  ', None, 'v1'],
+            'Vendor': ['Microsoft', 'Adobe', 'Microsoft', None, '', '  '],
+        }, index=[10, 11, 12, 13, 14, 15])
+        columns = ['Название ПО', 'Версия', 'Vendor', 'Нет такого столбца']
+
+        result = self.matcher.engine.combine_columns_frame(df, columns)
+        expected = [self.matcher.combine_columns(row, columns) for _, row in df.iterrows()]
+
+        assert result.tolist() == expected
+        assert list(result.index) == list(df.index)
+        assert result.tolist()[:3] == ['Microsoft Office 2021 Microsoft', 'Adobe Reader Adobe',
+                                       '11.0 Microsoft']
+
+    @pytest.mark.parametrize('storage', ['python', 'pyarrow'])
+    def test_combine_and_normalize_string_dtype(self, storage):
+        """Тест строковых столбцов (string dtype): результат как для object-столбцов"""
+        if storage == 'pyarrow':
+            pytest.importorskip("pyarrow")
+
+        df = pd.DataFrame({
+            'Название ПО': ['Microsoft Office', '  Adobe Reader ', None, '', 'Chrome', '  '],
+            'Vendor': ['Microsoft', None, 'Microsoft', None, '', 'ООО "Ромашка"'],
+        })
+        string_df = df.astype(pd.StringDtype(storage))
+        columns = ['Название ПО', 'Нет такого столбца', 'Vendor']
+
+        combined = self.matcher.engine.combine_columns_frame(string_df, columns)
+        expected = self.matcher.engine.combine_columns_frame(df, columns)
+        assert combined.tolist() == expected.tolist()
+
+        normalized = self.matcher.engine.normalize_series(string_df['Название ПО'])
+        assert normalized.tolist() == self.matcher.engine.normalize_series(df['Название ПО']).tolist()
+
+    def test_build_results_frame(self):
+        """Тест колоночной сборки результата по позициям совпадений"""
+        askupo_df = pd.DataFrame({'Название ПО': ['Office', 'Chrome'], 'Отдел': ['ИТ', 'Бухгалтерия']})
+        eatool_df = pd.DataFrame({'Продукт': ['Chrome', 'Office'], 'Лицензий': [10, 20]})
+        self.matcher.selected_askupo_cols = ['Название ПО']
+        self.matcher.selected_eatool_cols = ['Продукт']
+        self.matcher.inherit_askupo_cols_var.set(True)
+        self.matcher.inherit_eatool_cols_var.set(True)
+        settings = self.matcher._read_run_settings()
+
+        positions, scores = self.matcher._match_positions([('Office', 100.0), ('', 0.0)],
+                                                          {'Chrome': 0, 'Office': 1})
+        assert list(positions) == [1, -1]
+
+        results = self.matcher._build_results_frame('Test', askupo_df, eatool_df,
+                                                    ['office', 'chrome'], ['chrome', 'office'],
+                                                    positions, scores, settings)
+
+        assert list(results.columns) == [
+            'Источник 1: Название ПО', 'Источник 2: Продукт',
+            '[DEBUG] Нормализованный Источник 1', '[DEBUG] Нормализованный Источник 2',
+            'Процент совпадения', 'Метод', 'Источник 1: Отдел', 'Источник 2: Лицензий',
+        ]
+        assert results['Источник 2: Продукт'].tolist() == ['Office', '']
+        assert results['Источник 2: Лицензий'].tolist() == [20, '']
+        assert results['[DEBUG] Нормализованный Источник 2'].tolist() == ['office', '']
+        assert results['Процент совпадения'].tolist() == [100.0, 0.0]
+
+    def test_stream_method_to_file(self, tmp_path):
+        """Тест потоковой обработки: результат частями совпадает с обработкой целиком"""
+        askupo_df = pd.DataFrame({
+            'Название ПО': ['Microsoft Office', 'Chrome', 'Неизвестная программа', 'Adobe Reader', '7-Zip'],
+            'Отдел': ['ИТ', 'Бухгалтерия', 'ИТ', None, 'Склад'],
+        })
+        eatool_df = pd.DataFrame({'Продукт': ['Google Chrome', 'Microsoft Office', 'Adobe Reader', '7-Zip']})
+        askupo_path = tmp_path / 'askupo.csv'
+        askupo_df.to_csv(askupo_path, index=False)
+
+        self.matcher.askupo_file = str(askupo_path)
+        self.matcher.selected_askupo_cols = ['Название ПО']
+        self.matcher.selected_eatool_cols = ['Продукт']
+        exact_method = next(m for m in self.matcher.methods if 'Exact Match' in m.name)
+        settings = self.matcher._read_run_settings()
+
+        expected = self.matcher.test_method_optimized(exact_method, askupo_df, eatool_df, settings=settings)
+
+        progress = []
+        save_path = tmp_path / 'result.csv'
+        stats = self.matcher.stream_method_to_file(exact_method, eatool_df, ['Название ПО'], ['Продукт'],
+                                                   str(save_path), settings, chunksize=2,
+                                                   progress_callback=progress.append)
+
+        written = pd.read_csv(save_path, encoding='utf-8-sig', keep_default_na=False)
+        assert written['№'].tolist() == [1, 2, 3, 4, 5]
+        assert list(written.columns[1:]) == list(expected.columns)
+        assert written['Источник 2: Продукт'].tolist() == expected['Источник 2: Продукт'].tolist()
+        assert written['Процент совпадения'].tolist() == expected['Процент совпадения'].tolist()
+        assert stats == self.matcher.engine.calculate_statistics(expected)
+        assert progress[-1] == 5
+
+        # Excel: те же строки, лист статистики
+        xlsx_path = tmp_path / 'result.xlsx'
+        self.matcher.stream_method_to_file(exact_method, eatool_df, ['Название ПО'], ['Продукт'],
+                                           str(xlsx_path), settings, chunksize=2)
+        sheets = pd.read_excel(xlsx_path, sheet_name=None)
+        assert list(sheets) == ['Результаты', 'Статистика']
+        assert sheets['Результаты']['Процент совпадения'].tolist() == expected['Процент совпадения'].tolist()
+
+    def test_shared_preparation_across_methods(self, monkeypatch):
+        """Тест сравнения методов: источники подготавливаются один раз, результаты не меняются"""
+        askupo_df = pd.DataFrame({'Название ПО': ['Microsoft Office 365', 'Chrome', 'Adobe Reader DC', None]})
+        eatool_df = pd.DataFrame({'Продукт': ['Google Chrome', 'Microsoft Office', 'Adobe Reader']})
+        self.matcher.selected_askupo_cols = ['Название ПО']
+        self.matcher.selected_eatool_cols = ['Продукт']
+        methods = [m for m in self.matcher.methods if m.library in ('rapidfuzz', 'jellyfish')][-4:]
+        settings = self.matcher._read_run_settings()
+
+        expected = [self.matcher.test_method_optimized(method, askupo_df, eatool_df, settings=settings)
+                    for method in methods]
+
+        prepared = self.matcher._prepare_source2(eatool_df, ['Продукт'])
+        askupo_normalized = self.matcher._prepare_source1(askupo_df, ['Название ПО'])
+
+        def fail(*args, **kwargs):
+            raise AssertionError("источники не должны подготавливаться для каждого метода")
+
+        monkeypatch.setattr(self.matcher.engine, 'combine_columns_frame', fail)
+        monkeypatch.setattr(self.matcher.engine, 'normalize_series', fail)
+        for method, method_expected in zip(methods, expected):
+            results = self.matcher.test_method_optimized(method, askupo_df, eatool_df, prepared=prepared,
+                                                         askupo_normalized=askupo_normalized, settings=settings)
+            pd.testing.assert_frame_equal(results, method_expected)
+
+    def test_shared_rapidfuzz_pass(self):
+        """Тест общего прохода RapidFuzz методов: результаты как при отдельной обработке"""
+        askupo_df = pd.DataFrame({'Название ПО': ['Microsoft Office 365', 'Chrome Google', 'Reader Adobe DC', None, 'R']})
+        eatool_df = pd.DataFrame({'Продукт': ['Google Chrome', 'Microsoft Office', 'Adobe Reader', 'R Studio']})
+        self.matcher.selected_askupo_cols = ['Название ПО']
+        self.matcher.selected_eatool_cols = ['Продукт']
+
+        prepared = self.matcher._prepare_source2(eatool_df, ['Продукт'])
+        askupo_normalized = self.matcher._prepare_source1(askupo_df, ['Название ПО'])
+        batch_methods = [m for m in self.matcher.methods if m.batch_scorable]
+
+        # С блокировкой общий проход тоже используется (кандидаты - по запросу)
+        for level in ('off', 'soft'):
+            self.matcher.blocking_level_var.set(level)
+            settings = self.matcher._read_run_settings()
+            shared = self.matcher._find_best_matches_multi(self.matcher.methods, askupo_normalized,
+                                                           prepared[0], prepared[1], settings)
+
+            assert set(shared) == {m.name for m in batch_methods}
+            for method in batch_methods:
+                expected = self.matcher.test_method_optimized(method, askupo_df, eatool_df, settings=settings)
+                results = self.matcher.test_method_optimized(method, askupo_df, eatool_df, prepared=prepared,
+                                                             askupo_normalized=askupo_normalized,
+                                                             matches=shared[method.name], settings=settings)
+                pd.testing.assert_frame_equal(results, expected)
+
+    def test_match_frame_chunks(self):
+        """Тест сопоставления частями: результат как за один проход, при отмене - готовые части"""
+        askupo_df = pd.DataFrame({'Название ПО': ['Microsoft Office 365', 'Chrome', 'Adobe Reader DC',
+                                                  None, 'google chrome', '7zip', 'Офис']})
+        eatool_df = pd.DataFrame({'Продукт': ['Google Chrome', 'Microsoft Office', 'Adobe Reader', '7-Zip']})
+        self.matcher.selected_askupo_cols = ['Название ПО']
+        self.matcher.selected_eatool_cols = ['Продукт']
+        method = next(m for m in self.matcher.methods if m.library == 'rapidfuzz')
+        prepared = self.matcher._prepare_source2(eatool_df, ['Продукт'])
+        settings = self.matcher._read_run_settings()
+        expected = self.matcher._match_frame(method, askupo_df, ['Название ПО'], eatool_df, prepared, settings)
+
+        task = BackgroundTask(None, lambda task: None, threaded=False)
+        progress = []
+        results = self.matcher._match_frame_chunks(method, askupo_df, ['Название ПО'], eatool_df, prepared,
+                                                   settings, task, progress_callback=lambda *args: progress.append(args),
+                                                   chunk_rows=3)
+        pd.testing.assert_frame_equal(results, expected)
+        assert progress[-1] == (7, 7)
+
+        # Отмена после первой части: остаются первые строки источника 1
+        def cancel_after_first(done, count):
+            if done >= 3:
+                task.cancel()
+
+        results = self.matcher._match_frame_chunks(method, askupo_df, ['Название ПО'], eatool_df, prepared,
+                                                   settings, task, progress_callback=cancel_after_first, chunk_rows=3)
+        pd.testing.assert_frame_equal(results, expected.head(3))
+
+        results = self.matcher._match_frame_chunks(method, askupo_df, ['Название ПО'], eatool_df, prepared,
+                                                   settings, task, chunk_rows=3)
+        assert results.empty
+        assert list(results.columns) == list(expected.columns)
+
+    def test_select_best_method(self):
+        """Тест выбора метода отсевом: на выборке из всех строк - как полный перебор оценок"""
+        askupo_df = pd.DataFrame({'Название ПО': ['Microsoft Office 365', 'Chrome', 'Adobe Reader DC',
+                                                  None, 'google chrome', 'Офис', '7zip'] * 3})
+        eatool_df = pd.DataFrame({'Продукт': ['Google Chrome', 'Microsoft Office', 'Adobe Reader', '7-Zip']})
+        self.matcher.selected_askupo_cols = ['Название ПО']
+        self.matcher.selected_eatool_cols = ['Продукт']
+        methods = [m for m in self.matcher.methods if m.library in ('rapidfuzz', 'jellyfish')]
+        prepared = self.matcher._prepare_source2(eatool_df, ['Продукт'])
+        settings = self.matcher._read_run_settings()
+
+        rounds_seen = []
+        best, best_score, rounds = self.matcher.select_best_method(
+            methods, askupo_df, ['Название ПО'], prepared, settings,
+            progress_callback=lambda *args: rounds_seen.append(args))
+
+        # 21 строка меньше первой выборки - один раунд на всех строках
+        assert rounds_seen == [(1, len(methods), len(askupo_df))]
+        scores = [self.matcher.evaluate_method_fast(m, askupo_df, eatool_df, None, None,
+                                                    prepared=prepared, settings=settings)
+                  for m in methods]
+        expected = max(scores)
+        assert best_score[:2] == expected[:2]
+        assert best_score[2] == pytest.approx(expected[2])
+        assert best is methods[scores.index(expected)]
+
+    def test_worker_reads_settings_snapshot(self, tmp_path):
+        """Тест снимка настроек: обработка не обращается к переменным Tk"""
+        askupo_df = pd.DataFrame({'Название ПО': ['Microsoft Office 365', 'Chrome', 'Adobe Reader DC'],
+                                  'Отдел': ['ИТ', 'Склад', 'ИТ']})
+        eatool_df = pd.DataFrame({'Продукт': ['Google Chrome', 'Microsoft Office', 'Adobe Reader'],
+                                  'Лицензий': [10, 20, 30]})
+        self.matcher.selected_askupo_cols = ['Название ПО']
+        self.matcher.selected_eatool_cols = ['Продукт']
+        self.matcher.blocking_level_var.set('soft')
+        self.matcher.inherit_eatool_cols_var.set(False)
+        settings = self.matcher._read_run_settings()
+        assert settings.blocking_min_share == AppConstants.BLOCKING_LEVELS['soft']
+        assert not settings.inherit_eatool_cols
+
+        methods = [m for m in self.matcher.methods if m.library in ('rapidfuzz', 'jellyfish')]
+        expected = self.matcher.test_method_optimized(methods[0], askupo_df, eatool_df, settings=settings)
+
+        class Untouchable:
+            def get(self):
+                raise AssertionError("переменная Tk прочитана из обработки")
+
+        for name in ('inherit_askupo_cols_var', 'inherit_eatool_cols_var', 'blocking_level_var',
+                     'parallel_var', 'selection_budget_var'):
+            setattr(self.matcher, name, Untouchable())
+
+        results = self.matcher.test_method_optimized(methods[0], askupo_df, eatool_df, settings=settings)
+        pd.testing.assert_frame_equal(results, expected)
+        assert 'Источник 2: Лицензий' not in results.columns
+
+        prepared = self.matcher._prepare_source2(eatool_df, ['Продукт'])
+        self.matcher.select_best_method(methods, askupo_df, ['Название ПО'], prepared, settings)
+        self.matcher._calibrate_methods(methods[:2], askupo_df, ['Название ПО'], eatool_df, ['Продукт'],
+                                        settings)
+
+    def test_load_and_calibrate(self, tmp_path):
+        """Тест первых шагов обработки: загрузка и калибровка в задаче, с прогрессом и отменой"""
+        from src.time_estimator import ThroughputStore, TimeEstimator
+
+        askupo_path = tmp_path / 'askupo.csv'
+        eatool_path = tmp_path / 'eatool.csv'
+        pd.DataFrame({'Название ПО': ['Microsoft Office 365', 'Chrome']}).to_csv(askupo_path, index=False)
+        pd.DataFrame({'Продукт': ['Google Chrome', 'Microsoft Office']}).to_csv(eatool_path, index=False)
+        self.matcher.askupo_file = str(askupo_path)
+        self.matcher.eatool_file = str(eatool_path)
+        self.matcher.selected_askupo_cols = ['Название ПО']
+        self.matcher.selected_eatool_cols = ['Продукт']
+        self.matcher.time_estimator = TimeEstimator(ThroughputStore(str(tmp_path / 'throughput.json')))
+        methods = [m for m in self.matcher.methods if m.library == 'rapidfuzz'][:2]
+        settings = self.matcher._read_run_settings()
+
+        tasks = []
+
+        def run(on_progress):
+            events = {'done': [], 'error': []}
+            tasks.append(BackgroundTask(self.root,
+                                        lambda task: self.matcher._load_and_calibrate(task, methods, settings),
+                                        on_progress=on_progress, on_done=events['done'].append,
+                                        on_error=events['error'].append, threaded=False))
+            tasks[-1].start()
+            return events
+
+        progress = []
+        events = run(progress.append)
+        askupo_df, eatool_df, ratio = events['done'][0]
+        assert (len(askupo_df), len(eatool_df), ratio) == (2, 2, 1.0)
+        assert progress[0]['status'] == "Загрузка источников данных..."
+        assert progress[1]['status'] == "Калибровка скорости методов..."
+        assert progress[-1]['value'] == progress[0]['maximum'] == len(methods) + 1
+
+        # Отмена во время калибровки: результата нет, задача завершается TaskCancelled
+        def cancel_on_calibration(fields):
+            if fields.get('status') == "Калибровка скорости методов...":
+                tasks[-1].cancel()
+
+        events = run(cancel_on_calibration)
+        assert events['done'] == []
+        assert isinstance(events['error'][0], TaskCancelled)
+
+    def test_time_estimate_from_calibration(self, tmp_path):
+        """Тест оценки времени: калибровка на пробе один раз, оценки растут с размером данных"""
+        from src.time_estimator import ThroughputStore, TimeEstimator
+
+        askupo_df = pd.DataFrame({'Название ПО': ['Microsoft Office 365', 'Chrome', 'Adobe Reader DC'] * 10})
+        eatool_df = pd.DataFrame({'Продукт': ['Google Chrome', 'Microsoft Office', 'Adobe Reader']})
+        self.matcher.time_estimator = TimeEstimator(ThroughputStore(str(tmp_path / 'throughput.json')))
+        methods = [m for m in self.matcher.methods if m.library in ('rapidfuzz', 'builtin')][:3]
+        settings = self.matcher._read_run_settings()
+
+        ratio = self.matcher._calibrate_methods(methods, askupo_df, ['Название ПО'], eatool_df, ['Продукт'],
+                                                settings)
+        assert ratio == 1.0
+        assert not any(self.matcher.time_estimator.needs_calibration(m) for m in methods)
+
+        small = self.matcher._estimate_method_time(methods[0], 1000, 1000, settings)
+        large = self.matcher._estimate_method_time(methods[0], 10000, 1000, settings)
+        assert 0 < small.low < small.expected < small.high
+        assert large.expected == pytest.approx(small.expected * 10)
+
+        auto = self.matcher._estimate_auto_time(methods, 100000, 1000, settings)
+        assert 0 < auto.low < auto.expected < auto.high
+
+    def test_rematch_changed_rows(self, tmp_path, monkeypatch):
+        """Тест инкрементального режима: заново сопоставляются только новые и изменённые строки"""
+        eatool_df = pd.DataFrame({'Продукт': ['Google Chrome', 'Microsoft Office', 'Adobe Reader', '7-Zip']})
+        old_df = pd.DataFrame({
+            'Название ПО': ['Microsoft Office', 'Chrome', 'Неизвестная программа', 'Adobe Reader'],
+            'Отдел': ['ИТ', 'Бухгалтерия', 'ИТ', 'Склад'],
+        })
+        new_df = pd.DataFrame({
+            'Название ПО': ['Adobe Reader', '7-Zip', 'Microsoft Office', 'Google Chrome'],
+            'Отдел': ['Склад', 'ИТ', 'Администрация', 'Бухгалтерия'],
+        })
+        self.matcher.selected_askupo_cols = ['Название ПО']
+        self.matcher.selected_eatool_cols = ['Продукт']
+        method = next(m for m in self.matcher.methods if 'WRatio' in m.name)
+        settings = self.matcher._read_run_settings()
+
+        # Предыдущий результат - как после экспорта (отсортирован, с "№") и чтения файла
+        previous_path = tmp_path / 'previous.csv'
+        previous = self.matcher.test_method_optimized(method, old_df, eatool_df, settings=settings)
+        previous = previous.sort_values('Процент совпадения', ascending=False)
+        previous.insert(0, '№', range(1, len(previous) + 1))
+        previous.to_csv(previous_path, index=False, encoding='utf-8-sig')
+        previous = self.matcher.read_data_file(str(previous_path))
+
+        matched_rows = []
+        original_match_frame = self.matcher._match_frame
+
+        def recording_match_frame(method, askupo_df, *args, **kwargs):
+            matched_rows.extend(askupo_df['Название ПО'])
+            return original_match_frame(method, askupo_df, *args, **kwargs)
+
+        monkeypatch.setattr(self.matcher, '_match_frame', recording_match_frame)
+        results, stats, changes = self.matcher.rematch_changed_rows(
+            method, new_df, eatool_df, ['Название ПО'], ['Продукт'], previous, settings)
+
+        assert matched_rows == ['7-Zip', 'Google Chrome']
+        assert changes == {'reused': 2, 'rematched': 2, 'removed': 2}
+
+        monkeypatch.undo()
+        expected = self.matcher.test_method_optimized(method, new_df, eatool_df, settings=settings)
+        assert list(results.columns) == list(expected.columns)
+        for col in ['Источник 1: Название ПО', 'Источник 1: Отдел', 'Источник 2: Продукт',
+                    'Процент совпадения', 'Метод']:
+            assert results[col].tolist() == expected[col].tolist()
+        assert stats == self.matcher.engine.calculate_statistics(expected)
+
+        # Результат другого метода не подходит
+        other = next(m for m in self.matcher.methods if m.name != method.name)
+        with pytest.raises(ValueError):
+            self.matcher.rematch_changed_rows(other, new_df, eatool_df, ['Название ПО'], ['Продукт'],
+                                              previous, settings)
+
+    def test_prepare_source2_uses_match_index(self, tmp_path, monkeypatch):
+        """Тест постоянного индекса: повторная подготовка источника 2 загружается из индекса"""
+        pytest.importorskip("pyarrow")
+        from src.constants import AppConstants
+        from src.match_index import MatchIndexStore
+
+        monkeypatch.setattr(AppConstants, 'MATCH_INDEX_MIN_ROWS', 0)
+        askupo_df = pd.DataFrame({'Название ПО': ['Microsoft Office 365', 'Adobe Reader DC']})
+        eatool_df = pd.DataFrame({'Продукт': ['Google Chrome', 'Microsoft Office', 'Adobe Reader']})
+        self.matcher.selected_askupo_cols = ['Название ПО']
+        self.matcher.selected_eatool_cols = ['Продукт']
+        self.matcher.blocking_level_var.set('soft')
+        settings = self.matcher._read_run_settings()
+        method = next(m for m in self.matcher.methods if 'WRatio' in m.name)
+
+        self.matcher.match_index = MatchIndexStore(str(tmp_path))
+        expected = self.matcher.test_method_optimized(method, askupo_df, eatool_df, settings=settings)
+
+        # Новая сессия: источник 2 не нормализуется, n-граммы не строятся
+        original_normalize = self.matcher.engine.normalize_series
+
+        def normalize_source1_only(series):
+            assert len(series) == len(askupo_df), "источник 2 не должен нормализоваться повторно"
+            return original_normalize(series)
+
+        def fail_build(*args, **kwargs):
+            raise AssertionError("n-граммный индекс не должен строиться повторно")
+
+        self.matcher._blocking_index = None
+        monkeypatch.setattr(self.matcher.engine, 'normalize_series', normalize_source1_only)
+        monkeypatch.setattr('expert_matcher.NgramIndex', fail_build)
+        results = self.matcher.test_method_optimized(method, askupo_df, eatool_df, settings=settings)
+
+        pd.testing.assert_frame_equal(results, expected)
+
     def test_matching_method_find_best_match_exact(self):
         """Тест поиска лучшего совпадения - точное совпадение"""
         choices = ['Microsoft Office', 'Adobe Reader', 'Google Chrome']
@@ -142,6 +550,27 @@ class TestMatching:
                 # После штрафа за длину score должен быть < 50 (rejected)
                 assert score < 50, f"Short string should not match long string, got score: {score}"
 
+    def test_reranking_all_candidates_after_length_penalty(self):
+        """Тест пересортировки всех кандидатов после штрафа за длину (как в пакетном пути)"""
+        pytest.importorskip("rapidfuzz")
+        from rapidfuzz import fuzz
+
+        # Шесть длинных вариантов дают partial_ratio = 100, короткий 'offce' - меньше,
+        # но после штрафа за длину лучший - он (7-й по «сырому» проценту)
+        choices = [f'microsoft office professional plus edition {i}' for i in range(6)] + ['offce']
+        choice_dict = {c: c for c in choices}
+
+        method = MatchingMethod("RapidFuzz: Partial Ratio", fuzz.partial_ratio, "rapidfuzz",
+                                use_process=True, scorer=fuzz.partial_ratio)
+        match, score = method.find_best_match('office', choices, choice_dict)
+        assert match == 'offce'
+        assert score > 50
+
+        # Построчный и пакетный пути дают одинаковый результат
+        queries = ['office', 'microsoft office', 'edition', 'zzz', '']
+        assert method.find_best_matches(queries, choices, choice_dict) == \
+            [method.find_best_match(q, choices, choice_dict) for q in queries]
+
     def test_methods_registration(self):
         """Тест регистрации методов"""
         methods = self.matcher.methods
@@ -0,0 +1,110 @@
+"""
+Тесты для выбора метода последовательным отсевом
+"""
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+import numpy as np
+import pytest
+
+root_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(root_dir))
+
+from src import method_selector
+from src.method_selector import SuccessiveHalving, length_strata, stratified_order
+from src.models import MatchingMethod
+
+
+class TestStratifiedOrder:
+    """Тесты стратифицированного порядка выборки"""
+
+    def test_permutation_and_prefix_shares(self):
+        """Порядок - перестановка, каждый префикс содержит страты в их долях"""
+        strata = np.array([0] * 600 + [1] * 300 + [2] * 100)
+        order = stratified_order(strata, seed=1)
+
+        assert sorted(order.tolist()) == list(range(len(strata)))
+        for n in (10, 50, 200):
+            counts = np.bincount(strata[order[:n]], minlength=3)
+            assert counts.tolist() == pytest.approx([n * 0.6, n * 0.3, n * 0.1], abs=1)
+
+    def test_reproducible(self):
+        """Одно зерно - один порядок"""
+        strata = [0, 1, 1, 2, 0, 0, 1]
+        assert stratified_order(strata, seed=3).tolist() == stratified_order(strata, seed=3).tolist()
+
+    def test_length_strata(self):
+        """Страты по квантилям длины"""
+        strata = length_strata(['a', 'bb', 'ccc', 'dddd', 'eeeee', 'ffffff', 'ggggggg', 'hhhhhhhh'], 4)
+        assert strata.tolist() == [0, 0, 1, 1, 2, 2, 3, 3]
+        assert length_strata([]).tolist() == []
+
+
+class TestSuccessiveHalving:
+    """Тесты последовательного отсева методов"""
+
+    @staticmethod
+    def _methods(n):
+        return [MatchingMethod(f"Метод {i}", None, "builtin") for i in range(n)]
+
+    @staticmethod
+    def _key(scores):
+        return (int((scores == 100).sum()), int(((scores >= 90) & (scores < 100)).sum()), scores.mean())
+
+    def test_selects_best_and_evaluates_only_new_rows(self):
+        """Лучший метод выбирается, худшие отсеиваются, строки не оцениваются повторно"""
+        methods = self._methods(8)
+        quality = {m.name: i * 10 for i, m in enumerate(methods)}  # Метод 7 лучший
+        evaluated = {m.name: [] for m in methods}
+
+        def score_rows(alive, rows):
+            for method in alive:
+                evaluated[method.name].extend(rows.tolist())
+            return {m.name: np.full(len(rows), 30.0 + quality[m.name]) for m in alive}
+
+        selector = SuccessiveHalving(initial_sample=10, max_sample=100, growth=2)
+        best, key, rounds = selector.select(methods, np.arange(200), score_rows, self._key)
+
+        assert best.name == "Метод 7"
+        assert key == (40, 0, 100.0)
+        assert [r.sample_size for r in rounds] == [10, 20, 40]
+        assert [len(r.scores) for r in rounds] == [8, 4, 2]
+        # Отсеянные в первом раунде оценены только на 10 строках, без повторов
+        assert evaluated["Метод 0"] == list(range(10))
+        assert evaluated["Метод 7"] == list(range(40))
+
+    def test_ties_kept_and_first_selected_wins(self):
+        """Равные на границе не отбрасываются, при равенстве выигрывает раньше выбранный"""
+        methods = self._methods(4)
+
+        def score_rows(alive, rows):
+            return {m.name: np.full(len(rows), 80.0) for m in alive}
+
+        progress = []
+        selector = SuccessiveHalving(initial_sample=5, max_sample=20, growth=2)
+        best, _, rounds = selector.select(methods, np.arange(50), score_rows, self._key,
+                                          progress_callback=lambda *args: progress.append(args))
+
+        assert best.name == "Метод 0"
+        assert [len(r.scores) for r in rounds] == [4, 4, 4]
+        assert progress == [(1, 4, 5), (2, 4, 10), (3, 4, 20)]
+
+    def test_time_budget(self, monkeypatch):
+        """По исчерпании лимита времени выбирается лучший метод последнего раунда"""
+        clock = iter(range(0, 1000, 10))
+        monkeypatch.setattr(method_selector, 'time', SimpleNamespace(time=lambda: next(clock)))
+        methods = self._methods(8)
+
+        def score_rows(alive, rows):
+            return {m.name: np.full(len(rows), 50.0 + i) for i, m in enumerate(alive)}
+
+        selector = SuccessiveHalving(initial_sample=10, max_sample=1000, growth=2, time_budget=5)
+        best, _, rounds = selector.select(methods, np.arange(1000), score_rows, self._key)
+
+        assert len(rounds) == 1
+        assert best.name == "Метод 7"
+
+    def test_no_methods(self):
+        """Пустой список методов - ошибка"""
+        with pytest.raises(ValueError):
+            SuccessiveHalving().select([], np.arange(10), lambda alive, rows: {}, self._key)
@@ -118,3 +118,62 @@ class TestNormalization:
         assert '2021' not in result
         assert 'microsoft' in result
         assert 'office' in result
+
+    def test_normalization_cache_hits(self):
+        """Тест кэша нормализации: повторяющаяся строка нормализуется один раз"""
+        self.matcher.engine.set_options(self.matcher.engine.norm_options)
+        before = self.matcher.engine.cache_stats()
+
+        for _ in range(5):
+            assert self.matcher.normalize_string('Adobe Acrobat Reader DC') == 'adobe acrobat reader dc'
+
+        stats = self.matcher.engine.cache_stats()
+        assert stats['misses'] - before['misses'] == 1
+        assert stats['hits'] - before['hits'] == 4
+
+        # Число и строка с тем же хэшем не смешиваются
+        assert self.matcher.normalize_string(1) == '1'
+        assert self.matcher.normalize_string(1.0) == '1 0'
+
+    def test_normalization_cache_invalidated_on_options_change(self):
+        """Тест сброса кэша при смене настроек нормализации"""
+        assert self.matcher.normalize_string('Microsoft Office 2021') == 'microsoft office 2021'
+
+        self.matcher.norm_remove_versions_var.set(True)
+        self.matcher._update_matching_engine()
+
+        assert self.matcher.normalize_string('Microsoft Office 2021') == 'microsoft office'
+
+        # Повторное обновление с теми же настройками кэш не сбрасывает
+        size = self.matcher.engine.cache_stats()['size']
+        self.matcher._update_matching_engine()
+        assert self.matcher.engine.cache_stats()['size'] == size
+
+    def test_precompiled_pipeline_keeps_pattern_order(self):
+        """Тест: предкомпилированный конвейер сохраняет порядок применения паттернов"""
+        self.matcher.norm_remove_legal_var.set(True)
+        self.matcher.norm_remove_versions_var.set(True)
+        self.matcher.norm_remove_punctuation_var.set(False)
+        self.matcher._update_matching_engine()
+
+        # Co. удаляется раньше S.A., поэтому от S.A. остаётся точка
+        assert self.matcher.normalize_string('S.A.Co.') == '. .'
+        # Год удаляется раньше паттерна "8.1", поэтому 8 остаётся
+        assert self.matcher.normalize_string('8.2021') == '8.'
+        # Строки без юридических форм и версий не изменяются
+        assert self.matcher.normalize_string('Notepad++') == 'notepad++'
+
+    def test_normalize_series_matches_normalize_string(self):
+        """Тест: нормализация столбца совпадает с построчной нормализацией"""
+        import numpy as np
+        import pandas as pd
+
+        values = ['  Microsoft Office  ', 'Python-3.9.1', None, np.nan, '', 0, 1, 1.0,
+                  'ООО "Компания"', 'Python-3.9.1', 'ADOBE READER']
+        series = pd.Series(values, index=range(10, 10 + len(values)), name='Название')
+
+        result = self.matcher.engine.normalize_series(series)
+
+        assert result.tolist() == [self.matcher.normalize_string(v) for v in values]
+        assert list(result.index) == list(series.index)
+        assert result.name == 'Название'
@@ -0,0 +1,97 @@
+"""
+Тесты для параллельного сопоставления (ProcessPoolExecutor)
+"""
+import sys
+from pathlib import Path
+import pytest
+
+root_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(root_dir))
+
+jellyfish = pytest.importorskip("jellyfish")
+
+from src.blocking_index import NgramIndex
+from src.constants import AppConstants
+from src.models import MatchingMethod
+from src.parallel_matcher import ParallelMatcher
+
+
+class TestParallelMatcher:
+    """Тесты параллельного сопоставления"""
+
+    choices = ['microsoft office', 'adobe acrobat reader', 'google chrome', 'mozilla firefox', 'python']
+    queries = ['microsoft ofice', 'acrobat', '', 'chrome', 'firefox browser', 'pyton', 'postgresql'] * 10
+
+    @pytest.fixture
+    def method(self):
+        return MatchingMethod("Jellyfish: Jaro-Winkler", jellyfish.jaro_winkler_similarity, "jellyfish")
+
+    def test_same_results_as_serial(self, method):
+        """Результаты идут в исходном порядке и совпадают с последовательными"""
+        choice_dict = {c: c.upper() for c in self.choices}
+        matcher = ParallelMatcher(max_workers=2, min_rows=1, shard_size=4)
+
+        serial = method.find_best_matches(self.queries, self.choices, choice_dict)
+        parallel = matcher.find_best_matches(method, self.queries, self.choices, choice_dict)
+        matcher.close()
+
+        assert parallel == serial
+
+    def test_with_blocking_and_progress(self, method):
+        """Индекс блокировки передаётся процессам, прогресс доходит до конца"""
+        choice_dict = {c: c for c in self.choices}
+        index = NgramIndex(self.choices, min_share=0.2)
+        calls = []
+
+        serial = method.find_best_matches(self.queries, self.choices, choice_dict, blocking_index=index)
+        matcher = ParallelMatcher(max_workers=2, min_rows=1, shard_size=8)
+        parallel = matcher.find_best_matches(
+            method, self.queries, self.choices, choice_dict,
+            progress_callback=lambda done, total: calls.append(done), blocking_index=index)
+        matcher.close()
+
+        assert parallel == serial
+        assert calls[-1] == len(self.queries)
+
+    def test_pool_reused_for_same_source(self, method):
+        """Пул создаётся один раз на источник 2 и метод, при их смене - заново"""
+        choice_dict = {c: c.upper() for c in self.choices}
+        matcher = ParallelMatcher(max_workers=2, min_rows=1, shard_size=4)
+        other = MatchingMethod("Jellyfish: Jaro", jellyfish.jaro_similarity, "jellyfish")
+
+        try:
+            # Части источника 1 - тот же пул
+            first = matcher.find_best_matches(method, self.queries[:20], self.choices, choice_dict)
+            pool = matcher._pool
+            assert pool._mp_context.get_start_method() == AppConstants.PROCESS_START_METHOD
+            second = matcher.find_best_matches(method, self.queries[20:], self.choices, choice_dict)
+            assert matcher._pool is pool
+            assert first + second == method.find_best_matches(self.queries, self.choices, choice_dict)
+
+            # Другой метод или источник 2 - новый пул с новыми данными
+            assert matcher.find_best_matches(other, self.queries, self.choices, choice_dict) == \
+                other.find_best_matches(self.queries, self.choices, choice_dict)
+            assert matcher._pool is not pool
+            pool = matcher._pool
+
+            choices = self.choices[:2]
+            assert matcher.find_best_matches(other, self.queries, choices, choice_dict) == \
+                other.find_best_matches(self.queries, choices, choice_dict)
+            assert matcher._pool is not pool
+        finally:
+            matcher.close()
+
+        assert matcher._pool is None
+        matcher.close()
+
+    def test_is_suitable(self, method):
+        """Параллельно обрабатываются только методы с ручным перебором"""
+        matcher = ParallelMatcher(max_workers=4, min_rows=100)
+        rapidfuzz_like = MatchingMethod("RapidFuzz", None, "rapidfuzz", use_process=True)
+        exact = MatchingMethod("Exact", None, "builtin", is_exact_match=True)
+
+        assert matcher.is_suitable(method, 1000)
+        assert not matcher.is_suitable(method, 10)
+        assert not matcher.is_suitable(rapidfuzz_like, 1000)
+        assert not matcher.is_suitable(exact, 1000)
+        assert not ParallelMatcher(max_workers=1).is_suitable(method, 10 ** 6)
@@ -0,0 +1,80 @@
+"""
+Тесты для общего этапа штрафа за длину и порога отклонения
+"""
+import sys
+from pathlib import Path
+import numpy as np
+import pytest
+
+root_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(root_dir))
+
+from src.scoring import apply_length_penalty, length_penalty, select_best, to_percent
+
+
+class TestScoring:
+    """Тесты векторизованного этапа пост-обработки оценок"""
+
+    def test_length_penalty_matches_scalar_formula(self):
+        """Штраф совпадает с построчной формулой"""
+        for q_len, c_len in [(1, 40), (3, 3), (3, 10), (10, 40), (20, 20), (0, 5), (0, 0)]:
+            ratio = min(q_len, c_len) / max(q_len, c_len) if max(q_len, c_len) > 0 else 0
+            expected = ratio ** 2 if q_len <= 3 or c_len <= 3 else ratio ** 0.5
+            assert float(length_penalty(q_len, c_len)) == pytest.approx(expected, rel=1e-15)
+
+    def test_apply_length_penalty_matches_scalar_formula_at_category_edges(self):
+        """Скорректированный процент как в построчной формуле: категории и округление до 0.1 не сдвигаются"""
+        def scalar(score, q_len, c_len):
+            ratio = min(q_len, c_len) / max(q_len, c_len) if max(q_len, c_len) > 0 else 0
+            penalty = ratio ** 2 if q_len <= 3 or c_len <= 3 else ratio ** 0.5
+            adjusted = float(score) * penalty
+            return adjusted if adjusted >= 50 else 0
+
+        edges = np.array([0, 50, 70, 90, 100])
+        lens = np.arange(0, 101)
+        for score in (100.0, 93.75, 90.0, 81.25, 75.0, 70.0, 62.5, 50.0):
+            expected = np.array([[scalar(score, q, c) for c in lens] for q in lens])
+            adjusted = apply_length_penalty(np.full((len(lens), len(lens)), score), lens[:, None], lens[None, :])
+
+            # float64: расхождение не больше ошибки округления (в float32 было ~1e-8)
+            np.testing.assert_allclose(adjusted, expected, rtol=1e-14, atol=0)
+            np.testing.assert_array_equal(np.searchsorted(edges, adjusted, side='right'),
+                                          np.searchsorted(edges, expected, side='right'))
+            np.testing.assert_array_equal(np.round(adjusted, 1), np.round(expected, 1))
+
+        # Штраф sqrt(81/100) и sqrt(49/100) - ровно на границах 90% и 70%
+        assert float(apply_length_penalty(100.0, 81, 100)) == scalar(100.0, 81, 100)
+        assert float(apply_length_penalty(100.0, 49, 100)) == scalar(100.0, 49, 100)
+
+    def test_apply_length_penalty_cutoff(self):
+        """Проценты ниже порога после штрафа обнуляются"""
+        scores = np.array([100.0, 100.0, 60.0])
+        adjusted = apply_length_penalty(scores, 10, np.array([10, 40, 10]))
+
+        assert adjusted[0] == pytest.approx(100.0)
+        assert adjusted[1] == pytest.approx(50.0)  # sqrt(10/40) = 0.5
+        assert adjusted[2] == pytest.approx(60.0)
+
+        adjusted = apply_length_penalty(scores, 10, np.array([10, 41, 10]))
+        assert adjusted[1] == 0
+
+    def test_apply_length_penalty_matrix(self):
+        """Трансляция длин даёт матрицу штрафов"""
+        scores = np.full((2, 3), 100.0)
+        adjusted = apply_length_penalty(scores, np.array([[4], [8]]), np.array([[4, 8, 16]]))
+
+        assert adjusted.shape == (2, 3)
+        assert adjusted[0, 0] == pytest.approx(100.0)
+        assert adjusted[1, 1] == pytest.approx(100.0)
+        assert adjusted[0, 2] == pytest.approx(50.0)
+
+    def test_to_percent(self):
+        """Оценки 0-1 (в т.ч. целое 1 от textdistance) приводятся к 0-100"""
+        assert list(to_percent([0.5, 1, 1.0, 0, 85.0])) == [50.0, 100.0, 100.0, 0.0, 85.0]
+
+    def test_select_best(self):
+        """Выбирается первый максимум, нулевые строки - без совпадения"""
+        best_idx, best_scores = select_best(np.array([[60.0, 90.0, 90.0], [0.0, 0.0, 0.0]]))
+
+        assert list(best_idx) == [1, -1]
+        assert list(best_scores) == [90.0, 0.0]
@@ -0,0 +1,119 @@
+"""
+Тесты для оценки времени по измеренной скорости методов
+"""
+import json
+import sys
+import time
+from pathlib import Path
+import pytest
+
+root_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(root_dir))
+
+from src.models import MatchingMethod
+from src.time_estimator import (ThroughputStore, TimeEstimate, TimeEstimator,
+                                blocking_ratio, format_duration)
+
+
+def _similarity(a, b):
+    """Простая мера сходства для тестов (доля общих символов)"""
+    return len(set(a) & set(b)) / max(1, len(set(a) | set(b)))
+
+
+class TestThroughputStore:
+    """Тесты хранилища измеренной скорости"""
+
+    def test_record_persists_per_machine(self, tmp_path):
+        """Измерения сохраняются в файл отдельно для каждого компьютера"""
+        path = tmp_path / 'throughput.json'
+        store = ThroughputStore(str(path), history=2)
+        for rate in (1e-6, 2e-6, 3e-6):
+            store.record('Метод', rate)
+
+        # Хранятся только последние измерения
+        assert ThroughputStore(str(path)).rates('Метод') == [2e-6, 3e-6]
+
+        other = ThroughputStore(str(path))
+        other.machine = 'другой компьютер'
+        assert other.rates('Метод') == []
+
+    def test_old_and_broken_data_ignored(self, tmp_path):
+        """Устаревшие измерения и повреждённый файл не используются"""
+        path = tmp_path / 'throughput.json'
+        store = ThroughputStore(str(path))
+        store.record('Метод', 1e-6)
+        store._data['machines'][store.machine]['Метод'][0]['time'] = time.time() - 100 * 86400
+        assert store.rates('Метод', max_age_days=30) == []
+        assert store.rates('Метод', max_age_days=None) == [1e-6]
+
+        path.write_text('{не json', encoding='utf-8')
+        assert ThroughputStore(str(path)).rates('Метод') == []
+        path.write_text(json.dumps({'version': -1, 'machines': {}}), encoding='utf-8')
+        assert ThroughputStore(str(path)).rates('Метод') == []
+
+
+class TestTimeEstimator:
+    """Тесты калибровки и экстраполяции"""
+
+    queries = ['microsoft office', 'adobe reader', 'chrome']
+    choices = ['microsoft office 365', 'adobe acrobat reader', 'google chrome', 'firefox']
+
+    @pytest.fixture
+    def estimator(self, tmp_path):
+        return TimeEstimator(ThroughputStore(str(tmp_path / 'throughput.json')), spread=2.0)
+
+    def test_calibrate_once(self, estimator):
+        """Калибруются только методы без измерений"""
+        method = MatchingMethod("Тест", _similarity, "builtin")
+        choice_dict = {c: c for c in self.choices}
+
+        assert estimator.needs_calibration(method)
+        assert estimator.calibrate([method], self.queries, self.choices, choice_dict) == 1
+        assert not estimator.needs_calibration(method)
+        assert estimator.calibrate([method], self.queries, self.choices, choice_dict) == 0
+        assert estimator.estimate(method, 100, 100).expected > 0
+
+    def test_extrapolation(self, estimator):
+        """Время растёт как N x M, точное совпадение - как N; блокировка и процессы уменьшают время"""
+        method = MatchingMethod("Тест", _similarity, "builtin")
+        exact = MatchingMethod("Точное", _similarity, "builtin", is_exact_match=True)
+        estimator.store.record(method.name, 1e-6)
+        estimator.store.record(exact.name, 1e-6)
+
+        estimate = estimator.estimate(method, 1000, 2000)
+        assert estimate.expected == pytest.approx(2.0)
+        assert (estimate.low, estimate.high) == pytest.approx((1.0, 4.0))
+        assert estimator.estimate(method, 1000, 2000, candidate_ratio=0.25, workers=2).expected == pytest.approx(0.25)
+        assert estimator.estimate(exact, 1000, 2000, candidate_ratio=0.25).expected == pytest.approx(1e-3)
+        assert estimator.estimate(MatchingMethod("Без измерений", _similarity, "builtin"), 10, 10) == TimeEstimate()
+
+    def test_spread_widens_with_noisy_measurements(self, estimator):
+        """Разброс измерений расширяет интервал"""
+        method = MatchingMethod("Тест", _similarity, "builtin")
+        for rate in (1e-6, 1e-5):
+            estimator.store.record(method.name, rate)
+
+        estimate = estimator.estimate(method, 1000, 1000)
+        assert estimate.high / estimate.expected > 2.0
+        assert estimate.low < estimate.expected < estimate.high
+
+
+class TestHelpers:
+    """Тесты вспомогательных функций"""
+
+    def test_format_and_sum(self):
+        """Форматирование длительности и сумма оценок"""
+        assert format_duration(0.2) == "1 с"
+        assert format_duration(42) == "42 с"
+        assert format_duration(600) == "10 мин"
+        assert format_duration(9000) == "2.5 ч"
+
+        total = TimeEstimate(10, 20, 40) + TimeEstimate(50, 100, 200)
+        assert total == TimeEstimate(60, 120, 240)
+        assert str(total) == "~2 мин (от 1 мин до 4 мин)"
+
+    def test_blocking_ratio(self):
+        """Доля кандидатов при блокировке"""
+        choices = ['microsoft office', 'adobe reader', 'google chrome', 'mozilla firefox']
+        assert blocking_ratio(['microsoft office'], choices, 0.0) == 1.0
+        assert blocking_ratio(['microsoft office'], choices, 0.5) == pytest.approx(0.25)